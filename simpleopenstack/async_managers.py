@@ -0,0 +1,256 @@
+import asyncio
+from abc import ABCMeta, abstractmethod
+from concurrent.futures import Executor
+from functools import partial
+from typing import Generic, Type, Optional, List, Set, Iterable, Union, Dict, Callable, TypeVar
+
+from simpleopenstack.concurrency import DEFAULT_MAX_CONCURRENCY
+from simpleopenstack.managers import Managed, Connector, OpenstackItemManager
+from simpleopenstack.models import OpenstackIdentifier, OpenstackKeypair, OpenstackInstance, OpenstackImage, \
+    OpenstackFlavor, OpenstackNetwork, OpenstackItem
+
+_Result = TypeVar("_Result")
+
+# `asyncio.get_running_loop` was added in Python 3.7; in a coroutine, `get_event_loop` gives the running loop
+_get_running_loop: Callable[[], asyncio.AbstractEventLoop] = getattr(
+    asyncio, "get_running_loop", asyncio.get_event_loop)
+
+
+class AsyncOpenstackItemManager(Generic[Managed, Connector], metaclass=ABCMeta):
+    """
+    Manager for OpenStack items, for use with `asyncio`.
+    """
+    @property
+    @abstractmethod
+    def item_type(self) -> Type[Managed]:
+        """
+        Gets the type of items that the manager manages (i.e. the concrete `Managed` type).
+        :return: the item type
+        """
+
+    @abstractmethod
+    async def get_by_id(self, identifier: OpenstackIdentifier) -> Optional[Managed]:
+        """
+        Gets the managed OpenStack item that has the given identifier
+        :param identifier: the item's identifier
+        :return: the matched item
+        """
+
+    @abstractmethod
+    async def get_by_name(self, name: str) -> List[Managed]:
+        """
+        Gets the managed OpenStack items with the given name
+        :param name: the items' name
+        :return: the matched items
+        """
+
+    @abstractmethod
+    async def get_all(self) -> Set[Managed]:
+        """
+        Gets all of the OpenStack items of the managed type.
+        :return: the OpenStack items
+        """
+
+    @abstractmethod
+    async def create(self, model: Managed) -> Managed:
+        """
+        Creates a manged item in OpenStack, based on the given model.
+        :param model: the model to base the item created in OpenStack off. Should not have an identifier
+        :return: model of the created item in OpenStack. It will have an identifier
+        """
+
+    @abstractmethod
+    async def _delete(self, identifier: OpenstackIdentifier):
+        """
+        Deletes an OpenStack item with the given identifier.
+        :param identifier: the identifier of the item to delete
+        """
+
+    def __init__(self, openstack_connector: Connector):
+        """
+        Constructor.
+        :param openstack_connector: connector to Openstack environment
+        """
+        self.openstack_connector = openstack_connector
+
+    async def delete(self, *, item: Managed=None, identifier: OpenstackIdentifier=None):
+        """
+        Deletes the given OpenStack item.
+        :param item: the item to delete
+        :param identifier: the identifier of the item to delete
+        """
+        if item is not None and identifier is not None and item.identifier != identifier:
+            raise ValueError(f"An item has been given with the identifier {item.identifier}, along with a different "
+                             f"identifier {identifier} - provide either the item or the identifier")
+        if item is None and identifier is None:
+            raise ValueError("An item or identifier must be provided")
+        if identifier is None and item is not None:
+            identifier = item.identifier
+        await self._delete(identifier)
+
+    async def delete_many(self, items_or_identifiers: Iterable[Union[Managed, OpenstackIdentifier]],
+                          max_concurrency: int=DEFAULT_MAX_CONCURRENCY) \
+            -> Dict[OpenstackIdentifier, Optional[Exception]]:
+        """
+        Deletes the given OpenStack items concurrently.
+        :param items_or_identifiers: the items to delete, or their identifiers
+        :param max_concurrency: the maximum number of requests to make to OpenStack at the same time
+        :return: map between the identifier of each item and the exception raised when trying to delete it (`None` if
+        it was deleted)
+        """
+        identifiers = list(dict.fromkeys(
+            item_or_identifier.identifier if isinstance(item_or_identifier, OpenstackItem) else item_or_identifier
+            for item_or_identifier in items_or_identifiers))
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def delete(identifier: OpenstackIdentifier) -> Optional[Exception]:
+            async with semaphore:
+                try:
+                    await self._delete(identifier)
+                except Exception as e:
+                    return e
+            return None
+
+        return dict(zip(identifiers, await asyncio.gather(*(delete(identifier) for identifier in identifiers))))
+
+
+class AsyncOpenstackKeypairManager(
+        Generic[Connector], AsyncOpenstackItemManager[OpenstackKeypair, Connector], metaclass=ABCMeta):
+    """
+    Manager of key-pairs, for use with `asyncio`.
+    """
+    @property
+    def item_type(self) -> Type[OpenstackKeypair]:
+        return OpenstackKeypair
+
+
+class AsyncOpenstackInstanceManager(
+        Generic[Connector], AsyncOpenstackItemManager[OpenstackInstance, Connector], metaclass=ABCMeta):
+    """
+    Manager of instances, for use with `asyncio`.
+    """
+    @abstractmethod
+    async def create_many(self, models: Iterable[OpenstackInstance], max_concurrency: int=DEFAULT_MAX_CONCURRENCY) \
+            -> List[Union[OpenstackInstance, Exception]]:
+        """
+        Creates many instances in OpenStack, based on the given models.
+        :param models: the models to base the instances created in OpenStack off
+        :param max_concurrency: the maximum number of requests to make to OpenStack at the same time
+        :return: for each model (in the same order), the model of the created instance in OpenStack or the exception
+        raised when trying to create it
+        """
+
+    @property
+    def item_type(self) -> Type[OpenstackInstance]:
+        return OpenstackInstance
+
+
+class AsyncOpenstackImageManager(
+        Generic[Connector], AsyncOpenstackItemManager[OpenstackImage, Connector], metaclass=ABCMeta):
+    """
+    Manager of images, for use with `asyncio`.
+    """
+    @property
+    def item_type(self) -> Type[OpenstackImage]:
+        return OpenstackImage
+
+
+class AsyncOpenstackFlavorManager(
+        Generic[Connector], AsyncOpenstackItemManager[OpenstackFlavor, Connector], metaclass=ABCMeta):
+    """
+    Manager of image flavors, for use with `asyncio`.
+    """
+    @property
+    def item_type(self) -> Type[OpenstackFlavor]:
+        return OpenstackFlavor
+
+
+class AsyncOpenstackNetworkManager(
+        Generic[Connector], AsyncOpenstackItemManager[OpenstackNetwork, Connector], metaclass=ABCMeta):
+    """
+    Manager of networks, for use with `asyncio`.
+    """
+    @property
+    def item_type(self) -> Type[OpenstackNetwork]:
+        return OpenstackNetwork
+
+
+class DelegatingAsyncOpenstackItemManager(
+        Generic[Managed, Connector], AsyncOpenstackItemManager[Managed, Connector], metaclass=ABCMeta):
+    """
+    Asynchronous manager that delegates to a synchronous manager for the same connector.
+
+    The synchronous manager is the one shared by everything using the connector (see `factories.get_manager`), so its
+    clients, caches and instrumentation are shared with the synchronous users of the connector.
+
+    Delegating managers are thread-backed, not non-blocking: if an executor is given, each call to the (blocking)
+    synchronous manager is made in one of the executor's threads (with `run_in_executor`) so that the event loop is not
+    blocked, and the number of calls in progress at once is limited by the executor's threads. Without an executor
+    (e.g. for in-memory backends), the calls are made directly in the event loop.
+    """
+    @property
+    @abstractmethod
+    def _synchronous_manager_type(self) -> Type[OpenstackItemManager]:
+        """
+        Gets the type of synchronous manager to delegate to if there is not one registered for the type of connector.
+        :return: the synchronous manager type
+        """
+
+    def __init__(self, openstack_connector: Connector, executor: Executor=None):
+        """
+        Constructor.
+        :param openstack_connector: connector to Openstack environment
+        :param executor: executor to make the (blocking) calls to the synchronous manager in
+        """
+        super().__init__(openstack_connector)
+        # Imported here as the factories import the asynchronous managers
+        from simpleopenstack.factories import get_manager, _get_cached_manager
+        try:
+            self.synchronous_manager = get_manager(openstack_connector, self.item_type)
+        except ValueError:
+            self.synchronous_manager = _get_cached_manager(openstack_connector, self._synchronous_manager_type)
+        self.executor = executor
+
+    async def get_by_id(self, identifier: OpenstackIdentifier) -> Optional[Managed]:
+        return await self._call(self.synchronous_manager.get_by_id, identifier)
+
+    async def get_by_name(self, name: str) -> List[Managed]:
+        return await self._call(self.synchronous_manager.get_by_name, name)
+
+    async def get_all(self) -> Set[Managed]:
+        return await self._call(self.synchronous_manager.get_all)
+
+    async def create(self, model: Managed) -> Managed:
+        return await self._call(self.synchronous_manager.create, model)
+
+    async def _delete(self, identifier: OpenstackIdentifier):
+        await self._call(self.synchronous_manager._delete, identifier)
+
+    async def delete_many(self, items_or_identifiers: Iterable[Union[Managed, OpenstackIdentifier]],
+                          max_concurrency: int=DEFAULT_MAX_CONCURRENCY) \
+            -> Dict[OpenstackIdentifier, Optional[Exception]]:
+        # Delegated as a whole so that backend specific batching (e.g. of force deletes) is kept
+        return await self._call(self.synchronous_manager.delete_many, list(items_or_identifiers), max_concurrency)
+
+    async def _call(self, function: Callable[..., _Result], *args, **kwargs) -> _Result:
+        """
+        Calls the given (blocking) function of the synchronous manager.
+        :param function: the function to call
+        :param args: positional arguments to call the function with
+        :param kwargs: keyword arguments to call the function with
+        :return: the result of the call
+        """
+        if self.executor is None:
+            return function(*args, **kwargs)
+        return await _get_running_loop().run_in_executor(self.executor, partial(function, *args, **kwargs))
+
+
+class DelegatingAsyncOpenstackInstanceManager(
+        Generic[Connector], DelegatingAsyncOpenstackItemManager[OpenstackInstance, Connector],
+        AsyncOpenstackInstanceManager[Connector], metaclass=ABCMeta):
+    """
+    Asynchronous instance manager that delegates to a synchronous manager for the same connector.
+    """
+    async def create_many(self, models: Iterable[OpenstackInstance], max_concurrency: int=DEFAULT_MAX_CONCURRENCY) \
+            -> List[Union[OpenstackInstance, Exception]]:
+        return await self._call(self.synchronous_manager.create_many, list(models), max_concurrency)
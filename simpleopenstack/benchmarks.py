@@ -0,0 +1,436 @@
+import json
+import tracemalloc
+from argparse import ArgumentParser
+from contextlib import contextmanager
+from datetime import datetime, timezone, timedelta
+from itertools import cycle
+from math import ceil
+from time import perf_counter
+from typing import List, Dict, Any, Optional, Callable, Iterator, Type, Sequence
+
+from simpleopenstack.common import get_identifier
+from simpleopenstack.concurrency import run_concurrently
+from simpleopenstack.factories import OpenstackManagerFactory
+from simpleopenstack.managers import OpenstackItemManager
+from simpleopenstack.models import Model, OpenstackItem, OpenstackKeypair, OpenstackInstance, OpenstackImage, \
+    OpenstackFlavor, OpenstackNetwork, OpenstackConnector, OpenstackIdentifier
+from simpleopenstack.os_mock_managers import MockOpenstack, MockOpenstackConnector, MockOpenstackImageManager, \
+    MockOpenstackItemCollection
+from simpleopenstack.sync import InventorySync
+
+MOCK_BACKEND = "mock"
+FAKE_SERVER_BACKEND = "fake-server"
+BACKENDS = (MOCK_BACKEND, FAKE_SERVER_BACKEND)
+# Name given as the backend of micro-benchmarks, which do not use a backend
+IN_PROCESS = "in-process"
+
+DEFAULT_ITERATIONS = 50
+DEFAULT_NUMBER_OF_ITEMS = 100
+PERCENTILES = (50, 90, 99)
+
+_EXAMPLE_PUBLIC_KEY = "ssh-rsa AAAAB3NzaC1yc2EAAAABIwAAAQEAqmEmDTNBC6O8HGCdu0MZ9zLCivDsYSttrrmlq87/YsEBpvwUTiF3UEQuFL" \
+                      "aq5Gm+dtgxJewg/UwsZrDFxzpQhCHB6VmqrbKN2hEIkk/HJvCnAmR1ehXv8n2BWw3Jlw7Z+VgWwXAH50f2HWYqTaE4qP4D" \
+                      "xc4RlElxgNmlDPGXw/dYBvChYBG/RvIiTz1L+pYzPD4JR54IMmTOwjcGIJl7nk1VjKvl3D8Wgp6qejv4MfZ7Htdc99SUKc" \
+                      "KWAeHYsjPXosSk3GlwKiS/sZi51Yca394GE7T4hZu6HTaXeZoD8+IZ7AijYn89H7EPjuu0iCAa/cjVzBsFHGszQYG+U5Kf" \
+                      "Iw== benchmark"
+_ITEM_TYPES: Sequence[Type[OpenstackItem]] = (
+    OpenstackKeypair, OpenstackInstance, OpenstackImage, OpenstackFlavor, OpenstackNetwork)
+
+
+class BenchmarkResult(Model):
+    """
+    Result of benchmarking an operation.
+    """
+    def __init__(self, name: str, backend: str, durations: List[float], api_calls: Optional[int]=None,
+                 peak_memory: Optional[int]=None):
+        """
+        Constructor.
+        :param name: the name of the benchmarked operation
+        :param backend: the backend that the operation was benchmarked against
+        :param durations: the duration (in seconds) of each time the operation was carried out
+        :param api_calls: the number of requests made to OpenStack by all of the operations (`None` if not known)
+        :param peak_memory: the peak memory (in bytes) allocated whilst carrying out the operation once (`None` if
+        not measured)
+        """
+        self.name = name
+        self.backend = backend
+        self.durations = durations
+        self.api_calls = api_calls
+        self.peak_memory = peak_memory
+
+    @property
+    def iterations(self) -> int:
+        return len(self.durations)
+
+    def get_percentile(self, percentile: float) -> float:
+        """
+        Gets the duration at the given (nearest-rank) percentile.
+        :param percentile: the percentile, between 0 and 100
+        :return: the duration (in seconds)
+        """
+        durations = sorted(self.durations)
+        return durations[max(0, ceil(percentile / 100 * len(durations)) - 1)]
+
+    def to_json(self) -> Dict[str, Any]:
+        """
+        Gets a JSON representation of the result (without the individual durations).
+        :return: the JSON representation
+        """
+        return {
+            "name": self.name,
+            "backend": self.backend,
+            "iterations": self.iterations,
+            "mean": sum(self.durations) / self.iterations,
+            "min": min(self.durations),
+            "max": max(self.durations),
+            **{f"p{percentile}": self.get_percentile(percentile) for percentile in PERCENTILES},
+            "api_calls_per_iteration": self.api_calls / self.iterations if self.api_calls is not None else None,
+            "peak_memory": self.peak_memory
+        }
+
+
+class _Backend:
+    """
+    Backend to benchmark against, populated with items.
+    """
+    def __init__(self, name: str):
+        """
+        Constructor.
+        :param name: the name of the backend
+        """
+        self.name = name
+        self.mock_openstack = MockOpenstack()
+        self._server = None
+        if name == FAKE_SERVER_BACKEND:
+            # Imported here as the fake server brings in the real OpenStack clients
+            from simpleopenstack.os_fake_server import FakeOpenstackServer
+            self._server = FakeOpenstackServer(self.mock_openstack).start()
+            self.connector: OpenstackConnector = self._server.connector
+        elif name == MOCK_BACKEND:
+            self.connector = MockOpenstackConnector(self.mock_openstack)
+        else:
+            raise ValueError(f"Unknown backend \"{name}\" (expected one of: {', '.join(BACKENDS)})")
+
+    def get_api_calls(self) -> Optional[int]:
+        """
+        Gets the number of requests made to the backend so far.
+        :return: the number of requests (`None` if the backend does not receive requests)
+        """
+        return len(self._server.requests) if self._server is not None else None
+
+    def populate(self, number_of_items: int):
+        """
+        Populates the backend with the given number of items of each type.
+        :param number_of_items: the number of items of each type to add
+        """
+        created_at = datetime.now(timezone.utc).replace(microsecond=0) - timedelta(hours=1)
+        for i in range(number_of_items):
+            self.mock_openstack.keypairs.append(OpenstackKeypair._from_properties(
+                identifier=f"keypair-{i}", name=f"keypair-{i}", public_key=_EXAMPLE_PUBLIC_KEY))
+            self.mock_openstack.images.append(OpenstackImage._from_properties(
+                identifier=f"image-{i}", name=f"image-{i}", protected=False))
+            self.mock_openstack.flavors.append(OpenstackFlavor(identifier=f"flavor-{i}", name=f"flavor-{i}"))
+            self.mock_openstack.networks.append(OpenstackNetwork(identifier=f"network-{i}", name=f"network-{i}"))
+            self.mock_openstack.instances.append(OpenstackInstance._from_properties(
+                identifier=f"instance-{i}", name=f"instance-{i}", image=f"image-{i}", flavor=f"flavor-{i}",
+                key_name=f"keypair-{i}", networks=[f"network-{i}"], created_at=created_at, updated_at=created_at))
+
+    def close(self):
+        """
+        Stops the backend.
+        """
+        if self._server is not None:
+            from simpleopenstack.os_managers import session_pool
+            session_pool.clear()
+            self._server.stop()
+
+
+@contextmanager
+def _measure_peak_memory() -> Iterator[List[int]]:
+    """
+    Measures the peak memory allocated within the context.
+    :return: context that yields a list that the peak memory (in bytes) is put in once the context exits
+    """
+    peak_memory = []
+    already_tracing = tracemalloc.is_tracing()
+    if not already_tracing:
+        tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    try:
+        yield peak_memory
+    finally:
+        peak_memory.append(max(0, tracemalloc.get_traced_memory()[1] - baseline))
+        if not already_tracing:
+            tracemalloc.stop()
+
+
+def _benchmark(name: str, backend: Optional[_Backend], operation: Callable[[], Any], iterations: int) \
+        -> BenchmarkResult:
+    """
+    Benchmarks the given operation.
+    :param name: the name of the operation
+    :param backend: the backend that the operation is carried out against (`None` if carried out in-process)
+    :param operation: the operation
+    :param iterations: the number of times to time the operation
+    :return: the result of the benchmark
+    """
+    # The memory used is measured on a separate (untimed) run as tracing slows allocations
+    with _measure_peak_memory() as peak_memory:
+        operation()
+
+    api_calls_before = backend.get_api_calls() if backend is not None else None
+    durations = []
+    for _ in range(iterations):
+        started_at = perf_counter()
+        operation()
+        durations.append(perf_counter() - started_at)
+    api_calls = backend.get_api_calls() if backend is not None else None
+    if api_calls is not None:
+        api_calls -= api_calls_before
+    return BenchmarkResult(name, backend.name if backend is not None else IN_PROCESS, durations, api_calls,
+                           peak_memory[0])
+
+
+def _create_test_item(item_type: Type[OpenstackItem], i: int) -> OpenstackItem:
+    """
+    Creates a model of an item of the given type to create in OpenStack.
+    :param item_type: the type of item
+    :param i: number that makes the name of the item unique
+    :return: the model of the item
+    """
+    name = f"benchmark-{item_type.__name__.lower()}-{i}"
+    if item_type == OpenstackKeypair:
+        return OpenstackKeypair(name=name, public_key=_EXAMPLE_PUBLIC_KEY)
+    if item_type == OpenstackInstance:
+        return OpenstackInstance(name=name, image="image-0", flavor="flavor-0", key_name="keypair-0",
+                                 networks=["network-0"])
+    return item_type(name=name)
+
+
+def _benchmark_manager(manager: OpenstackItemManager, backend: _Backend, iterations: int, number_of_items: int) \
+        -> List[BenchmarkResult]:
+    """
+    Benchmarks the operations of the given manager.
+    :param manager: the manager to benchmark
+    :param backend: the backend that the manager uses
+    :param iterations: the number of times to time each operation
+    :param number_of_items: the number of items of the manager's type in the backend
+    :return: the results of the benchmarks
+    """
+    prefix = manager.item_type.__name__
+    # Items are populated with the same identifiers as names (see `_Backend.populate`)
+    identifiers = cycle(f"{prefix[len('Openstack'):].lower()}-{i}" for i in range(number_of_items))
+    names = cycle(f"{prefix[len('Openstack'):].lower()}-{i}" for i in range(number_of_items))
+    results = [
+        _benchmark(f"{prefix}.get_by_id", backend, lambda: manager.get_by_id(next(identifiers)), iterations),
+        _benchmark(f"{prefix}.get_by_name", backend, lambda: manager.get_by_name(next(names)), iterations),
+        _benchmark(f"{prefix}.get_all", backend, manager.get_all, iterations),
+        _benchmark(f"get_identifier({prefix})", backend, lambda: get_identifier(next(names), manager), iterations)
+    ]
+
+    created: List[OpenstackIdentifier] = []
+    counter = iter(range(iterations + 1))
+
+    def create():
+        created.append(manager.create(_create_test_item(manager.item_type, next(counter))).identifier)
+
+    try:
+        results.append(_benchmark(f"{prefix}.create", backend, create, iterations))
+    except NotImplementedError:
+        return results
+    results.append(_benchmark(
+        f"{prefix}.delete", backend, lambda: manager.delete(identifier=created.pop()), iterations))
+    return results
+
+
+def _benchmark_scenarios(backend: _Backend, iterations: int, number_of_items: int) -> List[BenchmarkResult]:
+    """
+    Benchmarks scenarios that involve many calls to the backend: synchronising an inventory of instances (fully and
+    incrementally) and many concurrent lookups of the same item (which are coalesced by the real managers).
+    :param backend: the backend to benchmark against
+    :param iterations: the number of times to time each scenario
+    :param number_of_items: the number of items of each type in the backend
+    :return: the results of the benchmarks
+    """
+    manager_factory = OpenstackManagerFactory(backend.connector)
+    instance_manager = manager_factory.create_for_managing(OpenstackInstance)
+    sync = InventorySync(instance_manager)
+    sync.sync()
+    instances = cycle(backend.mock_openstack.instances)
+
+    def sync_incrementally():
+        next(instances).updated_at = datetime.now(timezone.utc)
+        sync.sync()
+
+    network_manager = manager_factory.create_for_managing(OpenstackNetwork)
+    concurrency = 10
+    return [
+        _benchmark("InventorySync(OpenstackInstance).sync(full=True)", backend, lambda: sync.sync(full=True),
+                   iterations),
+        _benchmark("InventorySync(OpenstackInstance).sync", backend, sync_incrementally, iterations),
+        _benchmark(f"OpenstackNetwork.get_by_name x{concurrency} concurrently", backend, lambda: run_concurrently(
+            lambda _: network_manager.get_by_name("network-0"), range(concurrency), concurrency), iterations)
+    ]
+
+
+def run_benchmarks(backend_name: str=MOCK_BACKEND, iterations: int=DEFAULT_ITERATIONS,
+                   number_of_items: int=DEFAULT_NUMBER_OF_ITEMS,
+                   item_types: Sequence[Type[OpenstackItem]]=_ITEM_TYPES) -> List[BenchmarkResult]:
+    """
+    Benchmarks the managers of the given types of item against the given backend.
+
+    The backend is populated with items of each type; the operations that are timed are getting items by identifier,
+    by name and all items, `get_identifier`, creating items (for instances, including resolving the items that they
+    refer to) and deleting them. Against the fake server, scenarios involving many requests are also timed (see
+    `_benchmark_scenarios`).
+    :param backend_name: the name of the backend to benchmark against (see `BACKENDS`)
+    :param iterations: the number of times to time each operation
+    :param number_of_items: the number of items of each type to populate the backend with
+    :param item_types: the types of item to benchmark the managers of
+    :return: the results of the benchmarks
+    """
+    if iterations < 2:
+        raise ValueError(f"At least 2 iterations are required: {iterations}")
+    backend = _Backend(backend_name)
+    try:
+        backend.populate(number_of_items)
+        manager_factory = OpenstackManagerFactory(backend.connector)
+        results = []
+        for item_type in item_types:
+            results.extend(_benchmark_manager(
+                manager_factory.create_for_managing(item_type), backend, iterations, number_of_items))
+        if backend_name == FAKE_SERVER_BACKEND and number_of_items > 0:
+            results.extend(_benchmark_scenarios(backend, iterations, number_of_items))
+        return results
+    finally:
+        backend.close()
+
+
+def run_micro_benchmarks(iterations: int=DEFAULT_ITERATIONS, number_of_items: int=DEFAULT_NUMBER_OF_ITEMS) \
+        -> List[BenchmarkResult]:
+    """
+    Benchmarks in-process operations that are carried out for every item: hashing and creating models, converting
+    key-pairs and timestamps given by OpenStack, the mock environment's collections and the instrumentation hooks
+    when there are no instruments. Each operation is carried out on the given number of items per iteration, and
+    baselines (e.g. `dateutil` parsing and lookups in the mock collections without instrumentation) are timed
+    alongside.
+    :param iterations: the number of times to time each operation
+    :param number_of_items: the number of items to carry out each operation on per iteration
+    :return: the results of the benchmarks
+    """
+    # Imported here as they bring in the real OpenStack clients
+    from types import SimpleNamespace
+    from dateutil.parser import parse as parse_datetime
+    from simpleopenstack.os_managers import NovaOpenstackKeypairManager, RealOpenstackConnector
+    from simpleopenstack.timestamps import parse_timestamp
+
+    if iterations < 2:
+        raise ValueError(f"At least 2 iterations are required: {iterations}")
+    numbers = range(number_of_items)
+    images = [OpenstackImage(identifier=f"image-{i}", name=f"image-{i}") for i in numbers]
+    properties = dict(name="instance", image="image", flavor="flavor", key_name="key", networks=["network"])
+    keypair_manager = NovaOpenstackKeypairManager(RealOpenstackConnector(
+        auth_url="http://localhost:5000/v2.0", tenant="tenant", username="user", password="password"))
+    raw_keypairs = [SimpleNamespace(id=f"keypair-{i}", name=f"keypair-{i}", public_key=_EXAMPLE_PUBLIC_KEY,
+                                    fingerprint=None) for i in numbers]
+    timestamps = [f"2017-05-01T10:{i % 60:02}:00Z" for i in numbers]
+    mock_openstack = MockOpenstack()
+    mock_openstack.images.extend(images)
+    image_manager = MockOpenstackImageManager(MockOpenstackConnector(mock_openstack))
+    collection = mock_openstack.images
+
+    def create_look_up_and_remove():
+        created = MockOpenstackItemCollection()
+        for image in images:
+            created.append(image)
+        for image in images:
+            created.get_by_name(image.name)
+        for image in images:
+            created.remove_by_identifier(image.identifier)
+
+    return [
+        _benchmark("set(OpenstackImage)", None, lambda: set(images), iterations),
+        _benchmark("OpenstackInstance()", None, lambda: [OpenstackInstance(identifier=i, **properties)
+                                                         for i in numbers], iterations),
+        _benchmark("OpenstackInstance._from_properties", None, lambda: [
+            OpenstackInstance._from_properties(identifier=i, **properties) for i in numbers], iterations),
+        _benchmark("NovaOpenstackKeypairManager._convert_raw", None, lambda: [
+            keypair_manager._convert_raw(raw_keypair) for raw_keypair in raw_keypairs], iterations),
+        _benchmark("parse_timestamp", None, lambda: [parse_timestamp(timestamp) for timestamp in timestamps],
+                   iterations),
+        _benchmark("dateutil.parser.parse", None, lambda: [parse_datetime(timestamp) for timestamp in timestamps],
+                   iterations),
+        _benchmark("MockOpenstackItemCollection append, get_by_name and remove", None, create_look_up_and_remove,
+                   iterations),
+        _benchmark("MockOpenstackItemCollection.get", None, lambda: [collection.get(image.identifier)
+                                                                     for image in images], iterations),
+        _benchmark("MockOpenstackImageManager.get_by_id (uninstrumented)", None, lambda: [
+            image_manager.get_by_id(image.identifier) for image in images], iterations)
+    ]
+
+
+def compare_results(previous: List[Dict[str, Any]], current: List[Dict[str, Any]], percentile: int=50) \
+        -> Dict[str, float]:
+    """
+    Compares benchmark results (as saved in JSON) between runs.
+    :param previous: the results of the previous run
+    :param current: the results of the current run
+    :param percentile: the percentile of the durations to compare (one of `PERCENTILES`)
+    :return: the ratio of the current duration to the previous duration for each benchmark in both runs, indexed by
+    the benchmark's backend and name
+    """
+    key = f"p{percentile}"
+    previous_durations = {(result["backend"], result["name"]): result[key] for result in previous}
+    ratios = {}
+    for result in current:
+        previous_duration = previous_durations.get((result["backend"], result["name"]))
+        if previous_duration:
+            ratios[f"{result['backend']}:{result['name']}"] = result[key] / previous_duration
+    return ratios
+
+
+def main(arguments: List[str]=None):
+    """
+    Runs the benchmarks from the command line.
+    :param arguments: the command line arguments (defaults to those of the process)
+    """
+    parser = ArgumentParser(description="Benchmarks the OpenStack item managers")
+    parser.add_argument("--backend", choices=BACKENDS, action="append",
+                        help="backend to benchmark against (can be given more than once, default: all)")
+    parser.add_argument("--iterations", type=int, default=DEFAULT_ITERATIONS,
+                        help="number of times to time each operation")
+    parser.add_argument("--items", type=int, default=DEFAULT_NUMBER_OF_ITEMS,
+                        help="number of items of each type to populate the backends with")
+    parser.add_argument("--output", help="file to save the results to, as JSON")
+    parser.add_argument("--compare", help="JSON file of previous results to compare against")
+    parser.add_argument("--micro", action="store_true",
+                        help="also run the in-process micro-benchmarks (on --items items per iteration)")
+    parsed = parser.parse_args(arguments)
+
+    results = []
+    for backend_name in parsed.backend or BACKENDS:
+        results.extend(result.to_json() for result in run_benchmarks(backend_name, parsed.iterations, parsed.items))
+    if parsed.micro:
+        results.extend(result.to_json() for result in run_micro_benchmarks(parsed.iterations, parsed.items))
+
+    print(f"{'backend':<12} {'operation':<60} {'p50 (ms)':>10} {'p90 (ms)':>10} {'p99 (ms)':>10} "
+          f"{'calls/op':>9} {'peak (KiB)':>11}")
+    for result in results:
+        api_calls = result["api_calls_per_iteration"]
+        print(f"{result['backend']:<12} {result['name']:<60} {result['p50'] * 1000:>10.3f} "
+              f"{result['p90'] * 1000:>10.3f} {result['p99'] * 1000:>10.3f} "
+              f"{api_calls if api_calls is not None else '-':>9} {result['peak_memory'] / 1024:>11.1f}")
+
+    if parsed.compare is not None:
+        with open(parsed.compare, "r") as file:
+            ratios = compare_results(json.load(file), results)
+        for name, ratio in sorted(ratios.items()):
+            print(f"{name}: {ratio:.2f}x previous p50")
+
+    if parsed.output is not None:
+        with open(parsed.output, "w") as file:
+            json.dump(results, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+from collections import OrderedDict, defaultdict
+from threading import RLock
+from time import monotonic, perf_counter, time
+from typing import Generic, Type, Optional, List, Set, Dict, Callable, Tuple, TypeVar
+
+from simpleopenstack.instrumentation import InstrumentationEvent
+from simpleopenstack.managers import OpenstackItemManager, Managed, Connector
+from simpleopenstack.models import OpenstackIdentifier, OpenstackItem, OpenstackFlavor, OpenstackImage, \
+    OpenstackNetwork, OpenstackKeypair, OpenstackInstance, Model
+
+DEFAULT_TIME_TO_LIVE: Dict[Type[OpenstackItem], float] = {
+    OpenstackFlavor: 3600.0,
+    OpenstackImage: 600.0,
+    OpenstackNetwork: 600.0,
+    OpenstackKeypair: 60.0,
+    OpenstackInstance: 5.0
+}
+DEFAULT_MAX_SIZE = 1024
+
+_Result = TypeVar("_Result")
+
+
+class CacheStatistics(Model):
+    """
+    Statistics about the use of a cache.
+    """
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """
+        Gets the ratio of lookups that were answered by the cache.
+        :return: the hit ratio (0 if there have been no lookups)
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups > 0 else 0.0
+
+
+class CachingOpenstackItemManager(
+        Generic[Managed, Connector], OpenstackItemManager[Managed, Connector]):
+    """
+    Read-through cache in front of another OpenStack item manager.
+
+    Items looked up by identifier are held in a bounded LRU cache (misses included) and a name index is built from the
+    listing of all items. Cached entries expire after a time-to-live that depends on the type of item. Items created or
+    deleted through the caching manager invalidate the cache, along with the results of any lookups in flight at the
+    time.
+
+    To have the managers from the factories (and so the lookups made by `resolve_identifiers` and when creating
+    instances) use a cache, register the type of caching manager created by `caching_manager_type`.
+    """
+    BACKEND = "cache"
+
+    def __init__(self, manager: OpenstackItemManager[Managed, Connector],
+                 time_to_live: Dict[Type[OpenstackItem], float]=None, max_size: int=DEFAULT_MAX_SIZE,
+                 clock: Callable[[], float]=monotonic):
+        """
+        Constructor.
+        :param manager: the manager to cache the results of
+        :param time_to_live: the time (in seconds) that cached items of each type are valid for. Types that are not
+        given use the values in `DEFAULT_TIME_TO_LIVE` (or are not cached if not in there)
+        :param max_size: the maximum number of items to cache by identifier
+        :param clock: monotonic clock, giving the time in seconds
+        """
+        super().__init__(manager.openstack_connector)
+        self.manager = manager
+        self.time_to_live = {**DEFAULT_TIME_TO_LIVE, **(time_to_live or {})}.get(manager.item_type, 0.0)
+        self.max_size = max_size
+        self.statistics = CacheStatistics()
+        self._clock = clock
+        self._lock = RLock()
+        self._by_id: Dict[OpenstackIdentifier, Tuple[Optional[Managed], float]] = OrderedDict()
+        self._all: Optional[Set[Managed]] = None
+        self._all_by_id: Dict[OpenstackIdentifier, Managed] = {}
+        self._by_name: Dict[str, List[Managed]] = {}
+        self._all_expires_at = 0.0
+        # Incremented on each invalidation, so that the results of lookups started before it are not cached
+        self._generation = 0
+
+    @property
+    def item_type(self) -> Type[Managed]:
+        return self.manager.item_type
+
+    def get_by_id(self, identifier: OpenstackIdentifier) -> Optional[Managed]:
+        return self._instrument_lookup(
+            "get_by_id", lambda: self._get_by_id(identifier), lambda item: int(item is not None))
+
+    def get_by_name(self, name: str) -> List[Managed]:
+        return self._instrument_lookup("get_by_name", lambda: self._get_by_name(name), len)
+
+    def get_all(self) -> Set[Managed]:
+        return self._instrument_lookup("get_all", self._get_all, len)
+
+    def _get_by_id(self, identifier: OpenstackIdentifier) -> Tuple[Optional[Managed], bool]:
+        """
+        Gets the item with the given identifier, from the cache if possible.
+        :param identifier: the item's identifier
+        :return: tuple where the first element is the item (`None` if there is no such item) and the second is whether
+        the lookup was answered by the cache
+        """
+        with self._lock:
+            now = self._clock()
+            if identifier in self._by_id:
+                item, expires_at = self._by_id[identifier]
+                if expires_at > now:
+                    self._by_id.move_to_end(identifier)
+                    self.statistics.hits += 1
+                    return item, True
+                del self._by_id[identifier]
+            if self._all is not None and self._all_expires_at > now:
+                self.statistics.hits += 1
+                return self._all_by_id.get(identifier), True
+            self.statistics.misses += 1
+            generation = self._generation
+
+        item = self.manager.get_by_id(identifier)
+        with self._lock:
+            if generation != self._generation:
+                return item, False
+            self._by_id[identifier] = (item, self._clock() + self.time_to_live)
+            while len(self._by_id) > self.max_size:
+                self._by_id.popitem(last=False)
+                self.statistics.evictions += 1
+        return item, False
+
+    def _get_by_name(self, name: str) -> Tuple[List[Managed], bool]:
+        """
+        Gets the items with the given name, from the cache if possible.
+        :param name: the items' name
+        :return: tuple where the first element is the matched items and the second is whether the lookup was answered
+        by the cache
+        """
+        with self._lock:
+            if self._all is not None and self._all_expires_at > self._clock():
+                self.statistics.hits += 1
+                return list(self._by_name.get(name, [])), True
+        _, by_name = self._load_all()
+        return list(by_name.get(name, [])), False
+
+    def _get_all(self) -> Tuple[Set[Managed], bool]:
+        """
+        Gets all of the items, from the cache if possible.
+        :return: tuple where the first element is the items and the second is whether the lookup was answered by the
+        cache
+        """
+        with self._lock:
+            if self._all is not None and self._all_expires_at > self._clock():
+                self.statistics.hits += 1
+                return set(self._all), True
+        return set(self._load_all()[0]), False
+
+    def _instrument_lookup(self, operation: str, lookup: Callable[[], Tuple[_Result, bool]],
+                           count: Callable[[_Result], int]) -> _Result:
+        """
+        Carries out the given lookup, emitting an instrumentation event that records whether the cache was hit if
+        instrumentation is enabled.
+        :param operation: the name of the lookup operation
+        :param lookup: function that carries out the lookup, returning its result and whether the cache was hit
+        :param count: function that counts the number of items in the result of the lookup
+        :return: the result of the lookup
+        """
+        if not self.instrumentation.instruments:
+            return lookup()[0]
+        started_at = time()
+        start = perf_counter()
+        try:
+            result, cache_hit = lookup()
+        except Exception as e:
+            self.instrumentation.emit(InstrumentationEvent(
+                operation, self.item_type, self.BACKEND, started_at, perf_counter() - start, cache_hit=False, error=e))
+            raise
+        self.instrumentation.emit(InstrumentationEvent(
+            operation, self.item_type, self.BACKEND, started_at, perf_counter() - start, items=count(result),
+            cache_hit=cache_hit))
+        return result
+
+    def create(self, model: Managed) -> Managed:
+        try:
+            return self.manager.create(model)
+        finally:
+            self.invalidate()
+
+    def _delete(self, identifier: OpenstackIdentifier):
+        try:
+            self.manager.delete(identifier=identifier)
+        finally:
+            self.invalidate()
+
+    def invalidate(self):
+        """
+        Invalidates everything in the cache.
+        """
+        with self._lock:
+            self._by_id.clear()
+            self._all = None
+            self._all_by_id = {}
+            self._by_name = {}
+            self._generation += 1
+            self.statistics.invalidations += 1
+
+    def _load_all(self) -> Tuple[Set[Managed], Dict[str, List[Managed]]]:
+        """
+        Loads all items from the underlying manager, (re)building the identifier and name indexes (unless the cache is
+        invalidated whilst loading).
+        :return: tuple where the first element is all of the items and the second is the items indexed by name
+        """
+        with self._lock:
+            self.statistics.misses += 1
+            generation = self._generation
+        items = self.manager.get_all()
+        by_name = defaultdict(list)
+        for item in items:
+            by_name[item.name].append(item)
+        by_name = dict(by_name)
+        with self._lock:
+            if generation == self._generation:
+                self._all = items
+                self._all_by_id = {item.identifier: item for item in items}
+                self._by_name = by_name
+                self._all_expires_at = self._clock() + self.time_to_live
+        return items, by_name
+
+
+def caching_manager_type(manager_type: Type[OpenstackItemManager], time_to_live: Dict[Type[OpenstackItem], float]=None,
+                         max_size: int=DEFAULT_MAX_SIZE) -> Type[CachingOpenstackItemManager]:
+    """
+    Creates a type of caching manager that, like other managers, is constructed with a connector and so can be
+    registered in a `ManagerRegistry` (e.g. the default `manager_registry`). The managers from the factories, and
+    those used to resolve references, are then cached managers (one per connector).
+    :param manager_type: the type of manager to cache the results of
+    :param time_to_live: the time (in seconds) that cached items of each type are valid for (see
+    `CachingOpenstackItemManager`)
+    :param max_size: the maximum number of items to cache by identifier
+    :return: the type of caching manager
+    """
+    def __init__(self: CachingOpenstackItemManager, openstack_connector: Connector):
+        CachingOpenstackItemManager.__init__(self, manager_type(openstack_connector), time_to_live, max_size)
+
+    return type(f"Caching{manager_type.__name__}", (CachingOpenstackItemManager, ), {"__init__": __init__})
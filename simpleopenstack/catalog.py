@@ -0,0 +1,407 @@
+import json
+import os
+import sqlite3
+import zlib
+from contextlib import contextmanager
+from datetime import datetime, timezone, timedelta
+from hashlib import sha256
+from threading import RLock
+from time import time
+from typing import Generic, Type, Optional, List, Set, Dict, Callable, Tuple, Iterable, Iterator
+
+from simpleopenstack.managers import OpenstackItemManager, Managed, Connector
+from simpleopenstack.models import OpenstackIdentifier, OpenstackItem, OpenstackFlavor, OpenstackImage, \
+    OpenstackNetwork, OpenstackConnector, Model
+from simpleopenstack.timestamps import parse_timestamp
+
+DEFAULT_CATALOG_PATH = os.path.join(os.path.expanduser("~"), ".cache", "simpleopenstack", "catalog.sqlite3")
+DEFAULT_TIME_TO_LIVE: Dict[Type[OpenstackItem], float] = {
+    OpenstackFlavor: 86400.0,
+    OpenstackImage: 3600.0,
+    OpenstackNetwork: 3600.0
+}
+DEFAULT_FULL_REFRESH_INTERVAL = 86400.0
+DEFAULT_CLOCK_SKEW = 60.0
+
+# Types of item that are shared by all users of a tenant, so can be cached by auth URL and tenant
+CATALOGUED_ITEM_TYPES = frozenset(DEFAULT_TIME_TO_LIVE.keys())
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS catalog (
+    auth_url TEXT NOT NULL,
+    tenant TEXT NOT NULL,
+    item_type TEXT NOT NULL,
+    validated_at REAL NOT NULL,
+    listed_at REAL NOT NULL,
+    etag TEXT NOT NULL,
+    items BLOB NOT NULL,
+    PRIMARY KEY (auth_url, tenant, item_type)
+)
+"""
+# Properties of items that are timestamps, which are stored in ISO 8601 format
+_TIMESTAMP_PROPERTIES = frozenset({"created_at", "updated_at"})
+
+
+class CatalogEntry(Generic[Managed], Model):
+    """
+    The items of a type in an OpenStack tenant, as stored in a catalog.
+    """
+    def __init__(self, items: List[Managed], validated_at: float, listed_at: float, etag: str):
+        """
+        Constructor.
+        :param items: the items
+        :param validated_at: when the items were last checked against OpenStack (seconds since the epoch)
+        :param listed_at: when all of the items were last listed from OpenStack (seconds since the epoch)
+        :param etag: digest of the stored items, which changes when they do
+        """
+        self.items = items
+        self.validated_at = validated_at
+        self.listed_at = listed_at
+        self.etag = etag
+
+
+class PersistentCatalog:
+    """
+    Catalog of OpenStack items, stored on disk in SQLite so that it can be used across processes. Items are stored by
+    the auth URL and tenant of the connector used to get them, along with their type, as compressed JSON.
+    """
+    def __init__(self, path: str=DEFAULT_CATALOG_PATH):
+        """
+        Constructor.
+        :param path: the location of the SQLite database (created if it does not exist)
+        """
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory != "":
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as connection:
+            connection.execute(_SCHEMA)
+
+    def load(self, openstack_connector: OpenstackConnector, item_type: Type[Managed]) \
+            -> Optional[CatalogEntry[Managed]]:
+        """
+        Loads the items of the given type that are stored for the given connector.
+        :param openstack_connector: the connector
+        :param item_type: the type of item
+        :return: the stored items or `None` if there are none stored
+        """
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT validated_at, listed_at, etag, items FROM catalog "
+                "WHERE auth_url = ? AND tenant = ? AND item_type = ?",
+                PersistentCatalog._get_key(openstack_connector, item_type)).fetchone()
+        if row is None:
+            return None
+        validated_at, listed_at, etag, items = row
+        return CatalogEntry(PersistentCatalog._deserialise(item_type, items), validated_at, listed_at, etag)
+
+    def store(self, openstack_connector: OpenstackConnector, item_type: Type[Managed], items: Iterable[Managed],
+              validated_at: float, listed_at: float) -> CatalogEntry[Managed]:
+        """
+        Stores the given items of the given type for the given connector, replacing any already stored.
+        :param openstack_connector: the connector
+        :param item_type: the type of item
+        :param items: the items
+        :param validated_at: when the items were last checked against OpenStack (seconds since the epoch)
+        :param listed_at: when all of the items were last listed from OpenStack (seconds since the epoch)
+        :return: the stored entry
+        """
+        items = PersistentCatalog.sort(items)
+        serialised = PersistentCatalog._serialise(items)
+        etag = sha256(serialised).hexdigest()
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO catalog (auth_url, tenant, item_type, validated_at, listed_at, etag, items) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                PersistentCatalog._get_key(openstack_connector, item_type)
+                + (validated_at, listed_at, etag, sqlite3.Binary(serialised)))
+        return CatalogEntry(items, validated_at, listed_at, etag)
+
+    def touch(self, openstack_connector: OpenstackConnector, item_type: Type[OpenstackItem], etag: str,
+              validated_at: float, listed_at: float=None) -> bool:
+        """
+        Records that the stored items of the given type for the given connector have been checked against OpenStack
+        and found to be unchanged, if they are still those with the given etag.
+        :param openstack_connector: the connector
+        :param item_type: the type of item
+        :param etag: the etag of the items that were checked
+        :param validated_at: when the items were checked (seconds since the epoch)
+        :param listed_at: when all of the items were listed, if they were (seconds since the epoch)
+        :return: whether the stored items were those checked (and so were updated)
+        """
+        with self._connect() as connection:
+            cursor = connection.execute(
+                "UPDATE catalog SET validated_at = ?, listed_at = COALESCE(?, listed_at) "
+                "WHERE auth_url = ? AND tenant = ? AND item_type = ? AND etag = ?",
+                (validated_at, listed_at) + PersistentCatalog._get_key(openstack_connector, item_type) + (etag, ))
+            return cursor.rowcount > 0
+
+    def invalidate(self, openstack_connector: OpenstackConnector, item_type: Type[OpenstackItem]=None):
+        """
+        Removes the stored items for the given connector.
+        :param openstack_connector: the connector
+        :param item_type: the type of item to remove (all types if `None`)
+        """
+        auth_url, tenant, item_type_name = PersistentCatalog._get_key(openstack_connector, item_type or OpenstackItem)
+        with self._connect() as connection:
+            if item_type is None:
+                connection.execute("DELETE FROM catalog WHERE auth_url = ? AND tenant = ?", (auth_url, tenant))
+            else:
+                connection.execute("DELETE FROM catalog WHERE auth_url = ? AND tenant = ? AND item_type = ?",
+                                   (auth_url, tenant, item_type_name))
+
+    @staticmethod
+    def sort(items: Iterable[Managed]) -> List[Managed]:
+        """
+        Sorts the given items into the order that they are stored in.
+        :param items: the items
+        :return: the sorted items
+        """
+        return sorted(items, key=lambda item: item.identifier)
+
+    @staticmethod
+    def get_etag(items: List[OpenstackItem]) -> str:
+        """
+        Gets the etag that the given items would be stored with.
+        :param items: the items, in the order that they are stored in (see `sort`)
+        :return: the etag
+        """
+        return sha256(PersistentCatalog._serialise(items)).hexdigest()
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """
+        Opens a connection to the database, for a single transaction. Connections are not shared, so that the catalog
+        can be used from many threads (and processes).
+        :return: context of the connection, which commits the transaction (or rolls it back if there is an error) and
+        closes the connection on exit
+        """
+        connection = sqlite3.connect(self.path, timeout=30.0)
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    @staticmethod
+    def _get_key(openstack_connector: OpenstackConnector, item_type: Type[OpenstackItem]) -> Tuple[str, str, str]:
+        """
+        Gets the key that items of the given type are stored by for the given connector.
+        :param openstack_connector: the connector, which must have an auth URL and tenant
+        :param item_type: the type of item
+        :return: the key
+        :raises ValueError: if the connector does not have an auth URL and tenant
+        """
+        auth_url = getattr(openstack_connector, "auth_url", None)
+        tenant = getattr(openstack_connector, "tenant", None)
+        if auth_url is None or tenant is None:
+            raise ValueError(f"Connector does not have an auth URL and tenant to catalog items by: "
+                             f"{type(openstack_connector)}")
+        return auth_url, tenant, item_type.__name__
+
+    @staticmethod
+    def _serialise(items: List[OpenstackItem]) -> bytes:
+        """
+        Serialises the given items.
+        :param items: the items
+        :return: the serialised items
+        """
+        serialisable = []
+        for item in items:
+            properties = item._get_properties()
+            for name in _TIMESTAMP_PROPERTIES & properties.keys():
+                if properties[name] is not None:
+                    properties[name] = properties[name].isoformat()
+            serialisable.append(properties)
+        return zlib.compress(json.dumps(serialisable, separators=(",", ":"), sort_keys=True).encode())
+
+    @staticmethod
+    def _deserialise(item_type: Type[Managed], serialised: bytes) -> List[Managed]:
+        """
+        Deserialises items of the given type.
+        :param item_type: the type of the items
+        :param serialised: the serialised items
+        :return: the items
+        """
+        items = []
+        for properties in json.loads(zlib.decompress(serialised).decode()):
+            for name in _TIMESTAMP_PROPERTIES & properties.keys():
+                properties[name] = parse_timestamp(properties[name])
+            items.append(item_type._from_properties(**properties))
+        return items
+
+
+class PersistentCachingOpenstackItemManager(
+        Generic[Managed, Connector], OpenstackItemManager[Managed, Connector]):
+    """
+    Cache in front of another OpenStack item manager, which keeps all of the items in a `PersistentCatalog` so that
+    new processes can look them up without making any requests to OpenStack (including authenticating).
+
+    Stored items are used without checking them against OpenStack for a time-to-live that depends on the type of item.
+    After that, they are revalidated: where the backend can list the items that have changed since a given time (see
+    `OpenstackItemManager.iter_changed_since`), only those are fetched and merged in; otherwise all of the items are
+    listed again and only stored if they have changed. Deletions are not seen by incremental revalidation, so all of the
+    items are listed every `full_refresh_interval`. Items created or deleted through this manager invalidate the
+    catalog.
+
+    Items that are not in the catalog (e.g. as they have been created elsewhere since it was last revalidated) are
+    looked up in OpenStack and added to it, unless the catalog is trusted to answer that items are absent.
+    """
+    BACKEND = "catalog"
+
+    def __init__(self, manager: OpenstackItemManager[Managed, Connector], catalog: PersistentCatalog,
+                 time_to_live: Dict[Type[OpenstackItem], float]=None,
+                 full_refresh_interval: float=DEFAULT_FULL_REFRESH_INTERVAL, clock_skew: float=DEFAULT_CLOCK_SKEW,
+                 trust_absence: bool=False, clock: Callable[[], float]=time):
+        """
+        Constructor.
+        :param manager: the manager to cache the results of, which must manage flavours, images or networks and have a
+        connector with an auth URL and tenant
+        :param catalog: the catalog to keep the items in
+        :param time_to_live: the time (in seconds) that stored items of each type are used for before being
+        revalidated. Types that are not given use the values in `DEFAULT_TIME_TO_LIVE`
+        :param full_refresh_interval: the maximum time (in seconds) between listings of all the items
+        :param clock_skew: the maximum difference (in seconds) between our clock and the backend's
+        :param trust_absence: whether lookups of items that are not in the (valid) catalog are answered from it, without
+        asking OpenStack. Items created elsewhere are then not found until the catalog is next revalidated
+        :param clock: clock giving the time in seconds since the epoch
+        """
+        if manager.item_type not in CATALOGUED_ITEM_TYPES:
+            raise ValueError(f"Items of type {manager.item_type.__name__} cannot be catalogued (only "
+                             f"{sorted(item_type.__name__ for item_type in CATALOGUED_ITEM_TYPES)})")
+        PersistentCatalog._get_key(manager.openstack_connector, manager.item_type)
+        super().__init__(manager.openstack_connector)
+        self.manager = manager
+        self.catalog = catalog
+        self.time_to_live = {**DEFAULT_TIME_TO_LIVE, **(time_to_live or {})}[manager.item_type]
+        self.full_refresh_interval = full_refresh_interval
+        self.clock_skew = clock_skew
+        self.trust_absence = trust_absence
+        self._clock = clock
+        self._lock = RLock()
+        self._entry: Optional[CatalogEntry[Managed]] = None
+        self._by_id: Dict[OpenstackIdentifier, Managed] = {}
+        self._by_name: Dict[str, List[Managed]] = {}
+
+    @property
+    def item_type(self) -> Type[Managed]:
+        return self.manager.item_type
+
+    def get_by_id(self, identifier: OpenstackIdentifier) -> Optional[Managed]:
+        with self._lock:
+            self._ensure_valid()
+            item = self._by_id.get(identifier)
+            if item is not None or self.trust_absence:
+                return item
+            entry = self._entry
+        item = self.manager.get_by_id(identifier)
+        if item is not None:
+            self._add(entry, [item])
+        return item
+
+    def get_by_name(self, name: str) -> List[Managed]:
+        with self._lock:
+            self._ensure_valid()
+            items = list(self._by_name.get(name, []))
+            if len(items) > 0 or self.trust_absence:
+                return items
+            entry = self._entry
+        items = self.manager.get_by_name(name)
+        if len(items) > 0:
+            self._add(entry, items)
+        return items
+
+    def get_all(self) -> Set[Managed]:
+        with self._lock:
+            self._ensure_valid()
+            return set(self._entry.items)
+
+    def create(self, model: Managed) -> Managed:
+        try:
+            return self.manager.create(model)
+        finally:
+            self.invalidate()
+
+    def _delete(self, identifier: OpenstackIdentifier):
+        try:
+            self.manager.delete(identifier=identifier)
+        finally:
+            self.invalidate()
+
+    def invalidate(self):
+        """
+        Invalidates the stored items, so they are listed again when next needed.
+        """
+        with self._lock:
+            self.catalog.invalidate(self.openstack_connector, self.item_type)
+            self._entry = None
+
+    def _ensure_valid(self):
+        """
+        Ensures that the items held are valid, loading them from the catalog or revalidating them against OpenStack
+        if required. Must be called with the lock held.
+        """
+        now = self._clock()
+        if self._entry is not None and self._entry.validated_at + self.time_to_live > now:
+            return
+        entry = self.catalog.load(self.openstack_connector, self.item_type)
+        if entry is not None and entry.validated_at + self.time_to_live <= now:
+            entry = self._revalidate(entry, now)
+        elif entry is None:
+            entry = self.catalog.store(self.openstack_connector, self.item_type, self.manager.get_all(), now, now)
+        self._set_entry(entry)
+
+    def _revalidate(self, entry: CatalogEntry[Managed], now: float) -> CatalogEntry[Managed]:
+        """
+        Revalidates the given stored items against OpenStack, storing the result.
+        :param entry: the stored items
+        :param now: the current time (seconds since the epoch)
+        :return: the revalidated items
+        """
+        changed_items = None
+        if entry.listed_at + self.full_refresh_interval > now:
+            since = datetime.fromtimestamp(entry.validated_at, timezone.utc) - timedelta(seconds=self.clock_skew)
+            changed_items = self.manager.iter_changed_since(since)
+
+        if changed_items is None:
+            items = self.manager.get_all()
+            listed_at = now
+        else:
+            merged = {item.identifier: item for item in entry.items}
+            merged.update((item.identifier, item) for item in changed_items)
+            items = merged.values()
+            listed_at = entry.listed_at
+
+        # The items are only stored again if they have changed
+        items = PersistentCatalog.sort(items)
+        if PersistentCatalog.get_etag(items) == entry.etag \
+                and self.catalog.touch(self.openstack_connector, self.item_type, entry.etag, now, listed_at):
+            return CatalogEntry(entry.items, now, listed_at, entry.etag)
+        return self.catalog.store(self.openstack_connector, self.item_type, items, now, listed_at)
+
+    def _add(self, entry: CatalogEntry[Managed], items: List[Managed]):
+        """
+        Adds the given items, found in OpenStack but not in the given catalog entry, to the catalog (unless the entry
+        has been replaced or invalidated since).
+        :param entry: the catalog entry that the items were not found in
+        :param items: the items to add
+        """
+        with self._lock:
+            if self._entry is not entry:
+                return
+            merged = {item.identifier: item for item in entry.items}
+            merged.update((item.identifier, item) for item in items)
+            self._set_entry(self.catalog.store(
+                self.openstack_connector, self.item_type, merged.values(), entry.validated_at, entry.listed_at))
+
+    def _set_entry(self, entry: CatalogEntry[Managed]):
+        """
+        Sets the items held, (re)building the indexes of them.
+        :param entry: the items
+        """
+        by_name: Dict[str, List[Managed]] = {}
+        for item in entry.items:
+            by_name.setdefault(item.name, []).append(item)
+        self._entry = entry
+        self._by_id = {item.identifier: item for item in entry.items}
+        self._by_name = by_name
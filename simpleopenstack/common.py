@@ -1,5 +1,11 @@
+from collections import defaultdict
+from threading import Lock
+from time import monotonic
+from typing import Iterable, Tuple, Type, Dict, Union, List, Optional, Callable
+
+from simpleopenstack.concurrency import run_concurrently, DEFAULT_MAX_CONCURRENCY
 from simpleopenstack.managers import OpenstackItemManager
-from simpleopenstack.models import ItemNotFoundException
+from simpleopenstack.models import ItemNotFoundException, OpenstackItem, OpenstackConnector, OpenstackIdentifier
 
 
 def raise_if_absent(identifier: str, item_manager: OpenstackItemManager):
@@ -20,22 +26,210 @@ def raise_if_absent(identifier: str, item_manager: OpenstackItemManager):
 
 def get_identifier(name_or_identifier: str, item_manager: OpenstackItemManager) -> str:
     """
-    TODO
-    :param name_or_identifier:
-    :param item_manager:
-    :return:
+    Gets the identifier of the item with the given identifier or name.
+    :param name_or_identifier: the identifier or name of the item
+    :param item_manager: manager of the items of the required type
+    :return: the identifier of the item
+    :raises ValueError: if there is no item with the given identifier or name or if there is more than one item with
+    the name
     """
     item = item_manager.get_by_id(name_or_identifier)
     if item is not None:
         return name_or_identifier
 
-    items = item_manager.get_by_name(name_or_identifier)
-    if len(items) == 1:
-        return items[0].identifier
-    elif len(items) > 1:
-        raise ValueError(
-            f"There is more than one item of type \"{item_manager.item_type.__name__}\" with the name "
-            f"\"{name_or_identifier}\" - please refer to the required item by ID to resolve the ambiguity")
-    elif len(items) == 0:
-        raise ValueError(
-            f"No item of type \"{item_manager.item_type.__name__}\" with ID or name \"{name_or_identifier}\" found")
+    identifiers = [item.identifier for item in item_manager.get_by_name(name_or_identifier)]
+    return _get_only_identifier(name_or_identifier, identifiers, item_manager.item_type)
+
+
+def _get_only_identifier(name: str, identifiers: List[OpenstackIdentifier], item_type: Type[OpenstackItem]) \
+        -> OpenstackIdentifier:
+    """
+    Gets the identifier of the only item with the given name.
+    :param name: the name of the items
+    :param identifiers: the identifiers of the items with the name
+    :param item_type: the type of the items
+    :return: the identifier of the item
+    :raises ValueError: if there is not exactly one item with the name
+    """
+    if len(identifiers) == 1:
+        return identifiers[0]
+    elif len(identifiers) > 1:
+        raise _create_ambiguous_name_error(name, item_type)
+    raise _create_not_found_error(name, item_type)
+
+
+class _NameIndex:
+    """
+    Index of the names and identifiers of all the items of a type.
+    """
+    def __init__(self, items: Iterable[OpenstackItem], expires_at: float):
+        """
+        Constructor.
+        :param items: all of the items of the type
+        :param expires_at: time at which the index is no longer valid
+        """
+        self.expires_at = expires_at
+        self.identifiers: Dict[str, OpenstackIdentifier] = {}
+        self.names: Dict[str, List[OpenstackIdentifier]] = defaultdict(list)
+        for item in items:
+            self.identifiers[str(item.identifier)] = item.identifier
+            self.names[item.name].append(item.identifier)
+
+
+class IdentifierResolver:
+    """
+    Resolves the identifiers of items from their identifiers or names, using an index of the names of all items of each
+    type, which is built from a single listing of the items.
+
+    References are looked up by identifier first (as `get_identifier` does); the index is only built when a reference
+    is not an identifier, so resolving identifiers never lists the items. Until it expires, references found in the
+    index are resolved from it without any requests to OpenStack, so an item that has been deleted or renamed since the
+    index was built may still be resolved (use `invalidate` after making such changes). References that are not found
+    in the index are looked up directly, as `get_identifier` does, rather than by rebuilding the index. An item given
+    the same name as an indexed item after the index was built is not seen as making the name ambiguous until then.
+    """
+    DEFAULT_TIME_TO_LIVE = 30.0
+
+    def __init__(self, time_to_live: float=DEFAULT_TIME_TO_LIVE, clock: Callable[[], float]=monotonic):
+        """
+        Constructor.
+        :param time_to_live: the time (in seconds) that an index is used for before it is rebuilt
+        :param clock: monotonic clock, giving the time in seconds
+        """
+        self.time_to_live = time_to_live
+        self._clock = clock
+        self._indexes: Dict[Type[OpenstackItem], _NameIndex] = {}
+        self._locks: Dict[Type[OpenstackItem], Lock] = defaultdict(Lock)
+        self._locks_lock = Lock()
+
+    def resolve(self, name_or_identifier: str, item_manager: OpenstackItemManager) -> OpenstackIdentifier:
+        """
+        Gets the identifier of the item with the given identifier or name.
+        :param name_or_identifier: the identifier or name of the item
+        :param item_manager: manager of the items of the required type
+        :return: the identifier of the item
+        :raises ValueError: if there is no item with the given identifier or name or if there is more than one item
+        with the name (as `get_identifier`)
+        """
+        index = self._get_index(item_manager.item_type)
+        if index is not None:
+            identifier = IdentifierResolver._resolve_from_index(name_or_identifier, index)
+            if identifier is not None:
+                return identifier
+            return get_identifier(name_or_identifier, item_manager)
+
+        if item_manager.get_by_id(name_or_identifier) is not None:
+            return name_or_identifier
+        index = self._build_index(item_manager)
+        return _get_only_identifier(name_or_identifier, index.names.get(name_or_identifier, []),
+                                    item_manager.item_type)
+
+    def invalidate(self, item_type: Type[OpenstackItem]=None):
+        """
+        Invalidates the index of the given type of item.
+        :param item_type: the type of item to invalidate the index of (all indexes are invalidated if `None`)
+        """
+        with self._locks_lock:
+            locks = {indexed_type: lock for indexed_type, lock in self._locks.items()
+                     if item_type is None or indexed_type == item_type}
+        for indexed_type, lock in locks.items():
+            with lock:
+                self._indexes.pop(indexed_type, None)
+
+    def _get_index(self, item_type: Type[OpenstackItem]) -> Optional[_NameIndex]:
+        """
+        Gets the index for the given type of item, if it has been built and has not expired.
+        :param item_type: the type of item
+        :return: the index or `None` if there is no such index
+        """
+        index = self._indexes.get(item_type)
+        if index is None or index.expires_at <= self._clock():
+            return None
+        return index
+
+    def _build_index(self, item_manager: OpenstackItemManager) -> _NameIndex:
+        """
+        Builds the index for the type of item that the given manager manages, unless it has been built (and has not
+        expired) since it was last got.
+        :param item_manager: the manager of the items
+        :return: the index
+        """
+        item_type = item_manager.item_type
+        with self._locks_lock:
+            lock = self._locks[item_type]
+        with lock:
+            index = self._get_index(item_type)
+            if index is None:
+                index = _NameIndex(item_manager.get_all(), self._clock() + self.time_to_live)
+                self._indexes[item_type] = index
+            return index
+
+    @staticmethod
+    def _resolve_from_index(name_or_identifier: str, index: _NameIndex) -> Optional[OpenstackIdentifier]:
+        """
+        Resolves the identifier of the item with the given identifier or name using the given index.
+        :param name_or_identifier: the identifier or name of the item
+        :param index: the index to use
+        :return: the identifier of the item or `None` if it is not in the index (or if more than one item in the index
+        has the name, which is left for a direct lookup to confirm)
+        """
+        if str(name_or_identifier) in index.identifiers:
+            return index.identifiers[str(name_or_identifier)]
+        identifiers = index.names.get(name_or_identifier, [])
+        return identifiers[0] if len(identifiers) == 1 else None
+
+
+def _create_ambiguous_name_error(name: str, item_type: Type[OpenstackItem]) -> ValueError:
+    """
+    Creates the error raised when there is more than one item with a name that has been used to refer to an item.
+    :param name: the name
+    :param item_type: the type of the item
+    :return: the error
+    """
+    return ValueError(
+        f"There is more than one item of type \"{item_type.__name__}\" with the name "
+        f"\"{name}\" - please refer to the required item by ID to resolve the ambiguity")
+
+
+def _create_not_found_error(name_or_identifier: str, item_type: Type[OpenstackItem]) -> ValueError:
+    """
+    Creates the error raised when there is no item with a name or identifier that has been used to refer to an item.
+    :param name_or_identifier: the name or identifier
+    :param item_type: the type of the item
+    :return: the error
+    """
+    return ValueError(f"No item of type \"{item_type.__name__}\" with ID or name \"{name_or_identifier}\" found")
+
+
+def resolve_identifiers(references: Iterable[Tuple[Type[OpenstackItem], str]], openstack_connector: OpenstackConnector,
+                        max_concurrency: int=DEFAULT_MAX_CONCURRENCY, resolver: IdentifierResolver=None) \
+        -> Dict[Tuple[Type[OpenstackItem], str], Union[OpenstackIdentifier, Exception]]:
+    """
+    Resolves the identifiers of the given references to OpenStack items. Each distinct reference is only looked up once
+    and lookups are made concurrently.
+    :param references: the type of each referred to item, along with the name or identifier used to refer to it
+    :param openstack_connector: connector to the OpenStack environment that the items are in
+    :param max_concurrency: the maximum number of lookups to make at the same time
+    :param resolver: resolver to use to look up the references (each reference is looked up with `get_identifier` if
+    not given)
+    :return: the identifier of each reference or, if the reference could not be resolved, the exception (either a
+    `ValueError` or an `ItemNotFoundException`, as would be raised by `raise_if_absent`)
+    """
+    from simpleopenstack.factories import OpenstackManagerFactory
+    manager_factory = OpenstackManagerFactory(openstack_connector)
+    references = list(dict.fromkeys(references))
+    managers = {item_type: manager_factory.create_for_managing(item_type)
+                for item_type in {item_type for item_type, _ in references}}
+
+    def resolve(reference: Tuple[Type[OpenstackItem], str]) -> OpenstackIdentifier:
+        item_type, name_or_identifier = reference
+        if name_or_identifier is None:
+            raise ValueError(f"None is not a valid identifier for items of type \"{item_type.__name__}\"")
+        try:
+            if resolver is not None:
+                return resolver.resolve(name_or_identifier, managers[item_type])
+            return get_identifier(name_or_identifier, managers[item_type])
+        except ValueError as e:
+            raise ItemNotFoundException(str(e))
+
+    return dict(zip(references, run_concurrently(resolve, references, max_concurrency)))
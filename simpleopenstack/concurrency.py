@@ -0,0 +1,109 @@
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock, Event
+from typing import Callable, Iterable, List, TypeVar, Union, Dict, Hashable, Optional
+
+DEFAULT_MAX_CONCURRENCY = 8
+
+_Argument = TypeVar("_Argument")
+_Result = TypeVar("_Result")
+
+
+def run_concurrently(function: Callable[[_Argument], _Result], arguments: Iterable[_Argument],
+                     max_concurrency: int=DEFAULT_MAX_CONCURRENCY) -> List[Union[_Result, Exception]]:
+    """
+    Calls the given function with each of the given arguments, using a bounded pool of threads.
+    :param function: the function to call
+    :param arguments: the arguments to call the function with (one call per argument)
+    :param max_concurrency: the maximum number of calls to make at the same time
+    :return: the result of each call, in the same order as the arguments. If a call raised an exception, the exception
+    is given in place of the result
+    """
+    if max_concurrency < 1:
+        raise ValueError(f"Maximum concurrency must be at least 1: {max_concurrency}")
+    arguments = list(arguments)
+    if len(arguments) == 0:
+        return []
+
+    def call(argument: _Argument) -> Union[_Result, Exception]:
+        try:
+            return function(argument)
+        except Exception as e:
+            return e
+
+    if len(arguments) == 1 or max_concurrency == 1:
+        return [call(argument) for argument in arguments]
+    with ThreadPoolExecutor(max_workers=min(max_concurrency, len(arguments))) as executor:
+        return list(executor.map(call, arguments))
+
+
+class _Flight:
+    """
+    Call that is in flight, which other callers may wait for the outcome of.
+    """
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls, so that callers that make a call with the same key as one that is already in
+    flight wait for and share its outcome (result or exception), rather than making the call again.
+
+    Results are shared, not copied, so they must not be modified by callers. Calls that start after a call with the
+    same key has finished are made again (nothing is cached).
+    """
+    def __init__(self):
+        self.calls = 0
+        self.coalesced = 0
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._lock = Lock()
+
+    def do(self, key: Hashable, function: Callable[[], _Result]) -> _Result:
+        """
+        Calls the given function, unless a call with the given key is already in flight, in which case its outcome is
+        waited for.
+        :param key: key that identifies the call (calls with equal keys must be interchangeable)
+        :param function: the function to call
+        :return: the result of the call
+        :raises Exception: the exception raised by the call
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is None:
+                flight = _Flight()
+                self._flights[key] = flight
+                self.calls += 1
+                leader = True
+            else:
+                self.coalesced += 1
+                leader = False
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = function()
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+            flight.done.set()
+
+    def forget(self):
+        """
+        Stops callers from joining the calls that are currently in flight, so that they make the calls again. Used
+        after a change, so that callers do not get results from before it. Callers already waiting are unaffected.
+        """
+        with self._lock:
+            self._flights.clear()
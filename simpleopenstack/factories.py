@@ -1,16 +1,159 @@
 from abc import ABCMeta, abstractmethod
-from typing import TypeVar, Generic, Dict, Type
+from importlib import import_module
+from threading import Lock, RLock
+from typing import TypeVar, Generic, Dict, Type, Tuple, Union
 
+from simpleopenstack.async_managers import AsyncOpenstackItemManager, AsyncOpenstackKeypairManager, \
+    AsyncOpenstackInstanceManager, AsyncOpenstackImageManager, AsyncOpenstackFlavorManager, AsyncOpenstackNetworkManager
 from simpleopenstack.managers import OpenstackImageManager, OpenstackKeypairManager, OpenstackInstanceManager, \
     OpenstackItemManager, OpenstackFlavorManager, OpenstackNetworkManager
 from simpleopenstack.models import OpenstackConnector, OpenstackItem, OpenstackNetwork, OpenstackFlavor, OpenstackImage, \
     OpenstackInstance, OpenstackKeypair
-from simpleopenstack.os_managers import GlanceOpenstackImageManager, NovaOpenstackKeypairManager, \
-    NovaOpenstackInstanceManager, RealOpenstackConnector, NovaOpenstackFlavorManager, NeutronOpenstackNetworkManager
-from simpleopenstack.os_mock_managers import MockOpenstackKeypairManager, MockOpenstackInstanceManager, \
-    MockOpenstackImageManager, MockOpenstackConnector, MockOpenstackFlavorManager, MockOpenstackNetworkManager
 
 _OpenstackItemManagerType = TypeVar("OpenstackItemFactoryProductType", bound=OpenstackItemManager)
+_AsyncOpenstackItemManagerType = TypeVar("AsyncOpenstackItemFactoryProductType", bound=AsyncOpenstackItemManager)
+
+# Backends are referred to by the paths of their types, so that their modules (and the OpenStack clients that the real
+# managers use) are only imported when first needed
+_REAL_CONNECTOR = "simpleopenstack.os_managers.RealOpenstackConnector"
+_MOCK_CONNECTOR = "simpleopenstack.os_mock_managers.MockOpenstackConnector"
+_FAN_OUT_CONNECTOR = "simpleopenstack.fanout.FanOutOpenstackConnector"
+
+_TypeOrPath = Union[type, str]
+
+
+def _get_path(type_to_get_path_of: type) -> str:
+    """
+    Gets the path of the given type.
+    :param type_to_get_path_of: the type
+    :return: the path of the type, made up of its module and name
+    """
+    return f"{type_to_get_path_of.__module__}.{type_to_get_path_of.__qualname__}"
+
+
+def _load(path: str) -> type:
+    """
+    Loads the type with the given path, importing its module if it has not already been imported.
+    :param path: the path of the type, made up of its module and name
+    :return: the type
+    """
+    module_name, _, name = path.rpartition(".")
+    return getattr(import_module(module_name), name)
+
+
+class ManagerRegistry:
+    """
+    Registry of the managers to use for each type of item, for each type of connector (i.e. backend).
+
+    Types may be registered by their paths (e.g. "simpleopenstack.os_managers.NovaOpenstackKeypairManager"), in which
+    case their modules are only imported when a manager of that type is first needed.
+    """
+    def __init__(self):
+        self._managers: Dict[Tuple[str, Type[OpenstackItem], bool], _TypeOrPath] = {}
+        self._lock = Lock()
+
+    def register(self, connector_type: _TypeOrPath, item_type: Type[OpenstackItem], manager_type: _TypeOrPath,
+                 async_manager_type: _TypeOrPath=None):
+        """
+        Registers the managers to use for the given type of item, with connectors of the given type. Replaces any
+        managers already registered for them.
+        :param connector_type: the type of connector (or its path)
+        :param item_type: the type of item
+        :param manager_type: the type of manager (or its path), which is constructed with the connector
+        :param async_manager_type: the type of asynchronous manager (or its path), which is constructed with the
+        connector (if not given, asynchronous managers are not supported)
+        """
+        connector_path = connector_type if isinstance(connector_type, str) else _get_path(connector_type)
+        with self._lock:
+            self._managers[(connector_path, item_type, False)] = manager_type
+            if async_manager_type is not None:
+                self._managers[(connector_path, item_type, True)] = async_manager_type
+            else:
+                self._managers.pop((connector_path, item_type, True), None)
+
+    def get_manager_type(self, connector_type: type, item_type: Type[OpenstackItem], asynchronous: bool=False) -> type:
+        """
+        Gets the type of manager to use for the given type of item, with connectors of the given type.
+        :param connector_type: the type of connector
+        :param item_type: the type of item
+        :param asynchronous: whether to get the type of asynchronous manager
+        :return: the type of manager
+        :raises ValueError: if there is no manager registered for the type of item, with the type of connector
+        """
+        key = (_get_path(connector_type), item_type, asynchronous)
+        manager_type = self._managers.get(key)
+        if manager_type is None:
+            raise ValueError(f"Unsupported connector: {connector_type}")
+        if isinstance(manager_type, str):
+            manager_type = _load(manager_type)
+            with self._lock:
+                if self._managers.get(key) is not None:
+                    self._managers[key] = manager_type
+        return manager_type
+
+
+manager_registry = ManagerRegistry()
+
+for _item_type, _manager_name in ((OpenstackKeypair, "NovaOpenstackKeypairManager"),
+                                  (OpenstackInstance, "NovaOpenstackInstanceManager"),
+                                  (OpenstackImage, "GlanceOpenstackImageManager"),
+                                  (OpenstackFlavor, "NovaOpenstackFlavorManager"),
+                                  (OpenstackNetwork, "NeutronOpenstackNetworkManager")):
+    manager_registry.register(_REAL_CONNECTOR, _item_type, f"simpleopenstack.os_managers.{_manager_name}",
+                              f"simpleopenstack.os_managers.Async{_manager_name}")
+    _mock_manager_name = f"MockOpenstack{_item_type.__name__[len('Openstack'):]}Manager"
+    manager_registry.register(_MOCK_CONNECTOR, _item_type, f"simpleopenstack.os_mock_managers.{_mock_manager_name}",
+                              f"simpleopenstack.os_mock_managers.Async{_mock_manager_name}")
+    manager_registry.register(_FAN_OUT_CONNECTOR, _item_type,
+                              f"simpleopenstack.fanout.FanOut{_mock_manager_name[len('Mock'):]}")
+
+# Re-entrant as managers may get the (shared) managers they use when constructed
+_manager_cache_lock = RLock()
+
+
+def get_manager(openstack_connector: OpenstackConnector, item_type: Type[OpenstackItem], asynchronous: bool=False,
+                registry: ManagerRegistry=manager_registry):
+    """
+    Gets the manager of the given type of item for the given connector.
+
+    Managers are cached against the connector (by identity, not equality) so asking for the same type of manager for
+    the same connector again gives the same manager, along with the clients it has already set up. The cached managers
+    are released along with the connector.
+
+    The manager, including its state, is shared by everything that gets it (e.g. the factories and the resolution of
+    the references made by instances that are created): changes to its `instrumentation` are seen by all of them, as
+    are its identifier resolver's index and, for caching managers, its cache. Managers are safe to use from many
+    threads at once. For a manager with state of its own, construct one directly, using the type given by
+    `ManagerRegistry.get_manager_type`.
+    :param openstack_connector: the connector
+    :param item_type: the type of item
+    :param asynchronous: whether to get an asynchronous manager
+    :param registry: the registry of the managers to use
+    :return: the manager
+    :raises ValueError: if there is no manager registered for the type of item, with the type of connector
+    """
+    manager_type = registry.get_manager_type(type(openstack_connector), item_type, asynchronous)
+    return _get_cached_manager(openstack_connector, manager_type)
+
+
+def _get_cached_manager(openstack_connector: OpenstackConnector, manager_type: type):
+    """
+    Gets the manager of the given type for the given connector, from those cached against the connector (creating and
+    caching it if there is not one yet).
+    :param openstack_connector: the connector
+    :param manager_type: the type of manager
+    :return: the manager
+    """
+    managers = openstack_connector._get_cached_managers()
+    manager = managers.get(manager_type)
+    if manager is None:
+        with _manager_cache_lock:
+            managers = openstack_connector._get_cached_managers()
+            manager = managers.get(manager_type)
+            if manager is None:
+                manager = manager_type(openstack_connector)
+                managers[manager_type] = manager
+    return manager
 
 
 class _OpenstackFactory(metaclass=ABCMeta):
@@ -25,114 +168,113 @@ class _OpenstackFactory(metaclass=ABCMeta):
         self.openstack_connector = openstack_connector
 
 
-class OpenstackItemManagerFactory(Generic[_OpenstackItemManagerType], _OpenstackFactory, metaclass=ABCMeta):
+class OpenstackItemManagerFactory(
+        Generic[_OpenstackItemManagerType, _AsyncOpenstackItemManagerType], _OpenstackFactory, metaclass=ABCMeta):
     """
     Factory for Openstack item managers.
     """
-    @staticmethod
+    @property
     @abstractmethod
-    def _connector_manager_map() -> Dict[Type[OpenstackConnector], _OpenstackItemManagerType]:
+    def item_type(self) -> Type[OpenstackItem]:
         """
-        Gets the mapping between the Openstack connector type and the manager for that type that will work with the
-        connector.
-        :return: manager for type and connector
+        Gets the type of item that the managers produced by this factory manage.
+        :return: the type of item
         """
 
     def create(self) -> _OpenstackItemManagerType:
         """
-        Creates a manger.
+        Creates a manger (or gets the one already created for the connector, which is shared: see `get_manager`).
+        :return: the created manager
+        """
+        return get_manager(self.openstack_connector, self.item_type)
+
+    def create_async(self) -> _AsyncOpenstackItemManagerType:
+        """
+        Creates an asynchronous manger (or gets the one already created for the connector, which is shared: see
+        `get_manager`).
         :return: the created manager
         """
-        if type(self.openstack_connector) not in self._connector_manager_map():
-            raise ValueError(f"Unsupported connector: {type(self.openstack_connector)}")
-        return self._connector_manager_map()[type(self.openstack_connector)](self.openstack_connector)
+        return get_manager(self.openstack_connector, self.item_type, asynchronous=True)
 
 
-class OpenstackKeypairManagerFactory(OpenstackItemManagerFactory[OpenstackKeypairManager]):
+class OpenstackKeypairManagerFactory(
+        OpenstackItemManagerFactory[OpenstackKeypairManager, AsyncOpenstackKeypairManager]):
     """
     Factory for Openstack key-pair managers.
     """
-    @staticmethod
-    def _connector_manager_map():
-        return {
-            RealOpenstackConnector: NovaOpenstackKeypairManager,
-            MockOpenstackConnector: MockOpenstackKeypairManager
-        }
+    item_type = OpenstackKeypair
 
 
-class OpenstackInstanceManagerFactory(OpenstackItemManagerFactory[OpenstackInstanceManager]):
+class OpenstackInstanceManagerFactory(
+        OpenstackItemManagerFactory[OpenstackInstanceManager, AsyncOpenstackInstanceManager]):
     """
     Factory for Openstack instance managers.
     """
-    @staticmethod
-    def _connector_manager_map():
-        return {
-            RealOpenstackConnector: NovaOpenstackInstanceManager,
-            MockOpenstackConnector: MockOpenstackInstanceManager
-        }
+    item_type = OpenstackInstance
 
 
-class OpenstackImageManagerFactory(OpenstackItemManagerFactory[OpenstackImageManager]):
+class OpenstackImageManagerFactory(
+        OpenstackItemManagerFactory[OpenstackImageManager, AsyncOpenstackImageManager]):
     """
     Factory for Openstack image managers.
     """
-    @staticmethod
-    def _connector_manager_map():
-        return {
-            RealOpenstackConnector: GlanceOpenstackImageManager,
-            MockOpenstackConnector: MockOpenstackImageManager
-        }
+    item_type = OpenstackImage
 
 
-class OpenstackFlavorManagerFactory(OpenstackItemManagerFactory[OpenstackFlavorManager]):
+class OpenstackFlavorManagerFactory(
+        OpenstackItemManagerFactory[OpenstackFlavorManager, AsyncOpenstackFlavorManager]):
     """
     Factory for Openstack flavour managers.
     """
-    @staticmethod
-    def _connector_manager_map():
-        return {
-            RealOpenstackConnector: NovaOpenstackFlavorManager,
-            MockOpenstackConnector: MockOpenstackFlavorManager
-        }
+    item_type = OpenstackFlavor
 
 
-class OpenstackNetworkManagerFactory(OpenstackItemManagerFactory[OpenstackNetworkManager]):
+class OpenstackNetworkManagerFactory(
+        OpenstackItemManagerFactory[OpenstackNetworkManager, AsyncOpenstackNetworkManager]):
     """
     Factory for Openstack network managers.
     """
-    @staticmethod
-    def _connector_manager_map():
-        return {
-            RealOpenstackConnector: NeutronOpenstackNetworkManager,
-            MockOpenstackConnector: MockOpenstackNetworkManager
-        }
+    item_type = OpenstackNetwork
 
 
 class OpenstackManagerFactory(_OpenstackFactory):
     """
-    Factory for creating Openstack managers for different types of Openstack items.
+    Factory for creating Openstack managers for different types of Openstack items. The managers for a connector are
+    shared (see `get_manager`).
     """
     def create_for_managing(self, item_type: Type[OpenstackItem]) -> OpenstackItemManager:
-        return {
-            OpenstackKeypair: OpenstackKeypairManagerFactory,
-            OpenstackInstance: OpenstackInstanceManagerFactory,
-            OpenstackImage: OpenstackImageManagerFactory,
-            OpenstackFlavor: OpenstackFlavorManagerFactory,
-            OpenstackNetwork: OpenstackNetworkManagerFactory,
-        }[item_type](self.openstack_connector).create()
+        return get_manager(self.openstack_connector, item_type)
+
+    def create_async_for_managing(self, item_type: Type[OpenstackItem]) -> AsyncOpenstackItemManager:
+        return get_manager(self.openstack_connector, item_type, asynchronous=True)
 
     def create_keypair_manager(self) -> OpenstackKeypairManager:
-        return OpenstackKeypairManagerFactory(self.openstack_connector).create()
+        return get_manager(self.openstack_connector, OpenstackKeypair)
 
     def create_instance_manager(self) -> OpenstackInstanceManager:
-        return OpenstackInstanceManagerFactory(self.openstack_connector).create()
+        return get_manager(self.openstack_connector, OpenstackInstance)
 
     def create_image_manager(self) -> OpenstackImageManager:
-        return OpenstackImageManagerFactory(self.openstack_connector).create()
+        return get_manager(self.openstack_connector, OpenstackImage)
 
     def create_flavor_manager(self) -> OpenstackFlavorManager:
-        return OpenstackFlavorManagerFactory(self.openstack_connector).create()
+        return get_manager(self.openstack_connector, OpenstackFlavor)
 
     def create_network_manager(self) -> OpenstackNetworkManager:
-        return OpenstackNetworkManagerFactory(self.openstack_connector).create()
+        return get_manager(self.openstack_connector, OpenstackNetwork)
+
+    def create_async_keypair_manager(self) -> AsyncOpenstackKeypairManager:
+        return get_manager(self.openstack_connector, OpenstackKeypair, asynchronous=True)
+
+    def create_async_instance_manager(self) -> AsyncOpenstackInstanceManager:
+        return get_manager(self.openstack_connector, OpenstackInstance, asynchronous=True)
+
+    def create_async_image_manager(self) -> AsyncOpenstackImageManager:
+        return get_manager(self.openstack_connector, OpenstackImage, asynchronous=True)
+
+    def create_async_flavor_manager(self) -> AsyncOpenstackFlavorManager:
+        return get_manager(self.openstack_connector, OpenstackFlavor, asynchronous=True)
+
+    def create_async_network_manager(self) -> AsyncOpenstackNetworkManager:
+        return get_manager(self.openstack_connector, OpenstackNetwork, asynchronous=True)
 
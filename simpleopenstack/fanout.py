@@ -0,0 +1,431 @@
+import logging
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from queue import Queue, Empty
+from threading import Event, Lock
+from time import monotonic
+from weakref import finalize
+from typing import Generic, Dict, List, Optional, Set, Iterator, Iterable, Callable, Tuple, TypeVar, Any, Union
+
+from simpleopenstack.concurrency import DEFAULT_MAX_CONCURRENCY
+from simpleopenstack.managers import OpenstackItemManager, Managed, OpenstackKeypairManager, \
+    OpenstackInstanceManager, OpenstackImageManager, OpenstackFlavorManager, OpenstackNetworkManager, \
+    ResolvedInstanceReferences
+from simpleopenstack.models import OpenstackConnector, OpenstackIdentifier, Model, OpenstackKeypair, \
+    OpenstackInstance, OpenstackImage, OpenstackFlavor, OpenstackNetwork, ItemNotFoundException
+
+DEFAULT_BACKEND_TIMEOUT = 60.0
+DEFAULT_WORKERS_PER_ENVIRONMENT = 8
+DEFAULT_MAX_ORIGINS = 65536
+
+_Result = TypeVar("_Result")
+
+_logger = logging.getLogger("simpleopenstack")
+
+# Markers put on the queue of results by a backend when it has started, finished or failed
+_STARTED = object()
+_FINISHED = object()
+_FAILED = object()
+
+
+class FanOutOpenstackConnector(OpenstackConnector):
+    """
+    Connector to many OpenStack environments (e.g. regions or clouds), each with its own connector, which are used
+    together as one.
+    """
+    def __init__(self, connectors: Dict[str, OpenstackConnector], timeout: float=DEFAULT_BACKEND_TIMEOUT,
+                 timeouts: Dict[str, float]=None, default_origin: str=None, raise_on_failure: bool=True,
+                 max_workers: int=DEFAULT_WORKERS_PER_ENVIRONMENT, max_origins: int=DEFAULT_MAX_ORIGINS):
+        """
+        Constructor.
+        :param connectors: the connector to each environment, indexed by the name of the environment (its origin)
+        :param timeout: the maximum time (in seconds) to wait for each environment to respond to an operation, once the
+        operation has started in that environment (or to wait for it to start)
+        :param timeouts: the timeout to use for particular environments, instead of `timeout`, indexed by origin
+        :param default_origin: the environment that items are created in (the first environment if not given)
+        :param raise_on_failure: whether to raise a `FanOutException` (after all other environments have responded)
+        if any environment fails or times out, rather than logging the failure and carrying on without its results
+        :param max_workers: the maximum number of threads that each manager uses to carry out operations in each
+        environment. Operations that have timed out keep their thread until they finish, so an environment that does
+        not respond can only hold up operations in that environment
+        :param max_origins: the maximum number of items that each manager remembers the origin of (those seen least
+        recently are forgotten first)
+        """
+        if len(connectors) == 0:
+            raise ValueError("At least one connector must be given")
+        if default_origin is not None and default_origin not in connectors:
+            raise ValueError(f"Unknown default origin: {default_origin}")
+        self.connectors = dict(connectors)
+        self.timeout = timeout
+        self.timeouts = dict(timeouts or {})
+        self.default_origin = default_origin if default_origin is not None else next(iter(connectors))
+        self.raise_on_failure = raise_on_failure
+        self.max_workers = max_workers
+        self.max_origins = max_origins
+
+    def get_timeout(self, origin: str) -> float:
+        """
+        Gets the maximum time to wait for the environment with the given origin to respond to an operation.
+        :param origin: the origin
+        :return: the timeout (in seconds)
+        """
+        return self.timeouts.get(origin, self.timeout)
+
+
+class OriginatedItem(Generic[Managed], Model):
+    """
+    OpenStack item, along with the environment that it came from.
+    """
+    def __init__(self, origin: str, item: Managed):
+        """
+        Constructor.
+        :param origin: the origin of the environment that the item is in
+        :param item: the item
+        """
+        self.origin = origin
+        self.item = item
+
+
+class FanOutException(Exception):
+    """
+    Raised when some of the environments that an operation was fanned out to failed (or timed out).
+    """
+    def __init__(self, errors: Dict[str, Exception]):
+        """
+        Constructor.
+        :param errors: the exception raised by each environment that failed (a `TimeoutError` if it timed out),
+        indexed by origin
+        """
+        super().__init__(f"Operation failed in {len(errors)} environment(s): "
+                         + ", ".join(f"{origin} ({error!r})" for origin, error in sorted(errors.items())))
+        self.errors = errors
+
+
+class FanOutOpenstackItemManager(Generic[Managed], OpenstackItemManager[Managed, FanOutOpenstackConnector]):
+    """
+    Manager of items across many OpenStack environments, which fans each operation out to the environments in
+    parallel.
+
+    Results are merged and streamed as each environment responds, so a slow environment does not hold up the results
+    of the others, and environments that do not respond within their timeout are not waited for. The origins of the
+    items that are seen are remembered (up to the connector's `max_origins`), so that operations on them (e.g.
+    deletions) go to their environment only. As identifiers are only unique within an environment, operations on items
+    with an identifier used in more than one environment must say which one (e.g. with `delete_in`).
+
+    Operations are carried out in a pool of threads kept by the manager for each environment.
+    """
+    BACKEND = "fanout"
+
+    def __init__(self, openstack_connector: FanOutOpenstackConnector):
+        super().__init__(openstack_connector)
+        # Least recently seen first (the values are not used)
+        self._origins: Dict[Tuple[str, OpenstackIdentifier], None] = OrderedDict()
+        self._origins_lock = Lock()
+        self._executors = {origin: ThreadPoolExecutor(max_workers=max(openstack_connector.max_workers, 1))
+                           for origin in openstack_connector.connectors.keys()}
+        for executor in self._executors.values():
+            finalize(self, executor.shutdown, False)
+
+    def get_manager(self, origin: str) -> OpenstackItemManager[Managed, Any]:
+        """
+        Gets the manager of the items in the environment with the given origin.
+        :param origin: the origin
+        :return: the manager
+        """
+        from simpleopenstack.factories import get_manager
+        return get_manager(self.openstack_connector.connectors[origin], self.item_type)
+
+    def get_origin(self, item_or_identifier: Union[Managed, OpenstackIdentifier]) -> Optional[str]:
+        """
+        Gets the origin of the given item, if it has been seen by this manager.
+        :param item_or_identifier: the item or its identifier
+        :return: the origin of the item or `None` if not known (or if items with the identifier have been seen in more
+        than one environment)
+        """
+        identifier = item_or_identifier.identifier if isinstance(item_or_identifier, Model) else item_or_identifier
+        origins = self._get_origins(identifier)
+        return origins[0] if len(origins) == 1 else None
+
+    def _get_origins(self, identifier: OpenstackIdentifier) -> List[str]:
+        """
+        Gets the origins of the items with the given identifier that have been seen by this manager.
+        :param identifier: the items' identifier
+        :return: the origins
+        """
+        with self._origins_lock:
+            return [origin for origin in self.openstack_connector.connectors.keys()
+                    if (origin, identifier) in self._origins]
+
+    def _remember_origin(self, identifier: OpenstackIdentifier, origin: str):
+        """
+        Remembers that an item with the given identifier is in the environment with the given origin, forgetting the
+        origins of the items seen least recently if too many are remembered.
+        :param identifier: the item's identifier
+        :param origin: the item's origin
+        """
+        with self._origins_lock:
+            self._origins[(origin, identifier)] = None
+            self._origins.move_to_end((origin, identifier))
+            while len(self._origins) > self.openstack_connector.max_origins:
+                self._origins.popitem(last=False)
+
+    def _forget_origin(self, identifier: OpenstackIdentifier, origin: str):
+        """
+        Forgets that an item with the given identifier is in the environment with the given origin (e.g. as it has
+        been deleted).
+        :param identifier: the item's identifier
+        :param origin: the item's origin
+        """
+        with self._origins_lock:
+            self._origins.pop((origin, identifier), None)
+
+    def get_by_id(self, identifier: OpenstackIdentifier) -> Optional[Managed]:
+        for origin in self._get_origins(identifier):
+            item = self.get_manager(origin).get_by_id(identifier)
+            if item is not None:
+                return item
+            self._forget_origin(identifier, origin)
+        # The first environment that has the item answers, without waiting for the others
+        for origin, item in self.fan_out(lambda origin: [self.get_manager(origin).get_by_id(identifier)]):
+            if item is not None:
+                return item
+        return None
+
+    def get_by_name(self, name: str) -> List[Managed]:
+        return [originated.item for originated in self.iter_by_name_with_origins(name)]
+
+    def get_all(self) -> Set[Managed]:
+        return set(self.iter_all())
+
+    def iter_all(self, page_size: int=None, filters: Dict[str, Any]=None) -> Iterator[Managed]:
+        for originated in self.iter_all_with_origins(page_size, filters):
+            yield originated.item
+
+    def iter_changed_since(self, since: datetime) -> Optional[Iterator[Managed]]:
+        iterators = {origin: self.get_manager(origin).iter_changed_since(since)
+                     for origin in self.openstack_connector.connectors.keys()}
+        if None in iterators.values():
+            return None
+        return (item for _, item in self.fan_out(lambda origin: iterators[origin]))
+
+    def iter_all_with_origins(self, page_size: int=None, filters: Dict[str, Any]=None) \
+            -> Iterator[OriginatedItem[Managed]]:
+        """
+        Lazily gets all of the OpenStack items of the managed type in all environments, in the order that the
+        environments return them.
+        :param page_size: the number of items to request from each environment at a time (backend default if `None`)
+        :param filters: filters that the items must match
+        :return: iterator of the (matching) items, along with their origins
+        :raises FanOutException: after all the other items have been given, if any environment failed or timed out
+        (and the connector is set to raise on failure)
+        """
+        for origin, item in self.fan_out(lambda origin: self.get_manager(origin).iter_all(page_size, filters)):
+            yield OriginatedItem(origin, item)
+
+    def iter_by_name_with_origins(self, name: str) -> Iterator[OriginatedItem[Managed]]:
+        """
+        Lazily gets the OpenStack items with the given name in all environments, in the order that the environments
+        return them.
+        :param name: the items' name
+        :return: iterator of the items with the name, along with their origins
+        :raises FanOutException: after all the other items have been given, if any environment failed or timed out
+        (and the connector is set to raise on failure)
+        """
+        for origin, item in self.fan_out(lambda origin: self.get_manager(origin).get_by_name(name)):
+            yield OriginatedItem(origin, item)
+
+    def create(self, model: Managed) -> Managed:
+        return self.create_in(self.openstack_connector.default_origin, model)
+
+    def create_in(self, origin: str, model: Managed) -> Managed:
+        """
+        Creates an item in the environment with the given origin, based on the given model.
+        :param origin: the origin of the environment to create the item in
+        :param model: the model to base the item created in OpenStack off. Should not have an identifier
+        :return: model of the created item in OpenStack
+        """
+        created = self.get_manager(origin).create(model)
+        self._remember_origin(created.identifier, origin)
+        return created
+
+    def delete_in(self, origin: str, identifier: OpenstackIdentifier):
+        """
+        Deletes the item with the given identifier from the environment with the given origin.
+        :param origin: the origin of the environment to delete the item from
+        :param identifier: the item's identifier
+        :raises ItemNotFoundException: if the item does not exist in the environment
+        """
+        self.get_manager(origin).delete(identifier=identifier)
+        self._forget_origin(identifier, origin)
+
+    def _delete(self, identifier: OpenstackIdentifier):
+        origins = self._get_origins(identifier)
+        if len(origins) == 0:
+            # Every environment is asked, as identifiers may be reused across environments
+            origins = [origin for origin, item in self.fan_out(
+                lambda origin: [self.get_manager(origin).get_by_id(identifier)]) if item is not None]
+            if len(origins) == 0:
+                raise ItemNotFoundException(f"No {self.item_type.__name__} with the identifier {identifier} in any "
+                                            f"environment")
+        if len(origins) > 1:
+            raise ValueError(f"{self.item_type.__name__} items with the identifier {identifier} are in more than one "
+                             f"environment ({', '.join(sorted(origins))}): use `delete_in` to say which to delete")
+        self.delete_in(origins[0], identifier)
+
+    def fan_out(self, operation: Callable[[str], Iterable[_Result]], origins: Iterable[str]=None) \
+            -> Iterator[Tuple[str, _Result]]:
+        """
+        Carries out the given operation in each environment in parallel, giving the results as soon as each
+        environment produces them.
+
+        The timeout of each environment starts when the operation starts running in that environment's pool of
+        threads. Environments that do not finish within their timeout (or that do not start the operation within it, as
+        their pool is busy) are given up on: operations that have started are left to finish in the background. The
+        origins of items in the results are remembered.
+        :param operation: the operation, which is given the origin of an environment and returns (or yields) results
+        :param origins: the origins of the environments to carry out the operation in (all environments if `None`)
+        :return: iterator of the results, along with the origin of the environment that each came from
+        :raises FanOutException: after all the other results have been given, if any environment failed or timed out
+        (and the connector is set to raise on failure)
+        """
+        origins = list(origins if origins is not None else self.openstack_connector.connectors.keys())
+        results: Queue = Queue()
+        cancelled = Event()
+
+        def run(origin: str):
+            if cancelled.is_set():
+                return
+            results.put((origin, _STARTED))
+            try:
+                for result in operation(origin):
+                    if cancelled.is_set():
+                        return
+                    results.put((origin, result))
+            except Exception as e:
+                results.put((origin, _FAILED, e))
+                return
+            results.put((origin, _FINISHED))
+
+        submitted_at = monotonic()
+        # Until the operation starts in an environment, its deadline is for starting
+        deadlines = {origin: submitted_at + self.openstack_connector.get_timeout(origin) for origin in origins}
+        futures = {}
+        errors: Dict[str, Exception] = {}
+        try:
+            for origin in origins:
+                futures[origin] = self._executors[origin].submit(run, origin)
+            while len(deadlines) > 0:
+                try:
+                    origin, result, *error = results.get(timeout=max(min(deadlines.values()) - monotonic(), 0))
+                except Empty:
+                    now = monotonic()
+                    for origin in [origin for origin, deadline in deadlines.items() if deadline <= now]:
+                        del deadlines[origin]
+                        timeout = self.openstack_connector.get_timeout(origin)
+                        if futures[origin].cancel():
+                            errors[origin] = TimeoutError(f"{origin} did not start the operation within {timeout}s "
+                                                          f"(its pool of threads is busy)")
+                        else:
+                            errors[origin] = TimeoutError(f"No response from {origin} within {timeout}s")
+                    continue
+                if origin not in deadlines:
+                    continue
+                if result is _STARTED:
+                    deadlines[origin] = monotonic() + self.openstack_connector.get_timeout(origin)
+                elif result is _FINISHED:
+                    del deadlines[origin]
+                elif result is _FAILED:
+                    del deadlines[origin]
+                    errors[origin] = error[0]
+                else:
+                    if isinstance(result, Model) and getattr(result, "identifier", None) is not None:
+                        self._remember_origin(result.identifier, origin)
+                    yield origin, result
+        finally:
+            cancelled.set()
+
+        if len(errors) > 0:
+            if self.openstack_connector.raise_on_failure:
+                raise FanOutException(errors)
+            for origin, error in sorted(errors.items()):
+                _logger.warning("Ignoring failure of %s in %s: %r", self.item_type.__name__, origin, error)
+
+
+class FanOutOpenstackKeypairManager(
+        FanOutOpenstackItemManager[OpenstackKeypair], OpenstackKeypairManager[FanOutOpenstackConnector]):
+    """
+    Key-pair manager across many OpenStack environments.
+    """
+
+
+class FanOutOpenstackInstanceManager(
+        FanOutOpenstackItemManager[OpenstackInstance], OpenstackInstanceManager[FanOutOpenstackConnector]):
+    """
+    Instance manager across many OpenStack environments.
+
+    Instances are created in a single environment, with the items that they refer to being resolved in that
+    environment.
+    """
+    def create(self, model: OpenstackInstance) -> OpenstackInstance:
+        return FanOutOpenstackItemManager.create(self, model)
+
+    def create_many(self, models: Iterable[OpenstackInstance], max_concurrency: int=DEFAULT_MAX_CONCURRENCY) \
+            -> List[Union[OpenstackInstance, Exception]]:
+        origin = self.openstack_connector.default_origin
+        created = self.get_manager(origin).create_many(models, max_concurrency)
+        for instance in created:
+            if isinstance(instance, OpenstackInstance):
+                self._remember_origin(instance.identifier, origin)
+        return created
+
+    def _create(self, model: OpenstackInstance, references: ResolvedInstanceReferences) -> OpenstackInstance:
+        origin = self.openstack_connector.default_origin
+        created = self.get_manager(origin)._create(model, references)
+        self._remember_origin(created.identifier, origin)
+        return created
+
+    def _poll_instances(self, identifiers: Set[OpenstackIdentifier], changes_since: Optional[datetime]) \
+            -> Dict[OpenstackIdentifier, Optional[OpenstackInstance]]:
+        # Instances are polled in the environments that they are known to be in, with those of unknown origin being
+        # polled in all of the environments
+        by_origin: Dict[Optional[str], Set[OpenstackIdentifier]] = {}
+        for identifier in identifiers:
+            by_origin.setdefault(self.get_origin(identifier), set()).add(identifier)
+        unknown = by_origin.pop(None, set())
+        origins = self.openstack_connector.connectors.keys() if len(unknown) > 0 else by_origin.keys()
+        polled: Dict[OpenstackIdentifier, Optional[OpenstackInstance]] = {}
+
+        def poll(origin: str) -> Iterable[Tuple[OpenstackIdentifier, Optional[OpenstackInstance]]]:
+            to_poll = by_origin.get(origin, set()) | unknown
+            return self.get_manager(origin)._poll_instances(to_poll, changes_since).items()
+
+        for origin, (identifier, instance) in self.fan_out(poll, origins):
+            if instance is not None:
+                self._remember_origin(identifier, origin)
+                polled[identifier] = instance
+            else:
+                self._forget_origin(identifier, origin)
+                polled.setdefault(identifier, None)
+        return polled
+
+
+class FanOutOpenstackImageManager(
+        FanOutOpenstackItemManager[OpenstackImage], OpenstackImageManager[FanOutOpenstackConnector]):
+    """
+    Image manager across many OpenStack environments.
+    """
+
+
+class FanOutOpenstackFlavorManager(
+        FanOutOpenstackItemManager[OpenstackFlavor], OpenstackFlavorManager[FanOutOpenstackConnector]):
+    """
+    Flavour manager across many OpenStack environments.
+    """
+
+
+class FanOutOpenstackNetworkManager(
+        FanOutOpenstackItemManager[OpenstackNetwork], OpenstackNetworkManager[FanOutOpenstackConnector]):
+    """
+    Network manager across many OpenStack environments.
+    """
@@ -0,0 +1,287 @@
+import logging
+from abc import ABCMeta, abstractmethod
+from collections import defaultdict
+from threading import Lock, RLock
+from time import perf_counter, time
+from typing import Optional, Type, Callable, TypeVar, List, Iterable, Dict, Tuple, Any
+
+from simpleopenstack.models import Model, OpenstackItem
+
+_Result = TypeVar("_Result")
+
+_Labels = Tuple[Tuple[str, str], ...]
+
+
+def _count_one(result: Any) -> int:
+    """
+    Counts a result as a single item.
+    :param result: the result
+    :return: 1
+    """
+    return 1
+
+
+class InstrumentationEvent(Model):
+    """
+    Event about a call to an OpenStack backend (or the conversion of what it returned).
+    """
+    def __init__(self, operation: str, item_type: Optional[Type[OpenstackItem]], backend: str, started_at: float,
+                 duration: float, items: Optional[int]=None, cache_hit: Optional[bool]=None,
+                 error: Optional[Exception]=None):
+        """
+        Constructor.
+        :param operation: the name of the operation (e.g. "get_by_id", "list", "convert" or "authenticate")
+        :param item_type: the type of item that the operation was on (`None` if not specific to a type of item)
+        :param backend: the name of the backend that the operation was carried out against
+        :param started_at: when the operation started (seconds since the epoch)
+        :param duration: how long the operation took (in seconds)
+        :param items: the number of items that the operation returned or affected (`None` if not known)
+        :param cache_hit: whether the operation was answered from a cache (`None` if not cached)
+        :param error: the exception raised by the operation (`None` if it succeeded)
+        """
+        self.operation = operation
+        self.item_type = item_type
+        self.backend = backend
+        self.started_at = started_at
+        self.duration = duration
+        self.items = items
+        self.cache_hit = cache_hit
+        self.error = error
+
+    @property
+    def item_type_name(self) -> str:
+        """
+        Gets the name of the type of item that the operation was on.
+        :return: the name of the type ("" if not specific to a type of item)
+        """
+        return self.item_type.__name__ if self.item_type is not None else ""
+
+
+class Instrument(metaclass=ABCMeta):
+    """
+    Receiver of instrumentation events.
+    """
+    @abstractmethod
+    def on_event(self, event: InstrumentationEvent):
+        """
+        Handles the given event. Called in the thread that carried out the operation, after it has completed.
+        :param event: the event
+        """
+
+
+class Instrumentation:
+    """
+    Collection of instruments that events are emitted to.
+
+    When there are no instruments, operations are not timed and events are not created.
+    """
+    def __init__(self, instruments: Iterable[Instrument]=()):
+        """
+        Constructor.
+        :param instruments: the instruments to emit events to
+        """
+        self.instruments: List[Instrument] = list(instruments)
+        self._lock = Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """
+        Gets whether any instruments are receiving events.
+        :return: whether enabled
+        """
+        return len(self.instruments) > 0
+
+    def add(self, instrument: Instrument):
+        """
+        Adds the given instrument, which will receive all subsequent events.
+        :param instrument: the instrument to add
+        """
+        with self._lock:
+            self.instruments = self.instruments + [instrument]
+
+    def remove(self, instrument: Instrument):
+        """
+        Removes the given instrument.
+        :param instrument: the instrument to remove
+        :raises ValueError: if the instrument has not been added
+        """
+        with self._lock:
+            instruments = list(self.instruments)
+            instruments.remove(instrument)
+            self.instruments = instruments
+
+    def emit(self, event: InstrumentationEvent):
+        """
+        Emits the given event to all of the instruments.
+        :param event: the event to emit
+        """
+        for instrument in self.instruments:
+            instrument.on_event(event)
+
+    def call(self, operation: str, item_type: Optional[Type[OpenstackItem]], backend: str,
+             function: Callable[[], _Result], count: Callable[[_Result], int]=_count_one) -> _Result:
+        """
+        Calls the given function, emitting an event about the call if enabled.
+        :param operation: the name of the operation that the function carries out
+        :param item_type: the type of item that the operation is on
+        :param backend: the name of the backend that the operation is carried out against
+        :param function: the function to call
+        :param count: function that counts the number of items in the function's result
+        :return: the result of the function
+        """
+        if not self.enabled:
+            return function()
+        started_at = time()
+        start = perf_counter()
+        try:
+            result = function()
+        except Exception as e:
+            self.emit(InstrumentationEvent(operation, item_type, backend, started_at, perf_counter() - start, error=e))
+            raise
+        self.emit(InstrumentationEvent(operation, item_type, backend, started_at, perf_counter() - start,
+                                       items=count(result)))
+        return result
+
+
+default_instrumentation = Instrumentation()
+
+
+class RecordingInstrument(Instrument):
+    """
+    Instrument that records all of the events that it receives.
+    """
+    def __init__(self):
+        self.events: List[InstrumentationEvent] = []
+        self._lock = Lock()
+
+    def on_event(self, event: InstrumentationEvent):
+        with self._lock:
+            self.events.append(event)
+
+
+class LoggingInstrument(Instrument):
+    """
+    Instrument that logs each event.
+    """
+    def __init__(self, logger: logging.Logger=None, level: int=logging.DEBUG):
+        """
+        Constructor.
+        :param logger: the logger to log to (defaults to the "simpleopenstack" logger)
+        :param level: the level to log successful operations at (failures are logged at warning level or above)
+        """
+        self.logger = logger if logger is not None else logging.getLogger("simpleopenstack")
+        self.level = level
+
+    def on_event(self, event: InstrumentationEvent):
+        level = self.level if event.error is None else max(self.level, logging.WARNING)
+        if not self.logger.isEnabledFor(level):
+            return
+        details = []
+        if event.items is not None:
+            details.append(f"{event.items} item{'s' if event.items != 1 else ''}")
+        if event.cache_hit is not None:
+            details.append("cache hit" if event.cache_hit else "cache miss")
+        if event.error is not None:
+            details.append(f"failed: {event.error!r}")
+        self.logger.log(level, "%s %s %s took %.3fms%s", event.backend, event.operation, event.item_type_name,
+                        event.duration * 1000, f" ({', '.join(details)})" if len(details) > 0 else "")
+
+
+class CounterRegistry(Instrument):
+    """
+    Instrument that keeps Prometheus-style counters of the operations carried out, labelled by operation, item type,
+    backend and cache outcome.
+    """
+    CALLS = "simpleopenstack_calls_total"
+    ERRORS = "simpleopenstack_errors_total"
+    DURATION = "simpleopenstack_call_duration_seconds_total"
+    ITEMS = "simpleopenstack_items_total"
+
+    _DESCRIPTIONS = {
+        CALLS: "Number of operations carried out",
+        ERRORS: "Number of operations that raised an exception",
+        DURATION: "Total time spent carrying out operations",
+        ITEMS: "Number of items returned or affected by operations"
+    }
+
+    def __init__(self):
+        self._counters: Dict[str, Dict[_Labels, float]] = defaultdict(lambda: defaultdict(float))
+        self._lock = RLock()
+
+    def on_event(self, event: InstrumentationEvent):
+        labels = (("operation", event.operation), ("item_type", event.item_type_name), ("backend", event.backend),
+                  ("cache", "" if event.cache_hit is None else "hit" if event.cache_hit else "miss"))
+        with self._lock:
+            self._counters[CounterRegistry.CALLS][labels] += 1
+            self._counters[CounterRegistry.DURATION][labels] += event.duration
+            if event.error is not None:
+                self._counters[CounterRegistry.ERRORS][labels] += 1
+            if event.items is not None:
+                self._counters[CounterRegistry.ITEMS][labels] += event.items
+
+    def get(self, name: str, **labels: str) -> float:
+        """
+        Gets the total of the counter with the given name, across all label values that match those given.
+        :param name: the name of the counter (e.g. `CounterRegistry.CALLS`)
+        :param labels: the label values to match (e.g. `operation="get_by_id"`)
+        :return: the total
+        """
+        with self._lock:
+            return sum(value for counter_labels, value in self._counters.get(name, {}).items()
+                       if labels.items() <= dict(counter_labels).items())
+
+    def clear(self):
+        """
+        Resets all of the counters.
+        """
+        with self._lock:
+            self._counters.clear()
+
+    def to_prometheus_text(self) -> str:
+        """
+        Gets the counters in the Prometheus text exposition format.
+        :return: the counters, formatted for Prometheus
+        """
+        lines = []
+        with self._lock:
+            for name in sorted(self._counters.keys()):
+                lines.append(f"# HELP {name} {CounterRegistry._DESCRIPTIONS[name]}")
+                lines.append(f"# TYPE {name} counter")
+                for labels, value in sorted(self._counters[name].items()):
+                    formatted_labels = ",".join(f"{key}=\"{label_value}\"" for key, label_value in labels)
+                    lines.append(f"{name}{{{formatted_labels}}} {value!r}")
+        return "\n".join(lines) + "\n" if len(lines) > 0 else ""
+
+
+class TracingInstrument(Instrument):
+    """
+    Instrument that records each event as a span, using an OpenTelemetry-style tracer.
+
+    Spans are started and ended with explicit times, once the operation has completed. The tracer must have a
+    `start_span(name, start_time=..., attributes=...)` method returning a span with `end(end_time=...)` and
+    (optionally) `record_exception(exception)` methods, with times given in nanoseconds since the epoch. OpenTelemetry's
+    `opentelemetry.trace.Tracer` meets this, without this library depending on it.
+    """
+    def __init__(self, tracer: Any, span_name_prefix: str="openstack"):
+        """
+        Constructor.
+        :param tracer: the tracer to create spans with
+        :param span_name_prefix: prefix of the names given to spans
+        """
+        self.tracer = tracer
+        self.span_name_prefix = span_name_prefix
+
+    def on_event(self, event: InstrumentationEvent):
+        attributes = {"openstack.operation": event.operation, "openstack.backend": event.backend}
+        if event.item_type is not None:
+            attributes["openstack.item_type"] = event.item_type_name
+        if event.items is not None:
+            attributes["openstack.items"] = event.items
+        if event.cache_hit is not None:
+            attributes["openstack.cache_hit"] = event.cache_hit
+        start_time = int(event.started_at * 1e9)
+        span = self.tracer.start_span(f"{self.span_name_prefix}.{event.backend}.{event.operation}",
+                                      start_time=start_time, attributes=attributes)
+        if event.error is not None and hasattr(span, "record_exception"):
+            span.record_exception(event.error)
+        span.end(end_time=start_time + int(event.duration * 1e9))
@@ -1,18 +1,33 @@
 from abc import ABCMeta, abstractmethod
-from typing import TypeVar, Generic, Set, Type, Optional, List
+from datetime import datetime
+from time import monotonic, sleep
+from typing import TypeVar, Generic, Set, Type, Optional, List, Tuple, Dict, Union, Iterable, Iterator, Any, Callable
 
+from simpleopenstack.concurrency import DEFAULT_MAX_CONCURRENCY, run_concurrently
+from simpleopenstack.instrumentation import default_instrumentation, Instrumentation, _count_one
 from simpleopenstack.models import OpenstackItem, OpenstackKeypair, OpenstackInstance, OpenstackImage, \
-    OpenstackIdentifier, OpenstackConnector, OpenstackFlavor, OpenstackNetwork
+    OpenstackIdentifier, OpenstackConnector, OpenstackFlavor, OpenstackNetwork, Model, InstanceStateException
 
 Managed = TypeVar("Managed", bound=OpenstackItem)
 RawModel = TypeVar("RawModel")
 Connector = TypeVar("Connector", bound=OpenstackConnector)
+_Result = TypeVar("_Result")
+
+DEFAULT_WAIT_TIMEOUT = 600.0
+DEFAULT_MIN_POLL_INTERVAL = 1.0
+DEFAULT_MAX_POLL_INTERVAL = 30.0
+POLL_BACKOFF_FACTOR = 1.5
 
 
 class OpenstackItemManager(Generic[Managed, Connector], metaclass=ABCMeta):
     """
     Manager for OpenStack items.
     """
+    # Name of the backend that the manager uses, as given in instrumentation events
+    BACKEND = "unknown"
+    # Whether `iter_changed_since` includes items that have been deleted (with the status `OpenstackInstance.DELETED`)
+    CHANGES_INCLUDE_DELETED = False
+
     @property
     @abstractmethod
     def item_type(self) -> Type[Managed]:
@@ -44,6 +59,28 @@ class OpenstackItemManager(Generic[Managed, Connector], metaclass=ABCMeta):
         :return: the OpenStack items
         """
 
+    def iter_all(self, page_size: int=None, filters: Dict[str, Any]=None) -> Iterator[Managed]:
+        """
+        Lazily gets all of the OpenStack items of the managed type, a page at a time where supported.
+        :param page_size: the number of items to request from OpenStack at a time (backend default if `None`)
+        :param filters: filters that the items must match. Backends that support it apply the filters in OpenStack;
+        by default, the attributes of the items are matched against the filters
+        :return: iterator of the (matching) OpenStack items
+        """
+        for item in self.get_all():
+            if filters is None or all(getattr(item, key, None) == value for key, value in filters.items()):
+                yield item
+
+    def iter_changed_since(self, since: datetime) -> Optional[Iterator[Managed]]:
+        """
+        Lazily gets the OpenStack items of the managed type that have been created or changed since the given time, if
+        the backend can filter items by when they last changed.
+        :param since: the time
+        :return: iterator of the (possibly) changed items or `None` if the backend cannot filter items by when they
+        last changed
+        """
+        return None
+
     @abstractmethod
     def create(self, model: Managed) -> Managed:
         """
@@ -65,6 +102,7 @@ class OpenstackItemManager(Generic[Managed, Connector], metaclass=ABCMeta):
         :param openstack_connector: connector to Openstack environment
         """
         self.openstack_connector = openstack_connector
+        self.instrumentation: Instrumentation = default_instrumentation
 
     def delete(self, *, item: Managed=None, identifier: OpenstackIdentifier=None):
         """
@@ -79,7 +117,47 @@ class OpenstackItemManager(Generic[Managed, Connector], metaclass=ABCMeta):
             raise ValueError("An item or identifier must be provided")
         if identifier is None and item is not None:
             identifier = item.identifier
-        self._delete(identifier)
+        self._instrument("delete", lambda: self._delete(identifier))
+
+    def delete_many(self, items_or_identifiers: Iterable[Union[Managed, OpenstackIdentifier]],
+                    max_concurrency: int=DEFAULT_MAX_CONCURRENCY) -> Dict[OpenstackIdentifier, Optional[Exception]]:
+        """
+        Deletes the given OpenStack items concurrently.
+        :param items_or_identifiers: the items to delete, or their identifiers
+        :param max_concurrency: the maximum number of requests to make to OpenStack at the same time
+        :return: map between the identifier of each item and the exception raised when trying to delete it (`None` if
+        it was deleted)
+        """
+        identifiers = [item_or_identifier.identifier if isinstance(item_or_identifier, OpenstackItem)
+                       else item_or_identifier for item_or_identifier in items_or_identifiers]
+        identifiers = list(dict.fromkeys(identifiers))
+        return self._instrument("delete_many", lambda: self._delete_many(identifiers, max_concurrency),
+                                lambda outcomes: sum(1 for outcome in outcomes.values() if outcome is None))
+
+    def _delete_many(self, identifiers: List[OpenstackIdentifier], max_concurrency: int) \
+            -> Dict[OpenstackIdentifier, Optional[Exception]]:
+        """
+        Deletes the OpenStack items with the given identifiers concurrently.
+        :param identifiers: the (distinct) identifiers of the items to delete
+        :param max_concurrency: the maximum number of requests to make to OpenStack at the same time
+        :return: map between each identifier and the exception raised when trying to delete the item (`None` if it was
+        deleted)
+        """
+        return dict(zip(identifiers, run_concurrently(self._delete, identifiers, max_concurrency)))
+
+    def _instrument(self, operation: str, function: Callable[[], _Result],
+                    count: Callable[[_Result], int]=_count_one) -> _Result:
+        """
+        Carries out the given operation against the backend, emitting an instrumentation event if instrumentation is
+        enabled.
+        :param operation: the name of the operation
+        :param function: the function that carries out the operation
+        :param count: function that counts the number of items in the result of the operation
+        :return: the result of the operation
+        """
+        if not self.instrumentation.instruments:
+            return function()
+        return self.instrumentation.call(operation, self.item_type, self.BACKEND, function, count)
 
 
 class OpenstackKeypairManager(
@@ -92,36 +170,175 @@ class OpenstackKeypairManager(
         return OpenstackKeypair
 
 
+class ResolvedInstanceReferences(Model):
+    """
+    Identifiers of the items that an instance model refers to (possibly by name).
+    """
+    def __init__(self, image: OpenstackIdentifier, flavor: OpenstackIdentifier, key_name: Optional[str],
+                 networks: List[OpenstackIdentifier]):
+        self.image = image
+        self.flavor = flavor
+        self.key_name = key_name
+        self.networks = networks
+
+
 class OpenstackInstanceManager(
         Generic[Connector], OpenstackItemManager[OpenstackInstance, Connector], metaclass=ABCMeta):
     """
     Manager of instances.
     """
     @abstractmethod
-    def _create(self, model: OpenstackInstance) -> OpenstackInstance:
+    def _create(self, model: OpenstackInstance, references: ResolvedInstanceReferences) -> OpenstackInstance:
+        """
+        Creates an instance in OpenStack, based on the given model, which has already been validated.
+        :param model: the model to base the instance created in OpenStack off
+        :param references: the identifiers of the items that the model refers to
+        :return: model of the created instance in OpenStack
+        """
+
+    @staticmethod
+    def _get_references(model: OpenstackInstance) -> List[Tuple[Type[OpenstackItem], str]]:
         """
-        TODO
-        :param model:
-        :return:
+        Gets the references to other OpenStack items that the given instance model makes.
+        :param model: the instance model
+        :return: the types of item that are referred to, along with the name or identifier used to refer to them
         """
+        return [(OpenstackImage, model.image), (OpenstackFlavor, model.flavor), (OpenstackKeypair, model.key_name)] \
+            + [(OpenstackNetwork, network) for network in model.networks]
 
     @property
     def item_type(self) -> Type[OpenstackInstance]:
         return OpenstackInstance
 
-    def create(self, model: OpenstackInstance):
-        from simpleopenstack.common import raise_if_absent
-        from simpleopenstack.factories import OpenstackManagerFactory
+    def __init__(self, openstack_connector: Connector):
+        from simpleopenstack.common import IdentifierResolver
+        super().__init__(openstack_connector)
+        self.identifier_resolver = IdentifierResolver()
+
+    def create(self, model: OpenstackInstance) -> OpenstackInstance:
+        return self._create(model, self._resolve_references(model))
+
+    def create_many(self, models: Iterable[OpenstackInstance], max_concurrency: int=DEFAULT_MAX_CONCURRENCY) \
+            -> List[Union[OpenstackInstance, Exception]]:
+        """
+        Creates many instances in OpenStack, based on the given models.
+
+        The items referred to by the models are resolved once for the whole batch, after which the instances are
+        created concurrently. The failure to create one instance does not affect the creation of the others.
+        :param models: the models to base the instances created in OpenStack off
+        :param max_concurrency: the maximum number of requests to make to OpenStack at the same time
+        :return: for each model (in the same order), the model of the created instance in OpenStack or the exception
+        raised when trying to create it
+        """
+        from simpleopenstack.common import resolve_identifiers
+
+        models = list(models)
+        references = [reference for model in models for reference in OpenstackInstanceManager._get_references(model)]
+        resolved = resolve_identifiers(references, self.openstack_connector, max_concurrency, self.identifier_resolver)
+
+        def create(model: OpenstackInstance) -> OpenstackInstance:
+            return self._create(model, self._resolve_references(model, resolved=resolved))
 
-        manager_factory = OpenstackManagerFactory(self.openstack_connector)
-        raise_if_absent(model.image, manager_factory.create_image_manager())
-        raise_if_absent(model.flavor, manager_factory.create_flavor_manager())
-        raise_if_absent(model.key_name, manager_factory.create_keypair_manager())
-        network_manager = manager_factory.create_network_manager()
-        for network in model.networks:
-            raise_if_absent(network, network_manager)
+        return run_concurrently(create, models, max_concurrency)
+
+    def _resolve_references(
+            self, model: OpenstackInstance, max_concurrency: int=DEFAULT_MAX_CONCURRENCY,
+            resolved: Dict[Tuple[Type[OpenstackItem], str], Union[OpenstackIdentifier, Exception]]=None) \
+            -> ResolvedInstanceReferences:
+        """
+        Resolves the identifiers of all the items that the given model refers to, looking each one up only once.
+        :param model: the instance model
+        :param max_concurrency: the maximum number of lookups to make at the same time
+        :param resolved: references that have already been resolved (or have failed to resolve)
+        :return: the resolved references
+        :raises ItemNotFoundException: if a referred to item does not exist (or cannot be identified unambiguously)
+        """
+        from simpleopenstack.common import resolve_identifiers
 
-        return self._create(model)
+        references = OpenstackInstanceManager._get_references(model)
+        if resolved is None:
+            resolved = resolve_identifiers(
+                references, self.openstack_connector, max_concurrency, self.identifier_resolver)
+        for reference in references:
+            if isinstance(resolved[reference], Exception):
+                raise resolved[reference]
+
+        return ResolvedInstanceReferences(
+            image=resolved[(OpenstackImage, model.image)],
+            flavor=resolved[(OpenstackFlavor, model.flavor)],
+            key_name=model.key_name,
+            networks=[resolved[(OpenstackNetwork, network)] for network in model.networks])
+
+    def wait_for(self, instances: Iterable[Union[OpenstackInstance, OpenstackIdentifier]],
+                 status: str=OpenstackInstance.ACTIVE, timeout: float=DEFAULT_WAIT_TIMEOUT,
+                 min_interval: float=DEFAULT_MIN_POLL_INTERVAL, max_interval: float=DEFAULT_MAX_POLL_INTERVAL) \
+            -> Iterator[OpenstackInstance]:
+        """
+        Waits for the given instances to reach the given status, yielding each instance as soon as it does.
+
+        All of the instances that are still being waited for are polled together. The interval between polls starts at
+        `min_interval` and backs off whilst none of the instances change, up to `max_interval`.
+        :param instances: the instances (or their identifiers) to wait for
+        :param status: the status to wait for (`OpenstackInstance.DELETED` to wait for the instances to be deleted)
+        :param timeout: the maximum time (in seconds) to wait for all of the instances
+        :param min_interval: the minimum time (in seconds) between polls
+        :param max_interval: the maximum time (in seconds) between polls
+        :return: iterator of the instances (as they were when they reached the status), in the order that they
+        reached it
+        :raises InstanceStateException: if an instance errors or is deleted when waiting for another status
+        :raises TimeoutError: if the instances do not all reach the status within the timeout
+        """
+        deadline = monotonic() + timeout
+        # The last seen state of each instance, as the instances may be changed in place by some backends
+        pending: Dict[OpenstackIdentifier, Optional[Tuple[Optional[str], Optional[datetime]]]] = {}
+        for instance in instances:
+            if isinstance(instance, OpenstackInstance):
+                pending[instance.identifier] = (instance.status, instance.updated_at)
+            else:
+                pending.setdefault(instance, None)
+        interval = min_interval
+
+        while len(pending) > 0:
+            last_updated = [state[1] if state is not None else None for state in pending.values()]
+            changes_since = min(last_updated) if None not in last_updated else None
+            changed = False
+            for identifier, instance in self._poll_instances(set(pending.keys()), changes_since).items():
+                if identifier not in pending:
+                    continue
+                if instance is None:
+                    instance = OpenstackInstance(identifier=identifier, status=OpenstackInstance.DELETED)
+                state = (instance.status, instance.updated_at)
+                changed = changed or state != pending[identifier]
+                if instance.status == status:
+                    del pending[identifier]
+                    yield instance
+                elif instance.status == OpenstackInstance.DELETED \
+                        or (instance.status == OpenstackInstance.ERROR and status != OpenstackInstance.DELETED):
+                    raise InstanceStateException(instance, status)
+                else:
+                    pending[identifier] = state
+
+            if len(pending) == 0:
+                return
+            remaining = deadline - monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f"Instances did not reach status {status} within {timeout}s: {sorted(pending)}")
+            interval = min_interval if changed else min(interval * POLL_BACKOFF_FACTOR, max_interval)
+            sleep(min(interval, remaining))
+
+    def _poll_instances(self, identifiers: Set[OpenstackIdentifier], changes_since: Optional[datetime]) \
+            -> Dict[OpenstackIdentifier, Optional[OpenstackInstance]]:
+        """
+        Gets the current state of the instances with the given identifiers.
+
+        By default, each instance is got separately. Backends that can list the instances that have changed since a
+        given time should override this to get them all at once.
+        :param identifiers: the identifiers of the instances
+        :param changes_since: time by which all of the instances had last been updated (`None` if not known). Instances
+        that have not changed since may be left out of the result
+        :return: the (possibly) changed instances, indexed by identifier (`None` if the instance does not exist)
+        """
+        return {identifier: self.get_by_id(identifier) for identifier in identifiers}
 
 
 class OpenstackImageManager(
@@ -1,6 +1,8 @@
 from abc import ABCMeta
 from datetime import datetime
-from typing import NewType, Set, Optional, List
+from functools import lru_cache
+from itertools import count
+from typing import NewType, Set, Optional, List, Hashable, Any, Dict, Type, Tuple
 
 from sshpubkeys import SSHKey
 
@@ -11,18 +13,92 @@ OpenstackIdentifier = NewType("OpenstackIdentifier", str)
 class Model(metaclass=ABCMeta):
     """
     Superclass that POPOs (Plain Old Python Objects) can implement.
+
+    Models that have an identity (see `_get_identity`) are hashed by it; other models are hashed by their string
+    representation, which is cached until an attribute of the model is set. The hash is not cached for models with
+    properties that could be changed in place (e.g. lists), as such changes do not set an attribute.
+
+    Subclasses may declare their properties in `__slots__` for a more compact representation. Slots that hold internal
+    state, rather than properties, must also be listed in `_INTERNAL_SLOTS` by the class that declares them.
     """
+    __slots__ = ("_structural_hash", )
+    _INTERNAL_SLOTS = ("_structural_hash", )
+
+    def __new__(cls, *args, **kwargs):
+        model = super().__new__(cls)
+        object.__setattr__(model, "_structural_hash", None)
+        return model
+
+    @classmethod
+    def _from_properties(cls, **properties):
+        """
+        Creates a model with the given properties, without calling the model's constructor. Only suitable for models
+        that declare all of their properties in `__slots__`. Properties that are not given are set to `None`.
+        :param properties: the model's properties
+        :return: the created model
+        """
+        model = object.__new__(cls)
+        set_attribute = object.__setattr__
+        set_attribute(model, "_structural_hash", None)
+        for name in _get_property_slots(cls):
+            set_attribute(model, name, properties.pop(name, None))
+        if len(properties) > 0:
+            raise TypeError(f"Unknown properties for {cls.__name__}: {sorted(properties.keys())}")
+        return model
+
+    def _get_identity(self) -> Optional[Hashable]:
+        """
+        Gets the value that identifies this model, if it has one. Equal models must have the same identity.
+        :return: the identity of the model or `None` if it does not have one
+        """
+        return None
+
+    def _get_properties(self) -> Dict[str, Any]:
+        """
+        Gets the properties of the model (the attributes that have been set on it).
+        :return: the properties, indexed by name
+        """
+        properties = {}
+        for name in _get_property_slots(type(self)):
+            value = getattr(self, name, _UNSET)
+            if value is not _UNSET:
+                properties[name] = value
+        properties.update(getattr(self, "__dict__", {}))
+        return properties
+
+    def __setattr__(self, name: str, value: Any):
+        object.__setattr__(self, name, value)
+        if self._structural_hash is not None and name != "_structural_hash":
+            object.__setattr__(self, "_structural_hash", None)
+
     def __eq__(self, other):
+        if self is other:
+            return True
         if not isinstance(other, self.__class__):
             return False
-        for property_name, value in vars(self).items():
-            if other.__dict__[property_name] != self.__dict__[property_name]:
+        identity = self._get_identity()
+        if identity is not None:
+            other_identity = other._get_identity()
+            if other_identity is not None and other_identity != identity:
+                return False
+        other_properties = other._get_properties()
+        for property_name, value in self._get_properties().items():
+            if other_properties[property_name] != value:
                 return False
         return True
 
     def __str__(self) -> str:
+        return Model._to_string(self._get_properties())
+
+    @staticmethod
+    def _to_string(properties: Dict[str, Any]) -> str:
+        """
+        Gets the string representation of a model with the given properties.
+        :param properties: the properties of the model
+        :return: the string representation
+        """
         string_builder = []
-        for property, value in vars(self).items():
+        for property, value in properties.items():
             if isinstance(value, Set):
                 value = str(sorted(value, key=id))
             string_builder.append("%s: %s" % (property, value))
@@ -33,47 +109,167 @@ class Model(metaclass=ABCMeta):
         return "<%s object at %s: %s>" % (type(self), id(self), str(self))
 
     def __hash__(self):
-        return hash(str(self))
+        identity = self._get_identity()
+        if identity is not None:
+            return hash(identity)
+        if self._structural_hash is not None:
+            return self._structural_hash
+        properties = self._get_properties()
+        structural_hash = hash(Model._to_string(properties))
+        if all(isinstance(value, _IMMUTABLE_TYPES) for value in properties.values()):
+            object.__setattr__(self, "_structural_hash", structural_hash)
+        return structural_hash
+
+
+_UNSET = object()
+# Types of property values that cannot be changed in place (so do not invalidate a cached hash without being set)
+_IMMUTABLE_TYPES = (str, bytes, int, float, complex, type(None), datetime, tuple, frozenset)
+_NON_PROPERTY_SLOTS = ("__dict__", "__weakref__")
+_NOT_GENERATED = object()
+_property_slots: Dict[Type[Model], Tuple[str, ...]] = {}
+
+
+def _get_property_slots(model_type: Type[Model]) -> Tuple[str, ...]:
+    """
+    Gets the names of the slots that hold the properties of models of the given type.
+    :param model_type: the type of model
+    :return: the names of the slots
+    """
+    slots = _property_slots.get(model_type)
+    if slots is None:
+        slots = []
+        for cls in reversed(model_type.__mro__):
+            declared = cls.__dict__.get("__slots__", ())
+            internal = cls.__dict__.get("_INTERNAL_SLOTS", ())
+            for name in ((declared, ) if isinstance(declared, str) else declared):
+                if name not in _NON_PROPERTY_SLOTS and name not in internal and name not in slots:
+                    slots.append(name)
+        slots = tuple(slots)
+        _property_slots[model_type] = slots
+    return slots
 # -----
 
 
 class OpenstackConnector(Model):
     """
     Connector to an OpenStack environment.
+
+    The managers created for the connector are cached against it (in a slot that is not a property of the connector).
+    The cache is left out of copies and pickles of the connector.
     """
+    __slots__ = ("_managers", )
+    _INTERNAL_SLOTS = ("_managers", )
+
+    def __getstate__(self) -> Tuple[Optional[Dict[str, Any]], Dict[str, Any]]:
+        # The cached managers (which hold clients and locks) belong to this connector alone
+        slots = {name: getattr(self, name) for name in _get_property_slots(type(self)) if hasattr(self, name)}
+        return getattr(self, "__dict__", None), slots
+
+    def _get_cached_managers(self) -> Dict[type, Any]:
+        """
+        Gets the managers that have been created for this connector.
+        :return: the managers, indexed by type
+        """
+        managers = getattr(self, "_managers", None)
+        if managers is None:
+            managers = {}
+            object.__setattr__(self, "_managers", managers)
+        return managers
 
 
 class Timestamped(Model, metaclass=ABCMeta):
     """
     Timestamps.
+
+    The timestamp properties are not declared in `__slots__` here (to allow the use of this class along with other
+    slotted models) so slotted subclasses must declare `created_at` and `updated_at` themselves.
     """
+    __slots__ = ()
+
     def __init__(self, created_at: datetime=None, updated_at: datetime=None):
         self.created_at = created_at
         self.updated_at = updated_at
 
 
+# Changed (to a value not used before) whenever an OpenStack item is renamed, so that indexes of items by name can tell
+# when they may be out of date
+_renames = count()
+_rename_generation = next(_renames)
+
+
+def _get_rename_generation() -> int:
+    """
+    Gets the current generation of the names of OpenStack items, which changes whenever an item is renamed.
+    :return: the generation
+    """
+    return _rename_generation
+
+
 class OpenstackItem(Model, metaclass=ABCMeta):
     """
     An item in OpenStack.
+
+    Items can be given attributes other than those declared in `__slots__`, which are also properties of the item.
     """
+    __slots__ = ("identifier", "name", "__dict__")
+
     def __init__(self, identifier: Optional[OpenstackIdentifier]=None, name: str=None, **kwargs):
         super().__init__(**kwargs)
         self.identifier = identifier
         self.name = name
 
+    def __setattr__(self, name: str, value: Any):
+        renamed = name == "name" and getattr(self, "name", _UNSET) is not _UNSET
+        super().__setattr__(name, value)
+        if renamed:
+            global _rename_generation
+            _rename_generation = next(_renames)
+
+    def _get_identity(self) -> Optional[Hashable]:
+        return self.identifier
+
 
 class OpenstackKeypair(OpenstackItem):
     """
     A key-pair in OpenStack.
+
+    The fingerprint is only generated from the public key when it is first read (or when it is set, to validate it).
     """
+    __slots__ = ("_fingerprint", "_public_key")
+
+    _MD5_PREFIX = "MD5:"
+
     @staticmethod
+    @lru_cache(maxsize=4096)
     def _generate_fingerprint(public_key: str) -> str:
         """
-        Generates the fingerprint for the given public key.
+        Generates the fingerprint for the given public key. Fingerprints are memoised.
         :param public_key: the public key
         :return: the fingerprint
         """
-        return SSHKey(public_key).hash_md5().strip("MD5:")
+        fingerprint = SSHKey(public_key).hash_md5()
+        if fingerprint.startswith(OpenstackKeypair._MD5_PREFIX):
+            fingerprint = fingerprint[len(OpenstackKeypair._MD5_PREFIX):]
+        return fingerprint
+
+    @classmethod
+    def _from_properties(cls, fingerprint: str=None, public_key: str=None, **properties) -> "OpenstackKeypair":
+        """
+        Creates a key-pair with the given properties, without calling the constructor.
+
+        The given fingerprint is trusted to be that of the given public key (e.g. because it was given by OpenStack) so
+        it is not validated. If a public key is given without a fingerprint, the fingerprint is generated when read.
+        :param fingerprint: the fingerprint of the public key
+        :param public_key: the public key
+        :param properties: the other properties of the key-pair
+        :return: the created key-pair
+        """
+        keypair = super()._from_properties(**properties)
+        if fingerprint is None and public_key is not None:
+            fingerprint = _NOT_GENERATED
+        object.__setattr__(keypair, "_public_key", public_key)
+        object.__setattr__(keypair, "_fingerprint", fingerprint)
+        return keypair
 
     @property
     def public_key(self) -> Optional[str]:
@@ -81,19 +277,21 @@ class OpenstackKeypair(OpenstackItem):
 
     @property
     def fingerprint(self) -> Optional[str]:
+        if self._fingerprint is _NOT_GENERATED:
+            object.__setattr__(self, "_fingerprint", OpenstackKeypair._generate_fingerprint(self._public_key))
         return self._fingerprint
 
     @public_key.setter
     def public_key(self, public_key: Optional[str]):
         self._public_key = public_key
-        self._fingerprint = OpenstackKeypair._generate_fingerprint(public_key) if public_key is not None else None
+        self._fingerprint = _NOT_GENERATED if public_key is not None else None
 
     @fingerprint.setter
     def fingerprint(self, fingerprint: Optional[str]):
         if self._public_key is not None:
             expected = OpenstackKeypair._generate_fingerprint(self._public_key)
             if fingerprint != expected:
-                raise ValueError(f"The given fingerprint \"{self.fingerprint}\" does not match that for the currently "
+                raise ValueError(f"The given fingerprint \"{fingerprint}\" does not match that for the currently "
                                  f"set public key \"{self.public_key}\" (expecting \"{expected}\")")
         self._fingerprint = fingerprint
 
@@ -104,22 +302,41 @@ class OpenstackKeypair(OpenstackItem):
         self.fingerprint = fingerprint
         self.public_key = public_key
 
+    def _get_properties(self) -> Dict[str, Any]:
+        properties = super()._get_properties()
+        if "_fingerprint" in properties:
+            properties["_fingerprint"] = self.fingerprint
+        return properties
+
 
 class OpenstackInstance(OpenstackItem, Timestamped):
     """
     An instance on OpenStack.
     """
-    def __init__(self, image: str=None, key_name: str=None, flavor: str=None, networks: List[str]=None, **kwargs):
+    # Statuses (as given by Nova) of interest
+    ACTIVE = "ACTIVE"
+    BUILD = "BUILD"
+    ERROR = "ERROR"
+    DELETED = "DELETED"
+
+    __slots__ = ("created_at", "updated_at", "image", "key_name", "flavor", "networks", "status")
+
+    def __init__(self, image: str=None, key_name: str=None, flavor: str=None, networks: List[str]=None,
+                 status: str=None, **kwargs):
         super().__init__(**kwargs)
         self.image = image
         self.key_name = key_name
         self.flavor = flavor
         self.networks = networks
+        self.status = status
+
 
 class OpenstackImage(OpenstackItem, Timestamped):
     """
     An image on OpenStack.
     """
+    __slots__ = ("created_at", "updated_at", "protected")
+
     def __init__(self, protected: bool=None, **kwargs):
         super().__init__(**kwargs)
         self.protected = protected
@@ -129,6 +346,8 @@ class OpenstackFlavor(OpenstackItem):
     """
     An OpenStack image flavour.
     """
+    __slots__ = ()
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
@@ -137,6 +356,8 @@ class OpenstackNetwork(OpenstackItem):
     """
     An OpenStack network.
     """
+    __slots__ = ()
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
@@ -145,3 +366,19 @@ class ItemNotFoundException(Exception):
     """
     TODO
     """
+
+
+class InstanceStateException(Exception):
+    """
+    Raised when an instance enters a state from which it cannot reach the state that it was expected to reach.
+    """
+    def __init__(self, instance: OpenstackInstance, expected_status: str):
+        """
+        Constructor.
+        :param instance: the instance (as last seen)
+        :param expected_status: the status that the instance was expected to reach
+        """
+        super().__init__(f"Instance {instance.identifier} has status {instance.status} so will not reach status "
+                         f"{expected_status}")
+        self.instance = instance
+        self.expected_status = expected_status
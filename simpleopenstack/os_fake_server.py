@@ -0,0 +1,702 @@
+import json
+import re
+from base64 import b64encode
+from copy import copy
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from operator import gt, ge, lt, le, eq, ne
+from random import Random
+from os import urandom
+from socketserver import ThreadingMixIn
+from struct import pack
+from threading import Thread, Lock
+from time import sleep, monotonic
+from typing import Dict, Any, List, Tuple, Optional, Callable, Pattern, Iterable
+from urllib.parse import urlparse, parse_qs, urlencode
+from uuid import uuid4
+from zlib import crc32
+
+from simpleopenstack.models import OpenstackIdentifier, OpenstackKeypair, OpenstackInstance, OpenstackImage, \
+    OpenstackNetwork, OpenstackFlavor, OpenstackItem
+from simpleopenstack.os_managers import RealOpenstackConnector
+from simpleopenstack.os_mock_managers import MockOpenstack
+from simpleopenstack.timestamps import format_timestamp, parse_timestamp
+
+_Response = Tuple[int, Optional[Dict[str, Any]]]
+_Handler = Callable[..., _Response]
+
+
+class FakeOpenstackRequest:
+    """
+    Request made to the fake OpenStack server.
+    """
+    def __init__(self, method: str, path: str, query: Dict[str, List[str]], body: Optional[Dict[str, Any]]):
+        """
+        Constructor.
+        :param method: the HTTP method
+        :param path: the path requested (without the query string)
+        :param query: the query parameters
+        :param body: the (decoded JSON) body of the request
+        """
+        self.method = method
+        self.path = path
+        self.query = query
+        self.body = body
+
+    def get_query_value(self, name: str, default: str=None) -> Optional[str]:
+        """
+        Gets the (first) value of the query parameter with the given name.
+        :param name: the name of the query parameter
+        :param default: value to return if the query parameter was not given
+        :return: the value of the query parameter
+        """
+        values = self.query.get(name)
+        return values[0] if values else default
+
+
+class _FakeOpenstackError(Exception):
+    """
+    Error that is returned to the client as an OpenStack style fault.
+    """
+    def __init__(self, status: int, fault: str, message: str):
+        super().__init__(message)
+        self.status = status
+        self.fault = fault
+        self.message = message
+
+    def to_response(self) -> _Response:
+        return self.status, {self.fault: {"message": self.message, "code": self.status}}
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    """
+    HTTP server that handles each request in its own thread.
+    """
+    daemon_threads = True
+
+
+class FakeOpenstackServer:
+    """
+    Local HTTP server that implements the subset of the Keystone (v2), Nova, Neutron and Glance APIs used by the real
+    managers, backed by the state of a `MockOpenstack` environment.
+
+    Latency and errors can be injected into requests made to the services (but not into authentication) in order to
+    measure the effect of round trips and failures end to end.
+    """
+    REGION = "RegionOne"
+
+    def __init__(self, mock_openstack: MockOpenstack=None, *, tenant: str="tenant", username: str="user",
+                 password: str="password", latency: float=0.0, error_rate: float=0.0, error_status: int=500,
+                 max_limit: int=1000, seed: int=None, build_duration: float=0.0):
+        """
+        Constructor.
+        :param mock_openstack: the mock OpenStack environment that holds the state of the server (a new environment is
+        created if not given)
+        :param tenant: the tenant that can be authenticated against
+        :param username: the username that can be authenticated with
+        :param password: the password that can be authenticated with
+        :param latency: the time (in seconds) that the server waits before handling each request
+        :param error_rate: the fraction of requests to services that are (randomly) failed
+        :param error_status: the HTTP status of injected errors
+        :param max_limit: the maximum number of items returned when listing
+        :param seed: seed for deciding which requests have errors injected into them
+        :param build_duration: the time (in seconds) that created servers spend building before becoming active
+        """
+        self.mock_openstack = mock_openstack if mock_openstack is not None else MockOpenstack()
+        self.tenant = tenant
+        self.username = username
+        self.password = password
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.max_limit = max_limit
+        self.build_duration = build_duration
+        self.extra_properties: Dict[OpenstackIdentifier, Dict[str, Any]] = {}
+        self.requests: List[Tuple[str, str]] = []
+        self._random = Random(seed)
+        self._random_lock = Lock()
+        self._tokens = set()
+        self._builds: Dict[OpenstackIdentifier, float] = {}
+        self._deleted_instances: Dict[OpenstackIdentifier, OpenstackInstance] = {}
+        self._network_timestamps: Dict[OpenstackIdentifier, datetime] = {}
+        self._instances_lock = Lock()
+        self._routes: List[Tuple[str, Pattern, _Handler]] = []
+        self._server: Optional[_ThreadingHTTPServer] = None
+        self._register_routes()
+
+    @property
+    def url(self) -> str:
+        """
+        Gets the base URL of the server.
+        :return: the URL of the server
+        :raises RuntimeError: if the server has not been started
+        """
+        if self._server is None:
+            raise RuntimeError("Server has not been started")
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    @property
+    def auth_url(self) -> str:
+        """
+        Gets the Keystone (v2) authentication URL of the server.
+        :return: the authentication URL
+        """
+        return f"{self.url}/identity/v2.0"
+
+    @property
+    def connector(self) -> RealOpenstackConnector:
+        """
+        Gets a connector for the server, for use with the real managers.
+        :return: the connector
+        """
+        return RealOpenstackConnector(
+            auth_url=self.auth_url, tenant=self.tenant, username=self.username, password=self.password)
+
+    def start(self) -> "FakeOpenstackServer":
+        """
+        Starts the server on a free local port, handling requests in the background.
+        :return: this server
+        """
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body are written separately, which would otherwise be delayed on kept-alive connections
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                server._handle_http(self)
+
+            do_POST = do_PUT = do_PATCH = do_DELETE = do_HEAD = do_GET
+
+            def log_message(self, *args):
+                pass
+
+        self._server = _ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        Thread(target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+        return self
+
+    def stop(self):
+        """
+        Stops the server.
+        """
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "FakeOpenstackServer":
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def handle(self, request: FakeOpenstackRequest, token: Optional[str]) -> _Response:
+        """
+        Handles the given request.
+        :param request: the request
+        :param token: the authentication token given with the request
+        :return: tuple where the first element is the HTTP status of the response and the second is its JSON body
+        """
+        self.requests.append((request.method, request.path))
+        if self.latency > 0:
+            sleep(self.latency)
+        for method, pattern, handler in self._routes:
+            match = pattern.fullmatch(request.path)
+            if match is not None and method == request.method:
+                break
+        else:
+            return 404, {"itemNotFound": {"message": f"Not found: {request.method} {request.path}", "code": 404}}
+
+        try:
+            if handler != self._create_token:
+                if token not in self._tokens:
+                    raise _FakeOpenstackError(401, "unauthorized", "The request you have made requires authentication")
+                if self._should_inject_error():
+                    raise _FakeOpenstackError(self.error_status, "computeFault", "Injected error")
+            return handler(request, *match.groups())
+        except _FakeOpenstackError as e:
+            return e.to_response()
+
+    def _should_inject_error(self) -> bool:
+        """
+        Gets whether an error should be injected into the current request.
+        :return: whether to fail the request
+        """
+        if self.error_rate <= 0:
+            return False
+        with self._random_lock:
+            return self._random.random() < self.error_rate
+
+    def _handle_http(self, handler: BaseHTTPRequestHandler):
+        """
+        Handles the request received by the given HTTP request handler.
+        :param handler: the HTTP request handler
+        """
+        url = urlparse(handler.path)
+        length = int(handler.headers.get("Content-Length") or 0)
+        content = handler.rfile.read(length) if length > 0 else b""
+        try:
+            body = json.loads(content.decode()) if len(content) > 0 else None
+        except ValueError:
+            body = None
+        request = FakeOpenstackRequest(handler.command, url.path, parse_qs(url.query), body)
+        status, response_body = self.handle(request, handler.headers.get("X-Auth-Token"))
+
+        encoded = json.dumps(response_body).encode() if response_body is not None else b""
+        handler.send_response(status)
+        if len(encoded) > 0:
+            handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(encoded)))
+        handler.end_headers()
+        if handler.command != "HEAD":
+            handler.wfile.write(encoded)
+
+    def _register_routes(self):
+        """
+        Registers the handlers of the supported API calls.
+        """
+        identifier = r"([^/]+)"
+        routes = [
+            ("POST", r"/identity/v2.0/tokens", self._create_token),
+            ("GET", r"/compute/v2.1/servers(/detail)?", self._list_servers),
+            ("GET", rf"/compute/v2.1/servers/{identifier}", self._get_server),
+            ("POST", r"/compute/v2.1/servers", self._create_server),
+            ("DELETE", rf"/compute/v2.1/servers/{identifier}", self._delete_server),
+            ("POST", rf"/compute/v2.1/servers/{identifier}/action", self._server_action),
+            ("GET", r"/compute/v2.1/flavors(/detail)?", self._list_flavors),
+            ("GET", rf"/compute/v2.1/flavors/{identifier}", self._get_flavor),
+            ("GET", r"/compute/v2.1/os-keypairs", self._list_keypairs),
+            ("GET", rf"/compute/v2.1/os-keypairs/{identifier}", self._get_keypair),
+            ("POST", r"/compute/v2.1/os-keypairs", self._create_keypair),
+            ("DELETE", rf"/compute/v2.1/os-keypairs/{identifier}", self._delete_keypair),
+            ("GET", r"/network/v2.0/networks(?:\.json)?", self._list_networks),
+            ("GET", rf"/network/v2.0/networks/{identifier}(?:\.json)?", self._get_network),
+            ("POST", r"/network/v2.0/networks(?:\.json)?", self._create_network),
+            ("DELETE", rf"/network/v2.0/networks/{identifier}(?:\.json)?", self._delete_network),
+            ("GET", r"/image/v2/schemas/image", self._get_image_schema),
+            ("GET", r"/image/v2/images", self._list_images),
+            ("GET", rf"/image/v2/images/{identifier}", self._get_image),
+            ("POST", r"/image/v2/images", self._create_image),
+            ("DELETE", rf"/image/v2/images/{identifier}", self._delete_image)
+        ]
+        self._routes = [(method, re.compile(pattern), handler) for method, pattern, handler in routes]
+
+    def _render(self, item: OpenstackItem, rendered: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Adds the extra properties that have been set for the given item to its rendered representation.
+        :param item: the item
+        :param rendered: the representation of the item
+        :return: the representation of the item
+        """
+        rendered.update(self.extra_properties.get(item.identifier, {}))
+        return rendered
+
+    def _paginate(self, request: FakeOpenstackRequest, items: List[Dict[str, Any]], fault: str) \
+            -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Gets the page of the given items requested using the limit and marker query parameters.
+        :param request: the request
+        :param items: all of the (rendered) items, in order
+        :param fault: the type of fault to return if the marker is not valid
+        :return: tuple where the first element is the items on the page and the second is whether there are more items
+        """
+        limit = min(int(request.get_query_value("limit", self.max_limit)), self.max_limit)
+        marker = request.get_query_value("marker")
+        start = 0
+        if marker is not None:
+            identifiers = [item["id"] for item in items]
+            if marker not in identifiers:
+                raise _FakeOpenstackError(400, fault, f"marker [{marker}] not found")
+            start = identifiers.index(marker) + 1
+        return items[start:start + limit], start + limit < len(items)
+
+    @staticmethod
+    def _filter(request: FakeOpenstackRequest, items: Iterable[Dict[str, Any]], ignored: Iterable[str]=()) \
+            -> List[Dict[str, Any]]:
+        """
+        Filters the given items to those with the values given in the query parameters.
+        :param request: the request
+        :param items: the (rendered) items
+        :param ignored: query parameters that are not filters
+        :return: the matched items
+        """
+        ignored = {"limit", "marker", "sort_key", "sort_dir", "fields", *ignored}
+        filters = {key: values for key, values in request.query.items() if key not in ignored}
+
+        def matches(item: Dict[str, Any]) -> bool:
+            for key, values in filters.items():
+                value = item.get(key)
+                for expected in values:
+                    if isinstance(value, list):
+                        if expected not in value:
+                            return False
+                    elif (json.dumps(value) if isinstance(value, bool) else str(value)) != expected:
+                        return False
+            return True
+
+        return [item for item in items if matches(item)]
+
+    @staticmethod
+    def _filter_by_time(items: Iterable[Dict[str, Any]], key: str, operator: str, timestamp: str) \
+            -> List[Dict[str, Any]]:
+        """
+        Filters the given items to those with a time that compares to the given timestamp as required. Items that do
+        not have the time are not filtered out (they are treated as possibly having changed).
+        :param items: the (rendered) items
+        :param key: the key of the time in each item
+        :param operator: the comparison to make (Glance-style, e.g. "gte")
+        :param timestamp: the timestamp to compare against
+        :return: the matched items
+        """
+        comparisons = {"gt": gt, "gte": ge, "lt": lt, "lte": le, "eq": eq, "neq": ne}
+        if operator not in comparisons:
+            raise _FakeOpenstackError(400, "badRequest", f"Invalid operator: {operator}")
+        try:
+            timestamp = parse_timestamp(timestamp)
+        except ValueError as e:
+            raise _FakeOpenstackError(400, "badRequest", f"Invalid timestamp: {timestamp}") from e
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=timezone.utc)
+        return [item for item in items
+                if item.get(key) is None or comparisons[operator](parse_timestamp(item[key]), timestamp)]
+
+    @staticmethod
+    def _format_timestamp(timestamp: Optional[datetime]) -> Optional[str]:
+        if timestamp is None:
+            return None
+        return format_timestamp(timestamp)
+
+    @staticmethod
+    def _now() -> datetime:
+        return datetime.now(timezone.utc).replace(microsecond=0)
+
+    # Keystone ---------------------------------------------------------------------------------------------------------
+    def _create_token(self, request: FakeOpenstackRequest) -> _Response:
+        credentials = (request.body or {}).get("auth", {})
+        password_credentials = credentials.get("passwordCredentials", {})
+        if (password_credentials.get("username"), password_credentials.get("password"),
+                credentials.get("tenantName")) != (self.username, self.password, self.tenant):
+            raise _FakeOpenstackError(401, "error", "The request you have made requires authentication")
+        token = uuid4().hex
+        self._tokens.add(token)
+
+        def service(service_type: str, name: str, path: str) -> Dict[str, Any]:
+            url = f"{self.url}/{path}"
+            return {"type": service_type, "name": name, "endpoints_links": [], "endpoints": [{
+                "id": uuid4().hex, "region": FakeOpenstackServer.REGION, "publicURL": url, "internalURL": url,
+                "adminURL": url}]}
+
+        return 200, {"access": {
+            "token": {"id": token, "issued_at": FakeOpenstackServer._format_timestamp(FakeOpenstackServer._now()),
+                      "expires": "2999-12-31T23:59:59Z",
+                      "tenant": {"id": self.tenant, "name": self.tenant, "enabled": True}},
+            "serviceCatalog": [
+                service("identity", "keystone", "identity/v2.0"),
+                service("compute", "nova", "compute/v2.1"),
+                service("network", "neutron", "network"),
+                service("image", "glance", "image")],
+            "user": {"id": self.username, "name": self.username, "username": self.username, "roles_links": [],
+                     "roles": [{"name": "member"}]},
+            "metadata": {"is_admin": 0, "roles": []}}}
+
+    # Nova servers -----------------------------------------------------------------------------------------------------
+    def _render_server(self, instance: OpenstackInstance) -> Dict[str, Any]:
+        address = 2 + crc32(instance.identifier.encode()) % 250
+        self._update_build(instance)
+        return self._render(instance, {
+            "id": instance.identifier,
+            "name": instance.name,
+            "status": instance.status or OpenstackInstance.ACTIVE,
+            "created": FakeOpenstackServer._format_timestamp(instance.created_at),
+            "updated": FakeOpenstackServer._format_timestamp(instance.updated_at),
+            "image": {"id": instance.image, "links": []},
+            "flavor": {"id": instance.flavor, "links": []},
+            "key_name": instance.key_name,
+            "addresses": {network: [{"addr": f"10.0.{i}.{address}", "version": 4, "OS-EXT-IPS:type": "fixed"}]
+                          for i, network in enumerate(instance.networks or [])},
+            "metadata": {},
+            "tenant_id": self.tenant,
+            "user_id": self.username,
+            "links": []
+        })
+
+    def _update_build(self, instance: OpenstackInstance):
+        """
+        Makes the given instance active (updating when it was last updated) if it has finished building.
+        :param instance: the instance
+        """
+        with self._instances_lock:
+            finishes_at = self._builds.get(instance.identifier)
+            if finishes_at is not None and monotonic() >= finishes_at:
+                del self._builds[instance.identifier]
+                instance.status = OpenstackInstance.ACTIVE
+                instance.updated_at = FakeOpenstackServer._now()
+
+    def _get_instance(self, identifier: OpenstackIdentifier) -> OpenstackInstance:
+        instance = self.mock_openstack.instances.get(identifier)
+        if instance is None:
+            raise _FakeOpenstackError(404, "itemNotFound", f"Instance {identifier} could not be found.")
+        return instance
+
+    def _list_servers(self, request: FakeOpenstackRequest, detailed: Optional[str]) -> _Response:
+        name = request.get_query_value("name")
+        changes_since = request.get_query_value("changes-since")
+        instances = list(self.mock_openstack.instances)
+        if changes_since is not None:
+            # As in Nova, deleted servers are only listed when asking for changes
+            with self._instances_lock:
+                instances.extend(self._deleted_instances.values())
+        servers = [self._render_server(instance) for instance in instances
+                   if name is None or re.search(name, instance.name or "")]
+        if changes_since is not None:
+            servers = FakeOpenstackServer._filter_by_time(servers, "updated", "gte", changes_since)
+        servers, _ = self._paginate(
+            request, FakeOpenstackServer._filter(request, servers, ("name", "changes-since")), "badRequest")
+        if detailed is None:
+            servers = [{"id": server["id"], "name": server["name"], "links": []} for server in servers]
+        return 200, {"servers": servers}
+
+    def _get_server(self, request: FakeOpenstackRequest, identifier: str) -> _Response:
+        return 200, {"server": self._render_server(self._get_instance(identifier))}
+
+    def _create_server(self, request: FakeOpenstackRequest) -> _Response:
+        server = (request.body or {}).get("server", {})
+
+        def require(item_type: str, item: Optional[OpenstackItem], reference: Any) -> OpenstackItem:
+            if item is None:
+                raise _FakeOpenstackError(400, "badRequest", f"Invalid {item_type} reference: {reference}")
+            return item
+
+        image = require("imageRef", self.mock_openstack.images.get(server.get("imageRef")), server.get("imageRef"))
+        flavor = require("flavorRef", self.mock_openstack.flavors.get(server.get("flavorRef")),
+                         server.get("flavorRef"))
+        if server.get("key_name") is not None:
+            require("key_name", next(iter(self.mock_openstack.keypairs.get_by_name(server["key_name"])), None),
+                    server["key_name"])
+        networks = [require("network", self.mock_openstack.networks.get(network.get("uuid")), network.get("uuid"))
+                    for network in server.get("networks", [])]
+
+        now = FakeOpenstackServer._now()
+        instance = OpenstackInstance._from_properties(
+            identifier=OpenstackIdentifier(str(uuid4())), name=server.get("name"), created_at=now, updated_at=now,
+            image=image.identifier, flavor=flavor.identifier, key_name=server.get("key_name"),
+            networks=[network.name for network in networks],
+            status=OpenstackInstance.BUILD if self.build_duration > 0 else OpenstackInstance.ACTIVE)
+        if self.build_duration > 0:
+            with self._instances_lock:
+                self._builds[instance.identifier] = monotonic() + self.build_duration
+        self.mock_openstack.instances.append(instance)
+        return 202, {"server": {"id": instance.identifier, "links": [], "adminPass": uuid4().hex,
+                                "OS-DCF:diskConfig": "MANUAL", "security_groups": [{"name": "default"}]}}
+
+    def _delete_server(self, request: FakeOpenstackRequest, identifier: str) -> _Response:
+        self._get_instance(identifier)
+        try:
+            instance = self.mock_openstack.instances.remove_by_identifier(identifier)
+        except ValueError:
+            raise _FakeOpenstackError(404, "itemNotFound", f"Instance {identifier} could not be found.")
+        deleted = copy(instance)
+        deleted.status = OpenstackInstance.DELETED
+        deleted.updated_at = FakeOpenstackServer._now()
+        with self._instances_lock:
+            self._builds.pop(identifier, None)
+            self._deleted_instances[identifier] = deleted
+        return 204, None
+
+    def _server_action(self, request: FakeOpenstackRequest, identifier: str) -> _Response:
+        self._get_instance(identifier)
+        action = request.body or {}
+        if "forceDelete" in action:
+            return self._delete_server(request, identifier)
+        if "os-resetState" in action:
+            return 202, None
+        raise _FakeOpenstackError(400, "badRequest", f"Unsupported action: {sorted(action.keys())}")
+
+    # Nova flavors -----------------------------------------------------------------------------------------------------
+    def _render_flavor(self, flavor: OpenstackFlavor) -> Dict[str, Any]:
+        return self._render(flavor, {
+            "id": flavor.identifier, "name": flavor.name, "ram": 512, "vcpus": 1, "disk": 1, "swap": "",
+            "OS-FLV-EXT-DATA:ephemeral": 0, "os-flavor-access:is_public": True, "rxtx_factor": 1.0, "links": []})
+
+    def _list_flavors(self, request: FakeOpenstackRequest, detailed: Optional[str]) -> _Response:
+        flavors = [self._render_flavor(flavor) for flavor in self.mock_openstack.flavors]
+        flavors, _ = self._paginate(request, FakeOpenstackServer._filter(request, flavors, ("is_public", )),
+                                    "badRequest")
+        if detailed is None:
+            flavors = [{"id": flavor["id"], "name": flavor["name"], "links": []} for flavor in flavors]
+        return 200, {"flavors": flavors}
+
+    def _get_flavor(self, request: FakeOpenstackRequest, identifier: str) -> _Response:
+        flavor = self.mock_openstack.flavors.get(identifier)
+        if flavor is None:
+            raise _FakeOpenstackError(404, "itemNotFound", f"Flavor {identifier} could not be found.")
+        return 200, {"flavor": self._render_flavor(flavor)}
+
+    # Nova key-pairs ---------------------------------------------------------------------------------------------------
+    def _render_keypair(self, keypair: OpenstackKeypair) -> Dict[str, Any]:
+        return self._render(keypair, {
+            "name": keypair.name, "public_key": keypair.public_key, "fingerprint": keypair.fingerprint,
+            "user_id": self.username})
+
+    def _get_named_keypair(self, name: str) -> OpenstackKeypair:
+        keypairs = self.mock_openstack.keypairs.get_by_name(name)
+        if len(keypairs) == 0:
+            raise _FakeOpenstackError(404, "itemNotFound", f"Keypair {name} not found for user {self.username}")
+        return keypairs[0]
+
+    def _list_keypairs(self, request: FakeOpenstackRequest) -> _Response:
+        return 200, {"keypairs": [{"keypair": self._render_keypair(keypair)}
+                                  for keypair in self.mock_openstack.keypairs]}
+
+    def _get_keypair(self, request: FakeOpenstackRequest, name: str) -> _Response:
+        return 200, {"keypair": self._render_keypair(self._get_named_keypair(name))}
+
+    def _create_keypair(self, request: FakeOpenstackRequest) -> _Response:
+        keypair = (request.body or {}).get("keypair", {})
+        try:
+            created = OpenstackKeypair(
+                identifier=keypair.get("name"), name=keypair.get("name"),
+                public_key=keypair.get("public_key") or FakeOpenstackServer._generate_public_key())
+            created.fingerprint
+        except Exception as e:
+            raise _FakeOpenstackError(400, "badRequest", f"Keypair data is invalid: {e}") from e
+        try:
+            self.mock_openstack.keypairs.append(created, unique_name=True)
+        except ValueError as e:
+            raise _FakeOpenstackError(409, "conflictingRequest", f"Key pair '{created.name}' already exists.") from e
+        return 200, {"keypair": self._render_keypair(created)}
+
+    @staticmethod
+    def _generate_public_key() -> str:
+        """
+        Generates a public key, as Nova does when a key-pair is created without one. The private key is not returned (a
+        random Ed25519 public key is generated without one).
+        :return: the public key
+        """
+        def encode(value: bytes) -> bytes:
+            return pack(">I", len(value)) + value
+
+        return f"ssh-ed25519 {b64encode(encode(b'ssh-ed25519') + encode(urandom(32))).decode()}"
+
+    def _delete_keypair(self, request: FakeOpenstackRequest, name: str) -> _Response:
+        try:
+            self.mock_openstack.keypairs.remove_by_identifier(self._get_named_keypair(name).identifier)
+        except ValueError:
+            raise _FakeOpenstackError(404, "itemNotFound", f"Keypair {name} not found for user {self.username}")
+        return 202, None
+
+    # Neutron networks -------------------------------------------------------------------------------------------------
+    def _render_network(self, network: OpenstackNetwork) -> Dict[str, Any]:
+        # Networks only have timestamps if they were created through the server (as the model does not have them)
+        timestamp = FakeOpenstackServer._format_timestamp(self._network_timestamps.get(network.identifier))
+        return self._render(network, {
+            "id": network.identifier, "name": network.name, "status": "ACTIVE", "admin_state_up": True,
+            "shared": False, "subnets": [], "tenant_id": self.tenant, "project_id": self.tenant,
+            "created_at": timestamp, "updated_at": timestamp})
+
+    def _list_networks(self, request: FakeOpenstackRequest) -> _Response:
+        networks = FakeOpenstackServer._filter(request, [
+            self._render_network(network) for network in self.mock_openstack.networks],
+            ("page_reverse", "changed_since"))
+        changed_since = request.get_query_value("changed_since")
+        if changed_since is not None:
+            networks = FakeOpenstackServer._filter_by_time(networks, "updated_at", "gte", changed_since)
+        page, has_more = self._paginate(request, networks, "NeutronError")
+        body = {"networks": page}
+        if has_more and request.get_query_value("limit") is not None:
+            query = {key: values for key, values in request.query.items() if key != "marker"}
+            query["marker"] = [page[-1]["id"]]
+            body["networks_links"] = [
+                {"rel": "next", "href": f"{self.url}/network/v2.0/networks?{urlencode(query, doseq=True)}"}]
+        return 200, body
+
+    def _get_network(self, request: FakeOpenstackRequest, identifier: str) -> _Response:
+        network = self.mock_openstack.networks.get(identifier)
+        if network is None:
+            raise _FakeOpenstackError(404, "NeutronError", f"Network {identifier} could not be found.")
+        return 200, {"network": self._render_network(network)}
+
+    def _create_network(self, request: FakeOpenstackRequest) -> _Response:
+        network = (request.body or {}).get("network", {})
+        created = OpenstackNetwork._from_properties(
+            identifier=OpenstackIdentifier(str(uuid4())), name=network.get("name"))
+        self._network_timestamps[created.identifier] = FakeOpenstackServer._now()
+        self.mock_openstack.networks.append(created)
+        return 201, {"network": self._render_network(created)}
+
+    def _delete_network(self, request: FakeOpenstackRequest, identifier: str) -> _Response:
+        try:
+            self.mock_openstack.networks.remove_by_identifier(identifier)
+        except ValueError:
+            raise _FakeOpenstackError(404, "NeutronError", f"Network {identifier} could not be found.")
+        return 204, None
+
+    # Glance images ----------------------------------------------------------------------------------------------------
+    _IMAGE_SCHEMA = {
+        "name": "image",
+        "properties": {
+            "id": {"type": "string"},
+            "name": {"type": ["null", "string"]},
+            "status": {"type": "string", "readOnly": True},
+            "visibility": {"type": "string", "enum": ["public", "private", "shared", "community"]},
+            "protected": {"type": "boolean"},
+            "tags": {"type": "array", "items": {"type": "string"}},
+            "created_at": {"type": "string", "readOnly": True},
+            "updated_at": {"type": "string", "readOnly": True}
+        },
+        "additionalProperties": {"type": "string"},
+        "links": []
+    }
+
+    def _render_image(self, image: OpenstackImage) -> Dict[str, Any]:
+        return self._render(image, {
+            "id": image.identifier, "name": image.name, "status": "active", "visibility": "private",
+            "protected": bool(image.protected), "tags": [], "owner": self.tenant,
+            "created_at": FakeOpenstackServer._format_timestamp(image.created_at),
+            "updated_at": FakeOpenstackServer._format_timestamp(image.updated_at),
+            "self": f"/v2/images/{image.identifier}", "schema": "/v2/schemas/image"})
+
+    def _get_image_schema(self, request: FakeOpenstackRequest) -> _Response:
+        return 200, FakeOpenstackServer._IMAGE_SCHEMA
+
+    def _list_images(self, request: FakeOpenstackRequest) -> _Response:
+        images = FakeOpenstackServer._filter(
+            request, [self._render_image(image) for image in self.mock_openstack.images],
+            ("sort", "created_at", "updated_at"))
+        for key in ("created_at", "updated_at"):
+            for value in request.query.get(key, []):
+                operator, _, timestamp = value.partition(":")
+                images = FakeOpenstackServer._filter_by_time(images, key, operator, timestamp)
+        page, has_more = self._paginate(request, images, "badRequest")
+        body = {"images": page, "first": "/v2/images", "schema": "/v2/schemas/images"}
+        if has_more:
+            query = {key: values for key, values in request.query.items() if key != "marker"}
+            query["marker"] = [page[-1]["id"]]
+            body["next"] = f"/v2/images?{urlencode(query, doseq=True)}"
+        return 200, body
+
+    def _get_image(self, request: FakeOpenstackRequest, identifier: str) -> _Response:
+        image = self.mock_openstack.images.get(identifier)
+        if image is None:
+            raise _FakeOpenstackError(404, "itemNotFound", f"No image found with ID {identifier}")
+        return 200, self._render_image(image)
+
+    def _create_image(self, request: FakeOpenstackRequest) -> _Response:
+        image = request.body or {}
+        now = FakeOpenstackServer._now()
+        created = OpenstackImage._from_properties(
+            identifier=OpenstackIdentifier(image.get("id") or str(uuid4())), name=image.get("name"), created_at=now,
+            updated_at=now, protected=bool(image.get("protected", False)))
+        try:
+            self.mock_openstack.images.append(created)
+        except ValueError as e:
+            raise _FakeOpenstackError(409, "conflictingRequest", f"Image with ID {created.identifier} exists") from e
+        return 201, self._render_image(created)
+
+    def _delete_image(self, request: FakeOpenstackRequest, identifier: str) -> _Response:
+        try:
+            self.mock_openstack.images.remove_by_identifier(identifier)
+        except ValueError:
+            raise _FakeOpenstackError(404, "itemNotFound", f"No image found with ID {identifier}")
+        return 204, None
@@ -1,25 +1,45 @@
+import json
 from abc import ABCMeta, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from hashlib import sha256
+from threading import Lock, local
+from time import perf_counter, time
 from types import SimpleNamespace
-from typing import Generic, Iterable, Set, Sequence, Optional, List, Type, Dict
+from typing import Generic, Iterable, Set, Sequence, Optional, List, Type, Dict, Tuple, Iterator, Any, Callable, \
+    TypeVar
 
-from dateutil.parser import parse as parse_datetime
 from glanceclient.client import Client as GlanceClient
 from glanceclient.exc import HTTPNotFound
-from keystoneclient.v2_0 import Client as KeystoneClient
+from keystoneauth1.identity.v2 import Password
+from keystoneauth1.session import Session
 from novaclient.base import ManagerWithFind
 from novaclient.client import Client as NovaClient
-from novaclient.exceptions import ClientException, NotFound
+from novaclient.exceptions import ClientException, NotFound, Conflict
 from novaclient.v2.flavors import Flavor
 from novaclient.v2.images import Image
 from novaclient.v2.keypairs import Keypair
 from novaclient.v2.networks import Network
 from novaclient.v2.servers import Server
 from neutronclient.v2_0.client import Client as NeutronClient
+from requests.adapters import HTTPAdapter
 
+from simpleopenstack.async_managers import DelegatingAsyncOpenstackItemManager, AsyncOpenstackKeypairManager, \
+    DelegatingAsyncOpenstackInstanceManager, AsyncOpenstackImageManager, AsyncOpenstackFlavorManager, \
+    AsyncOpenstackNetworkManager
+from simpleopenstack.concurrency import run_concurrently, SingleFlight
+from simpleopenstack.instrumentation import default_instrumentation, InstrumentationEvent, Instrumentation, _count_one
 from simpleopenstack.managers import Managed, RawModel, OpenstackKeypairManager, OpenstackInstanceManager, \
-    OpenstackImageManager, OpenstackItemManager, Connector, OpenstackFlavorManager, OpenstackNetworkManager
+    OpenstackImageManager, OpenstackItemManager, Connector, OpenstackFlavorManager, OpenstackNetworkManager, \
+    ResolvedInstanceReferences
 from simpleopenstack.models import OpenstackKeypair, OpenstackIdentifier, OpenstackInstance, OpenstackImage, \
     OpenstackConnector, OpenstackItem, OpenstackFlavor, OpenstackNetwork
+from simpleopenstack.timestamps import parse_timestamp, format_timestamp
+
+DEFAULT_PAGE_SIZE = 100
+
+_Result = TypeVar("_Result")
 
 
 class RealOpenstackConnector(OpenstackConnector):
@@ -40,11 +60,130 @@ class RealOpenstackConnector(OpenstackConnector):
         self.password = password
 
 
+class _OpenstackSessionPool:
+    """
+    Pool of authenticated sessions, shared by all of the managers that use connectors with the same credentials.
+
+    Each session holds a single Keystone token (and its service catalog), which is refreshed shortly before it expires,
+    along with a pool of keep-alive HTTP connections. Requests made with the sessions time out after `REQUEST_TIMEOUT`
+    seconds.
+
+    Sessions are keyed by a digest of the credentials (so the pool does not hold the passwords itself) and the least
+    recently used sessions are dropped from the pool once it holds `max_size` of them.
+    """
+    CONNECTION_POOL_SIZE = 32
+    REQUEST_TIMEOUT = 60.0
+    DEFAULT_MAX_SIZE = 64
+
+    def __init__(self, max_size: int=DEFAULT_MAX_SIZE):
+        """
+        Constructor.
+        :param max_size: the maximum number of sessions to hold
+        """
+        self.max_size = max_size
+        self._sessions: Dict[str, Session] = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, openstack_connector: RealOpenstackConnector) -> Session:
+        """
+        Gets the session for the given connector, creating it if it does not already exist.
+        :param openstack_connector: the connector to get the session for
+        :return: the authenticated session
+        """
+        key = _OpenstackSessionPool._get_key(openstack_connector)
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                session = self._create_session(openstack_connector)
+                self._sessions[key] = session
+                # Dropped sessions are not closed, as managers may still be using them: their connections are closed
+                # once they are no longer referenced
+                while len(self._sessions) > self.max_size:
+                    self._sessions.popitem(last=False)
+            else:
+                self._sessions.move_to_end(key)
+            return session
+
+    def clear(self):
+        """
+        Closes and removes all of the pooled sessions.
+        """
+        with self._lock:
+            for session in self._sessions.values():
+                session.session.close()
+            self._sessions.clear()
+
+    @staticmethod
+    def _get_key(openstack_connector: RealOpenstackConnector) -> str:
+        """
+        Gets the key of the session for the given connector, which is a digest of its credentials.
+        :param openstack_connector: the connector
+        :return: the key
+        """
+        credentials = (openstack_connector.auth_url, openstack_connector.tenant, openstack_connector.username,
+                       openstack_connector.password)
+        return sha256(json.dumps(credentials).encode("utf-8")).hexdigest()
+
+    def _create_session(self, openstack_connector: RealOpenstackConnector) -> Session:
+        """
+        Creates a session for the given connector. No requests are made until the session is first used.
+        :param openstack_connector: the connector to create the session for
+        :return: the created session
+        """
+        authentication = _InstrumentedPassword(
+            auth_url=openstack_connector.auth_url, username=openstack_connector.username,
+            password=openstack_connector.password, tenant_name=openstack_connector.tenant)
+        session = Session(auth=authentication, timeout=_OpenstackSessionPool.REQUEST_TIMEOUT)
+        adapter = HTTPAdapter(pool_connections=_OpenstackSessionPool.CONNECTION_POOL_SIZE,
+                              pool_maxsize=_OpenstackSessionPool.CONNECTION_POOL_SIZE)
+        session.session.mount("http://", adapter)
+        session.session.mount("https://", adapter)
+        return session
+
+
+session_pool = _OpenstackSessionPool()
+
+
+# The instrumentation of the manager making requests in each thread, which any Keystone logins that the requests need
+# are reported to
+_authentication_instrumentation = local()
+
+
+def _set_authentication_instrumentation(instrumentation: Optional[Instrumentation]) -> Optional[Instrumentation]:
+    """
+    Sets the instrumentation that Keystone logins made by the current thread emit events to.
+    :param instrumentation: the instrumentation (`None` for `default_instrumentation`)
+    :return: the instrumentation that was previously set
+    """
+    previous = getattr(_authentication_instrumentation, "instrumentation", None)
+    _authentication_instrumentation.instrumentation = instrumentation
+    return previous
+
+
+class _InstrumentedPassword(Password):
+    """
+    Keystone password authentication that emits an instrumentation event each time a token is requested, to the
+    instrumentation of the manager whose request needed the token (as the session is shared between managers).
+    """
+    def get_auth_ref(self, session, **kwargs):
+        get_auth_ref = super().get_auth_ref
+        instrumentation = getattr(_authentication_instrumentation, "instrumentation", None)
+        if instrumentation is None:
+            instrumentation = default_instrumentation
+        return instrumentation.call("authenticate", None, "keystone", lambda: get_auth_ref(session, **kwargs))
+
+
 class _RawModelConvertingManager(
         Generic[Managed, RawModel], OpenstackItemManager[Managed, RealOpenstackConnector], metaclass=ABCMeta):
     """
     Manager for OpenStack items.
+
+    Concurrent identical lookups by identifier, by name or of all items are coalesced (see `SingleFlight`), sharing
+    one request to OpenStack. Each caller is given its own models, converted from the shared raw models.
     """
+    # Operations that change the items in OpenStack, after which lookups already in flight are not joined
+    _CHANGE_OPERATIONS = frozenset({"create", "delete", "delete_many"})
+
     @abstractmethod
     def _get_by_id_raw(self, identifier: OpenstackIdentifier=None) -> Optional[RawModel]:
         """
@@ -62,35 +201,141 @@ class _RawModelConvertingManager(
         """
 
     @abstractmethod
-    def _get_all_raw(self) -> Iterable[RawModel]:
+    def _iter_all_raw(self, page_size: int, filters: Dict[str, Any]) -> Iterator[RawModel]:
         """
-        Gets raw models of all the OpenStack items of the type this manager manages.
-        :return: all OpenStack items
+        Lazily gets raw models of all the OpenStack items of the type this manager manages, a page at a time.
+        :param page_size: the number of items to request from OpenStack at a time
+        :param filters: backend specific filters that the items must match
+        :return: iterator of the raw models of the (matching) OpenStack items
         """
 
     def __init__(self, openstack_connector: Connector):
         super().__init__(openstack_connector)
         self._cached_client = None
+        self._client_lock = Lock()
+        self.single_flight = SingleFlight()
+
+    def _get_client(self, create_client: Callable[[Session], Any]) -> Any:
+        """
+        Gets the OpenStack client that this manager uses, creating it if it has not already been created (only once,
+        as the manager may be shared by many threads).
+        :param create_client: function that creates the client, given the authenticated session to use
+        :return: the client
+        """
+        if self._cached_client is None:
+            with self._client_lock:
+                if self._cached_client is None:
+                    self._cached_client = create_client(self._session)
+        return self._cached_client
+
+    @property
+    def _session(self) -> Session:
+        """
+        Gets the authenticated session that is shared with all other managers using the same connector.
+        :return: the shared session
+        """
+        return session_pool.get(self.openstack_connector)
 
     def get_by_id(self, identifier: OpenstackIdentifier) -> Optional[Managed]:
-        raw_item = self._get_by_id_raw(identifier)
+        raw_item = self.single_flight.do(("get_by_id", identifier), lambda: self._instrument(
+            "get_by_id", lambda: self._get_by_id_raw(identifier), lambda raw_item: int(raw_item is not None)))
         if raw_item is None:
             return None
-        item = self._convert_raw(raw_item)
+        item = self._instrumented_convert_raw(raw_item)
         assert item.identifier == identifier
         return item
 
     def get_by_name(self, name: str) -> List[Managed]:
-        items = [self._convert_raw(raw_model) for raw_model in self._get_by_name_raw(name)]
+        raw_items = self.single_flight.do(("get_by_name", name), lambda: self._instrument(
+            "get_by_name", lambda: list(self._get_by_name_raw(name)), len))
+        items = self._instrument("convert", lambda: [self._convert_raw(raw_item) for raw_item in raw_items], len)
         assert len({item.name for item in items if item.name == name}) <= 1
         return items
 
     def get_all(self) -> Set[Managed]:
-        # TODO: This could be list comprehended
-        models: Set[Managed] = set()
-        for item in self._get_all_raw():
-            models.add(self._convert_raw(item))
-        return models
+        raw_items = self.single_flight.do(("get_all", ), lambda: self._instrument(
+            "list", lambda: list(self._iter_all_raw(DEFAULT_PAGE_SIZE, {})), len))
+        return self._instrument("convert", lambda: {self._convert_raw(raw_item) for raw_item in raw_items}, len)
+
+    def iter_all(self, page_size: int=None, filters: Dict[str, Any]=None) -> Iterator[Managed]:
+        raw_items = self._iter_authenticated(self._iter_all_raw(page_size or DEFAULT_PAGE_SIZE, filters or {}))
+        if self.instrumentation.instruments:
+            yield from self._iter_all_instrumented(raw_items)
+            return
+        for raw_item in raw_items:
+            yield self._convert_raw(raw_item)
+
+    def _iter_authenticated(self, raw_items: Iterable[RawModel]) -> Iterator[RawModel]:
+        """
+        Lazily gets the given raw models, reporting any Keystone logins needed to fetch them to this manager's
+        instrumentation.
+        :param raw_items: the raw models, which are fetched from OpenStack as they are iterated over
+        :return: iterator of the raw models
+        """
+        raw_items = iter(raw_items)
+        while True:
+            previous = _set_authentication_instrumentation(self.instrumentation)
+            try:
+                raw_item = next(raw_items)
+            except StopIteration:
+                return
+            finally:
+                _set_authentication_instrumentation(previous)
+            yield raw_item
+
+    def _iter_all_instrumented(self, raw_items: Iterable[RawModel]) -> Iterator[Managed]:
+        """
+        Lazily converts the given raw models, emitting a "list" and a "convert" instrumentation event once iteration
+        ends. The time that the consumer spends between items is not included in either event.
+        :param raw_items: the raw models, which are fetched from OpenStack as they are iterated over
+        :return: iterator of the converted models
+        """
+        started_at = time()
+        list_duration = 0.0
+        convert_duration = 0.0
+        items = 0
+        error = None
+        raw_items = iter(raw_items)
+        try:
+            while True:
+                start = perf_counter()
+                try:
+                    raw_item = next(raw_items)
+                except StopIteration:
+                    list_duration += perf_counter() - start
+                    return
+                fetched = perf_counter()
+                item = self._convert_raw(raw_item)
+                list_duration += fetched - start
+                convert_duration += perf_counter() - fetched
+                items += 1
+                yield item
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            self.instrumentation.emit(InstrumentationEvent(
+                "list", self.item_type, self.BACKEND, started_at, list_duration, items=items, error=error))
+            self.instrumentation.emit(InstrumentationEvent(
+                "convert", self.item_type, self.BACKEND, started_at, convert_duration, items=items))
+
+    def _instrument(self, operation: str, function: Callable[[], _Result],
+                    count: Callable[[_Result], int]=_count_one) -> _Result:
+        previous = _set_authentication_instrumentation(self.instrumentation)
+        try:
+            return super()._instrument(operation, function, count)
+        finally:
+            _set_authentication_instrumentation(previous)
+            if operation in _RawModelConvertingManager._CHANGE_OPERATIONS:
+                self.single_flight.forget()
+
+    def _instrumented_convert_raw(self, model: RawModel) -> Managed:
+        """
+        Converts the raw model to the domain model, emitting an instrumentation event if enabled.
+        :param model: the raw model
+        :return: the domain model equivalent
+        """
+        return self._instrument("convert", lambda: self._convert_raw(model))
 
     def _convert_raw(self, model: RawModel) -> Managed:
         """
@@ -100,10 +345,7 @@ class _RawModelConvertingManager(
         :param model: the raw model
         :return: the domain model equivalent
         """
-        return self.item_type(
-            identifier=model.id,
-            name=model.name
-        )
+        return self.item_type._from_properties(identifier=model.id, name=model.name)
 
 
 
@@ -112,6 +354,7 @@ class _NovaManager(Generic[Managed, RawModel], _RawModelConvertingManager[Manage
     Manager that uses Nova client.
     """
     NOVA_VERSION = "2"
+    BACKEND = "nova"
 
     @property
     @abstractmethod
@@ -123,12 +366,7 @@ class _NovaManager(Generic[Managed, RawModel], _RawModelConvertingManager[Manage
 
     @property
     def _client(self) -> NovaClient:
-        if self._cached_client is None:
-            self._cached_client = NovaClient(
-                _NovaManager.NOVA_VERSION, self.openstack_connector.username,
-                self.openstack_connector.password, project_name=self.openstack_connector.tenant,
-                auth_url=self.openstack_connector.auth_url)
-        return self._cached_client
+        return self._get_client(lambda session: NovaClient(_NovaManager.NOVA_VERSION, session=session))
 
     def _get_by_id_raw(self, identifier: OpenstackIdentifier=None) -> Optional[RawModel]:
         try:
@@ -139,8 +377,26 @@ class _NovaManager(Generic[Managed, RawModel], _RawModelConvertingManager[Manage
     def _get_by_name_raw(self, name: str) -> Sequence[Managed]:
         return self._manager.findall(name=name)
 
-    def _get_all_raw(self) -> Iterable[RawModel]:
-        return self._manager.list()
+    def _iter_all_raw(self, page_size: int, filters: Dict[str, Any]) -> Iterator[RawModel]:
+        # Nova gives at most its `max_limit` items per page, which may be fewer than asked for, so a short page does not
+        # mean that there are no more items: only an empty page does
+        marker = None
+        while True:
+            page = self._list_page(marker, page_size, filters)
+            if len(page) == 0:
+                return
+            yield from page
+            marker = page[-1].id
+
+    def _list_page(self, marker: Optional[str], page_size: int, filters: Dict[str, Any]) -> List[RawModel]:
+        """
+        Gets a page of raw models of the items, following the item with the given identifier.
+        :param marker: the identifier of the last item on the previous page (`None` for the first page)
+        :param page_size: the maximum number of items on the page
+        :param filters: filters that the items must match
+        :return: the raw models on the page
+        """
+        return self._manager.list(marker=marker, limit=page_size, **filters)
 
     def _delete(self, identifier: OpenstackIdentifier):
         self._manager.delete(identifier)
@@ -155,14 +411,24 @@ class NovaOpenstackKeypairManager(
     def _manager(self) -> ManagerWithFind:
         return self._client.keypairs
 
+    def _iter_all_raw(self, page_size: int, filters: Dict[str, Any]) -> Iterator[Keypair]:
+        # Key-pairs can only be paged through with later Nova API microversions
+        for keypair in self._manager.list():
+            if all(getattr(keypair, key, None) == value for key, value in filters.items()):
+                yield keypair
+
     def _convert_raw(self, model: Keypair) -> OpenstackKeypair:
-        converted = super()._convert_raw(model)
-        converted.fingerprint = model.fingerprint
-        converted.public_key = model.public_key
-        return converted
+        # The fingerprint given by OpenStack is trusted so the public key does not have to be parsed
+        return OpenstackKeypair._from_properties(
+            identifier=model.id, name=model.name, public_key=model.public_key, fingerprint=model.fingerprint)
 
     def create(self, model: OpenstackKeypair) -> OpenstackKeypair:
-        return self._convert_raw(self._manager.create(name=model.name, public_key=model.public_key))
+        try:
+            raw_item = self._instrument(
+                "create", lambda: self._manager.create(name=model.name, public_key=model.public_key))
+        except Conflict as e:
+            raise ValueError(f"Keypairs with duplicate names are not allowed in OpenStack: {model.name}") from e
+        return self._instrumented_convert_raw(raw_item)
 
 
 class NovaOpenstackInstanceManager(
@@ -170,48 +436,80 @@ class NovaOpenstackInstanceManager(
     """
     Manager for OpenStack instances.
     """
+    # Nova lists deleted servers when asked for changes
+    CHANGES_INCLUDE_DELETED = True
+
     @property
     def _manager(self) -> ManagerWithFind:
         return self._client.servers
 
+    def _list_page(self, marker: Optional[str], page_size: int, filters: Dict[str, Any]) -> List[Server]:
+        return self._manager.list(search_opts=filters, marker=marker, limit=page_size)
+
+    def iter_changed_since(self, since: datetime) -> Iterator[OpenstackInstance]:
+        return self.iter_all(filters={"changes-since": format_timestamp(since)})
+
+    def _poll_instances(self, identifiers: Set[OpenstackIdentifier], changes_since: Optional[datetime]) \
+            -> Dict[OpenstackIdentifier, Optional[OpenstackInstance]]:
+        # All of the instances are polled with a single listing, of only the servers that have changed if possible
+        instances = self.iter_changed_since(changes_since) if changes_since is not None else self.iter_all()
+        polled = {instance.identifier: instance for instance in instances if instance.identifier in identifiers}
+        if changes_since is None:
+            # Deleted servers are only listed when changes are asked for
+            polled.update((identifier, None) for identifier in identifiers - polled.keys())
+        return polled
+
     def _convert_raw(self, model: Server) -> OpenstackInstance:
-        converted = super()._convert_raw(model)
-        converted.created_at = parse_datetime(model.created)
-        converted.updated_at = parse_datetime(model.updated)
-        converted.image = model.image["id"]
-        converted.key_name = model.key_name,
-        converted.flavor = model.flavor["id"]
-        converted.networks = [network for network in model.networks.keys()]
-        return converted
+        return OpenstackInstance._from_properties(
+            identifier=model.id,
+            name=model.name,
+            created_at=parse_timestamp(model.created),
+            updated_at=parse_timestamp(model.updated),
+            image=model.image["id"],
+            key_name=model.key_name,
+            flavor=model.flavor["id"],
+            networks=list(model.networks.keys()),
+            status=model.status
+        )
+
+    @staticmethod
+    def _is_invalid_state_exception(exception: Optional[Exception]) -> bool:
+        """
+        Gets whether the given exception was raised because a server was in a state that did not allow the operation.
+        :param exception: the exception
+        :return: whether the exception is due to the server being in an invalid state
+        """
+        return isinstance(exception, ClientException) and "nova.exception.InstanceInvalidState" in exception.message
 
     def _delete(self, identifier: OpenstackIdentifier):
         try:
-            super().delete(identifier)
+            super()._delete(identifier)
         except ClientException as e:
-            if "nova.exception.InstanceInvalidState" not in e.message:
+            if not NovaOpenstackInstanceManager._is_invalid_state_exception(e):
                 raise e
-            self._client.servers.reset_state(identifier)
-            self._client.servers.force_delete(identifier)
-
-    def _create(self, model: OpenstackInstance):
-        from simpleopenstack.factories import OpenstackManagerFactory
-        manager_factory = OpenstackManagerFactory(self.openstack_connector)
-
-        image_manager = manager_factory.create_image_manager()
-        image_id = (image_manager.get_by_id(model.image) or image_manager.get_by_name(model.image)[0]).identifier
-
-        flavor_manager = manager_factory.create_flavor_manager()
-        flavor_id = (flavor_manager.get_by_id(model.flavor) or flavor_manager.get_by_name(model.flavor)[0]).identifier
-
-        network_manager = manager_factory.create_network_manager()
-        network_ids = []
-        for network in model.networks:
-            network_ids.append(
-                (network_manager.get_by_id(network) or network_manager.get_by_name(network)[0]).identifier)
+            self._force_delete(identifier)
+
+    def _delete_many(self, identifiers: List[OpenstackIdentifier], max_concurrency: int) \
+            -> Dict[OpenstackIdentifier, Optional[Exception]]:
+        outcomes = dict(zip(identifiers, run_concurrently(
+            lambda identifier: _NovaManager._delete(self, identifier), identifiers, max_concurrency)))
+        stuck = [identifier for identifier, outcome in outcomes.items()
+                 if NovaOpenstackInstanceManager._is_invalid_state_exception(outcome)]
+        outcomes.update(zip(stuck, run_concurrently(self._force_delete, stuck, max_concurrency)))
+        return outcomes
+
+    def _force_delete(self, identifier: OpenstackIdentifier):
+        """
+        Deletes the server with the given identifier, resetting its state first so that it can be deleted.
+        :param identifier: the identifier of the server to delete
+        """
+        self._client.servers.reset_state(identifier)
+        self._client.servers.force_delete(identifier)
 
-        return self._convert_raw(self._client.servers.create(
-            name=model.name, image=image_id, flavor=flavor_id, key_name=model.key_name,
-            nics=[{"net-id": network for network in network_ids}]))
+    def _create(self, model: OpenstackInstance, references: ResolvedInstanceReferences) -> OpenstackInstance:
+        return self._instrumented_convert_raw(self._instrument("create", lambda: self._client.servers.create(
+            name=model.name, image=references.image, flavor=references.flavor, key_name=references.key_name,
+            nics=[{"net-id": network} for network in references.networks])))
 
 
 class NovaOpenstackFlavorManager(
@@ -232,19 +530,15 @@ class NeutronOpenstackNetworkManager(
     """
     Manager for OpenStack networks.
     """
+    BACKEND = "neutron"
+
     @staticmethod
     def _parse_result(result: Dict) -> List[SimpleNamespace]:
         return [SimpleNamespace(**network) for network in result["networks"]]
 
     @property
     def _client(self) -> NeutronClient:
-        if self._cached_client is None:
-            keystone = KeystoneClient(
-                auth_url=self.openstack_connector.auth_url, username=self.openstack_connector.username,
-                password=self.openstack_connector.password, tenant_name=self.openstack_connector.tenant)
-            neutron_endpoint = keystone.service_catalog.url_for(service_type="network", endpoint_type="publicURL")
-            self._cached_client = NeutronClient(endpoint_url=neutron_endpoint, token=keystone.auth_token)
-        return self._cached_client
+        return self._get_client(lambda session: NeutronClient(session=session, interface="public"))
 
     def _get_by_id_raw(self, identifier: OpenstackIdentifier=None) -> Optional[SimpleNamespace]:
         parsed_result = NeutronOpenstackNetworkManager._parse_result(self._client.list_networks(id=identifier))
@@ -254,15 +548,20 @@ class NeutronOpenstackNetworkManager(
     def _get_by_name_raw(self, name: str) -> Sequence[SimpleNamespace]:
         return NeutronOpenstackNetworkManager._parse_result(self._client.list_networks(name=name))
 
-    def _get_all_raw(self) -> Iterable[SimpleNamespace]:
-        return NeutronOpenstackNetworkManager._parse_result(self._client.list_networks())
+    def _iter_all_raw(self, page_size: int, filters: Dict[str, Any]) -> Iterator[SimpleNamespace]:
+        for page in self._client.list_networks(retrieve_all=False, limit=page_size, **filters):
+            yield from NeutronOpenstackNetworkManager._parse_result(page)
+
+    def iter_changed_since(self, since: datetime) -> Iterator[OpenstackNetwork]:
+        # Requires Neutron's standard attribute timestamp extension
+        return self.iter_all(filters={"changed_since": format_timestamp(since)})
 
     def _delete(self, identifier: OpenstackIdentifier):
         self._client.delete_network(identifier)
 
     def create(self, model: OpenstackNetwork) -> OpenstackNetwork:
-        return self._convert_raw(
-            SimpleNamespace(**self._client.create_network({"network": {"name": model.name}})["network"]))
+        return self._instrumented_convert_raw(SimpleNamespace(**self._instrument(
+            "create", lambda: self._client.create_network({"network": {"name": model.name}}))["network"]))
 
 
 class GlanceOpenstackImageManager(
@@ -271,17 +570,15 @@ class GlanceOpenstackImageManager(
     Manager for OpenStack images.
     """
     GLANCE_VERSION = "2"
+    BACKEND = "glance"
+    SUPPORTED_FILTERS = frozenset({
+        "name", "visibility", "status", "tag", "owner", "member_status", "protected", "container_format",
+        "disk_format", "created_at", "updated_at"})
 
     @property
     def _client(self) -> GlanceClient:
-        if self._cached_client is None:
-            keystone = KeystoneClient(
-                auth_url=self.openstack_connector.auth_url, username=self.openstack_connector.username,
-                password=self.openstack_connector.password, tenant_name=self.openstack_connector.tenant)
-            glance_endpoint = keystone.service_catalog.url_for(service_type="image", endpoint_type="publicURL")
-            self._cached_client = GlanceClient(
-                GlanceOpenstackImageManager.GLANCE_VERSION, glance_endpoint, token=keystone.auth_token)
-        return self._cached_client
+        return self._get_client(lambda session: GlanceClient(
+            GlanceOpenstackImageManager.GLANCE_VERSION, session=session, interface="public"))
 
     def _get_by_id_raw(self, identifier: OpenstackIdentifier=None) -> Optional[Image]:
         try:
@@ -289,20 +586,27 @@ class GlanceOpenstackImageManager(
         except HTTPNotFound:
             return None
 
-    def _get_by_name_raw(self, name: str) -> Sequence[Image]:
-        # XXX: No obvious way of doing this in the (terrible) documentation:
-        # https://docs.openstack.org/developer/python-glanceclient/ref/v2/images.html
-        return [raw_item for raw_item in self._get_all_raw() if raw_item.name == name]
+    def _get_by_name_raw(self, name: str) -> Iterator[Image]:
+        return self._iter_all_raw(DEFAULT_PAGE_SIZE, {"name": name})
+
+    def _iter_all_raw(self, page_size: int, filters: Dict[str, Any]) -> Iterator[Image]:
+        filters = dict(filters)
+        unsupported = filters.keys() - GlanceOpenstackImageManager.SUPPORTED_FILTERS
+        if len(unsupported) > 0:
+            raise ValueError(f"Unsupported image filters: {sorted(unsupported)}")
+        if isinstance(filters.get("tag"), str):
+            filters["tag"] = [filters["tag"]]
+        return self._client.images.list(filters=filters, page_size=page_size)
 
-    def _get_all_raw(self) -> Iterable[Image]:
-        return self._client.images.list()
+    def iter_changed_since(self, since: datetime) -> Iterator[OpenstackImage]:
+        return self.iter_all(filters={"updated_at": f"gte:{format_timestamp(since)}"})
 
     def _convert_raw(self, model: Image) -> OpenstackImage:
-        return OpenstackImage(
+        return OpenstackImage._from_properties(
             identifier=model.id,
             name=model.name,
-            created_at=parse_datetime(model.created_at),
-            updated_at=parse_datetime(model.updated_at),
+            created_at=parse_timestamp(model.created_at),
+            updated_at=parse_timestamp(model.updated_at),
             protected=model.protected
         )
 
@@ -310,4 +614,62 @@ class GlanceOpenstackImageManager(
         self._client.images.delete(identifier)
 
     def create(self, model: OpenstackImage) -> OpenstackImage:
-        return self._convert_raw(self._client.images.create(name=model.name))
+        return self._instrumented_convert_raw(
+            self._instrument("create", lambda: self._client.images.create(name=model.name)))
+
+
+_async_executor = ThreadPoolExecutor(max_workers=_OpenstackSessionPool.CONNECTION_POOL_SIZE)
+
+
+class _AsyncRealOpenstackItemManager(
+        Generic[Managed], DelegatingAsyncOpenstackItemManager[Managed, RealOpenstackConnector], metaclass=ABCMeta):
+    """
+    Asynchronous manager for OpenStack items.
+
+    Requests are not made with non-blocking HTTP: the OpenStack clients are blocking, so the synchronous managers are
+    called in a bounded pool of threads, shared by all asynchronous managers (and using the same pooled sessions as
+    the synchronous managers). The event loop is therefore not blocked, but each request in flight holds a thread.
+    """
+    def __init__(self, openstack_connector: RealOpenstackConnector, executor: ThreadPoolExecutor=_async_executor):
+        super().__init__(openstack_connector, executor)
+
+
+class AsyncNovaOpenstackKeypairManager(
+        _AsyncRealOpenstackItemManager[OpenstackKeypair], AsyncOpenstackKeypairManager[RealOpenstackConnector]):
+    """
+    Asynchronous manager for OpenStack key-pairs.
+    """
+    _synchronous_manager_type = NovaOpenstackKeypairManager
+
+
+class AsyncNovaOpenstackInstanceManager(
+        _AsyncRealOpenstackItemManager[OpenstackInstance],
+        DelegatingAsyncOpenstackInstanceManager[RealOpenstackConnector]):
+    """
+    Asynchronous manager for OpenStack instances.
+    """
+    _synchronous_manager_type = NovaOpenstackInstanceManager
+
+
+class AsyncNovaOpenstackFlavorManager(
+        _AsyncRealOpenstackItemManager[OpenstackFlavor], AsyncOpenstackFlavorManager[RealOpenstackConnector]):
+    """
+    Asynchronous manager for OpenStack image flavours.
+    """
+    _synchronous_manager_type = NovaOpenstackFlavorManager
+
+
+class AsyncNeutronOpenstackNetworkManager(
+        _AsyncRealOpenstackItemManager[OpenstackNetwork], AsyncOpenstackNetworkManager[RealOpenstackConnector]):
+    """
+    Asynchronous manager for OpenStack networks.
+    """
+    _synchronous_manager_type = NeutronOpenstackNetworkManager
+
+
+class AsyncGlanceOpenstackImageManager(
+        _AsyncRealOpenstackItemManager[OpenstackImage], AsyncOpenstackImageManager[RealOpenstackConnector]):
+    """
+    Asynchronous manager for OpenStack images.
+    """
+    _synchronous_manager_type = GlanceOpenstackImageManager
@@ -1,14 +1,202 @@
 from abc import abstractmethod, ABCMeta
 from copy import copy
-from typing import Optional, Set, List, Generic
+from threading import RLock
+from typing import Optional, Set, List, Generic, Dict, Any, Iterator, Iterable, Union
 from uuid import uuid4
 
-from novaclient.v2.flavors import Flavor
-
+from simpleopenstack.async_managers import DelegatingAsyncOpenstackItemManager, AsyncOpenstackKeypairManager, \
+    DelegatingAsyncOpenstackInstanceManager, AsyncOpenstackImageManager, AsyncOpenstackFlavorManager, \
+    AsyncOpenstackNetworkManager
 from simpleopenstack.managers import OpenstackKeypairManager, OpenstackInstanceManager, OpenstackImageManager, \
-    OpenstackItemManager, Managed, OpenstackFlavorManager, OpenstackNetworkManager
+    OpenstackItemManager, Managed, OpenstackFlavorManager, OpenstackNetworkManager, ResolvedInstanceReferences
 from simpleopenstack.models import OpenstackConnector, OpenstackIdentifier, OpenstackKeypair, \
-    OpenstackImage, OpenstackInstance, Model, OpenstackFlavor, OpenstackNetwork
+    OpenstackImage, OpenstackInstance, Model, OpenstackFlavor, OpenstackNetwork, _get_rename_generation
+
+
+class MockOpenstackItemCollection(Generic[Managed]):
+    """
+    Thread-safe collection of items in a mock OpenStack environment, indexed by identifier and by name.
+
+    The collection can be used like a list of the items, in the order that they were added. Items must have a unique
+    identifier. The collection holds the items themselves, so items can be renamed whilst in the collection: renamed
+    items are re-indexed under their new names before the next lookup by name (which only checks the names of all of
+    the items if an OpenStack item has been renamed since the previous lookup). Collections can be copied and pickled.
+    """
+    def __init__(self, items: Iterable[Managed]=()):
+        """
+        Constructor.
+        :param items: items to initially put in the collection
+        """
+        self._lock = RLock()
+        self._items: Dict[OpenstackIdentifier, Managed] = {}
+        self._by_name: Dict[str, Dict[OpenstackIdentifier, Managed]] = {}
+        # The name that each item is indexed under (which is its name when it was last indexed)
+        self._names: Dict[OpenstackIdentifier, str] = {}
+        self._rename_generation = _get_rename_generation()
+        # The order in which the items were added
+        self._positions: Dict[OpenstackIdentifier, int] = {}
+        self._next_position = 0
+        self.extend(items)
+
+    def get(self, identifier: OpenstackIdentifier) -> Optional[Managed]:
+        """
+        Gets the item with the given identifier.
+        :param identifier: the item's identifier
+        :return: the item or `None` if there is no such item
+        """
+        with self._lock:
+            return self._items.get(identifier)
+
+    def get_by_name(self, name: str) -> List[Managed]:
+        """
+        Gets the items with the given name.
+        :param name: the items' name
+        :return: the items with the name, in the order they were added
+        """
+        with self._lock:
+            self._reindex_renamed()
+            named = [item for item in self._by_name.get(name, {}).values() if item.name == name]
+            if len(named) > 1:
+                # Re-indexed items are out of order
+                named.sort(key=lambda item: self._positions[item.identifier])
+            return named
+
+    def append(self, item: Managed, unique_name: bool=False):
+        """
+        Adds the given item to the collection.
+        :param item: the item to add
+        :param unique_name: whether the item must be the only one in the collection with its name (checked atomically
+        with the addition)
+        :raises ValueError: if the item does not have an identifier, if an item with the same identifier is already in
+        the collection or if the name should be unique but an item with the same name is already in the collection
+        """
+        if item.identifier is None:
+            raise ValueError(f"Items in a mock OpenStack environment must have an identifier: {item}")
+        with self._lock:
+            if item.identifier in self._items:
+                raise ValueError(f"An item with the identifier {item.identifier} is already in the collection")
+            if unique_name and item.name in self._by_name:
+                raise ValueError(f"An item with the name {item.name} is already in the collection")
+            self._items[item.identifier] = item
+            self._by_name.setdefault(item.name, {})[item.identifier] = item
+            self._names[item.identifier] = item.name
+            self._positions[item.identifier] = self._next_position
+            self._next_position += 1
+
+    def extend(self, items: Iterable[Managed]):
+        """
+        Adds the given items to the collection.
+        :param items: the items to add
+        """
+        for item in items:
+            self.append(item)
+
+    def remove(self, item: Managed):
+        """
+        Removes the given item from the collection.
+        :param item: the item to remove
+        :raises ValueError: if the item is not in the collection
+        """
+        with self._lock:
+            if item not in self:
+                raise ValueError(f"Item not in collection: {item}")
+            self.remove_by_identifier(item.identifier)
+
+    def remove_by_identifier(self, identifier: OpenstackIdentifier) -> Managed:
+        """
+        Removes the item with the given identifier from the collection.
+        :param identifier: the identifier of the item to remove
+        :return: the removed item
+        :raises ValueError: if there is no item with the given identifier in the collection
+        """
+        with self._lock:
+            if identifier not in self._items:
+                raise ValueError(f"No item with the identifier {identifier} in collection")
+            item = self._items.pop(identifier)
+            self._unindex_name(identifier)
+            del self._positions[identifier]
+            return item
+
+    def clear(self):
+        """
+        Removes all items from the collection.
+        """
+        with self._lock:
+            self._items.clear()
+            self._by_name.clear()
+            self._names.clear()
+            self._positions.clear()
+
+    def _reindex_renamed(self):
+        """
+        Re-indexes the items that have been renamed since they were indexed, if any OpenStack item has been renamed
+        since this was last done. Must be called with the lock held.
+        """
+        rename_generation = _get_rename_generation()
+        if rename_generation == self._rename_generation:
+            return
+        self._rename_generation = rename_generation
+        for identifier, item in self._items.items():
+            if item.name != self._names[identifier]:
+                self._reindex(item)
+
+    def _reindex(self, item: Managed):
+        """
+        Re-indexes the given item, which is in the collection, under its current name.
+        :param item: the item
+        """
+        self._unindex_name(item.identifier)
+        self._by_name.setdefault(item.name, {})[item.identifier] = item
+        self._names[item.identifier] = item.name
+
+    def _unindex_name(self, identifier: OpenstackIdentifier):
+        """
+        Removes the item with the given identifier from the index of names (under the name that it was indexed with).
+        :param identifier: the identifier of the item
+        """
+        name = self._names.pop(identifier)
+        named = self._by_name[name]
+        del named[identifier]
+        if len(named) == 0:
+            del self._by_name[name]
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # The lock cannot be copied or pickled (a new one is created for the copy)
+        with self._lock:
+            state = dict(self.__dict__)
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]):
+        self.__dict__.update(state)
+        self._lock = RLock()
+        # Generations of renames are not comparable across processes, so the names are checked at the next lookup
+        self._rename_generation = None
+
+    def __iter__(self) -> Iterator[Managed]:
+        # Iterates over a snapshot so that the collection can be modified during iteration
+        with self._lock:
+            return iter(list(self._items.values()))
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, item: Any) -> bool:
+        identifier = getattr(item, "identifier", None)
+        with self._lock:
+            return identifier in self._items and self._items[identifier] == item
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Managed, List[Managed]]:
+        with self._lock:
+            return list(self._items.values())[index]
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, MockOpenstackItemCollection):
+            other = list(other)
+        return isinstance(other, list) and list(self) == other
+
+    def __repr__(self) -> str:
+        return repr(list(self))
 
 
 class MockOpenstack(Model):
@@ -16,11 +204,11 @@ class MockOpenstack(Model):
     Mock OpenStack environment.
     """
     def __init__(self):
-        self.images: List[OpenstackImage] = []
-        self.instances: List[OpenstackInstance] = []
-        self.keypairs: List[OpenstackKeypair] = []
-        self.flavors: List[OpenstackFlavor] = []
-        self.networks: List[OpenstackNetwork] = []
+        self.images: MockOpenstackItemCollection[OpenstackImage] = MockOpenstackItemCollection()
+        self.instances: MockOpenstackItemCollection[OpenstackInstance] = MockOpenstackItemCollection()
+        self.keypairs: MockOpenstackItemCollection[OpenstackKeypair] = MockOpenstackItemCollection()
+        self.flavors: MockOpenstackItemCollection[OpenstackFlavor] = MockOpenstackItemCollection()
+        self.networks: MockOpenstackItemCollection[OpenstackNetwork] = MockOpenstackItemCollection()
 
 
 class MockOpenstackConnector(OpenstackConnector):
@@ -36,37 +224,47 @@ class MockOpenstackItemManager(
     """
     Manager of items in mock OpenStack environment.
     """
+    BACKEND = "mock"
+
     @abstractmethod
-    def _get_item_collection(self) -> List[Managed]:
+    def _get_item_collection(self) -> MockOpenstackItemCollection[Managed]:
         """
         Gets pointer to item collection that this manager deal with in the mock OpenStack environment.
         :return: pointer to the item collection (not a copy)
         """
 
     def get_all(self) -> Set[Managed]:
-        return set(self._get_item_collection())
+        return set(self.iter_all())
 
-    def get_by_id(self, identifier: OpenstackIdentifier) -> Optional[Managed]:
+    def iter_all(self, page_size: int=None, filters: Dict[str, Any]=None) -> Iterator[Managed]:
         for item in self._get_item_collection():
-            if item.identifier == identifier:
-                return item
-        return None
+            if filters is None or all(getattr(item, key, None) == value for key, value in filters.items()):
+                yield item
+
+    def get_by_id(self, identifier: OpenstackIdentifier) -> Optional[Managed]:
+        return self._instrument("get_by_id", lambda: self._get_item_collection().get(identifier),
+                                lambda item: int(item is not None))
 
     def get_by_name(self, name: str) -> List[Managed]:
-        matched_items = []
-        for item in self._get_item_collection():
-            if item.name == name:
-                matched_items.append(item)
-        return matched_items
+        return self._instrument("get_by_name", lambda: self._get_item_collection().get_by_name(name), len)
 
     def create(self, model: Managed) -> Managed:
+        created = self._prepare_creation(model)
+        self._instrument("create", lambda: self._get_item_collection().append(created))
+        return created
+
+    def _prepare_creation(self, model: Managed) -> Managed:
+        """
+        Prepares the item to add to the mock OpenStack environment in order to create an item based on the given model.
+        :param model: the model to base the created item off
+        :return: the item to add, which has been given an identifier
+        """
         created = copy(model)
-        created.identifier = uuid4()
-        self._get_item_collection().append(created)
+        created.identifier = OpenstackIdentifier(str(uuid4()))
         return created
 
     def _delete(self, identifier: OpenstackIdentifier):
-        self._get_item_collection().remove(self.get_by_id(identifier))
+        self._get_item_collection().remove_by_identifier(identifier)
 
 
 class MockOpenstackKeypairManager(
@@ -75,11 +273,14 @@ class MockOpenstackKeypairManager(
     Mock key-pair manager.
     """
     def create(self, model: OpenstackKeypair) -> OpenstackKeypair:
-        if len(self.get_by_name(model.name)) >= 1:
-            raise ValueError(f"Keypairs with duplicate names are not allowed in OpenStack: {model.name}")
-        return super().create(model)
+        created = self._prepare_creation(model)
+        try:
+            self._instrument("create", lambda: self._get_item_collection().append(created, unique_name=True))
+        except ValueError as e:
+            raise ValueError(f"Keypairs with duplicate names are not allowed in OpenStack: {model.name}") from e
+        return created
 
-    def _get_item_collection(self) -> List[OpenstackKeypair]:
+    def _get_item_collection(self) -> MockOpenstackItemCollection[OpenstackKeypair]:
         return self.openstack_connector.mock_openstack.keypairs
 
 
@@ -92,10 +293,13 @@ class MockOpenstackInstanceManager(
     def create(self, model: OpenstackInstance) -> OpenstackInstance:
         return OpenstackInstanceManager.create(self, model)
 
-    def _create(self, model: OpenstackInstance) -> OpenstackInstance:
-        return MockOpenstackItemManager.create(self, model)
+    def _create(self, model: OpenstackInstance, references: ResolvedInstanceReferences) -> OpenstackInstance:
+        created = MockOpenstackItemManager.create(self, model)
+        if created.status is None:
+            created.status = OpenstackInstance.ACTIVE
+        return created
 
-    def _get_item_collection(self) -> List[OpenstackInstance]:
+    def _get_item_collection(self) -> MockOpenstackItemCollection[OpenstackInstance]:
         return self.openstack_connector.mock_openstack.instances
 
 
@@ -104,7 +308,7 @@ class MockOpenstackImageManager(
     """
     Mock image manager.
     """
-    def _get_item_collection(self) -> List[OpenstackImage]:
+    def _get_item_collection(self) -> MockOpenstackItemCollection[OpenstackImage]:
         return self.openstack_connector.mock_openstack.images
 
 
@@ -113,7 +317,7 @@ class MockOpenstackFlavorManager(
     """
     Mock image flavour manager.
     """
-    def _get_item_collection(self) -> List[OpenstackFlavor]:
+    def _get_item_collection(self) -> MockOpenstackItemCollection[OpenstackFlavor]:
         return self.openstack_connector.mock_openstack.flavors
 
 
@@ -122,5 +326,48 @@ class MockOpenstackNetworkManager(
     """
     Mock image flavour manager.
     """
-    def _get_item_collection(self) -> List[OpenstackNetwork]:
+    def _get_item_collection(self) -> MockOpenstackItemCollection[OpenstackNetwork]:
         return self.openstack_connector.mock_openstack.networks
+
+
+class AsyncMockOpenstackKeypairManager(
+        DelegatingAsyncOpenstackItemManager[OpenstackKeypair, MockOpenstackConnector],
+        AsyncOpenstackKeypairManager[MockOpenstackConnector]):
+    """
+    Asynchronous mock key-pair manager.
+    """
+    _synchronous_manager_type = MockOpenstackKeypairManager
+
+
+class AsyncMockOpenstackInstanceManager(DelegatingAsyncOpenstackInstanceManager[MockOpenstackConnector]):
+    """
+    Asynchronous mock instance manager.
+    """
+    _synchronous_manager_type = MockOpenstackInstanceManager
+
+
+class AsyncMockOpenstackImageManager(
+        DelegatingAsyncOpenstackItemManager[OpenstackImage, MockOpenstackConnector],
+        AsyncOpenstackImageManager[MockOpenstackConnector]):
+    """
+    Asynchronous mock image manager.
+    """
+    _synchronous_manager_type = MockOpenstackImageManager
+
+
+class AsyncMockOpenstackFlavorManager(
+        DelegatingAsyncOpenstackItemManager[OpenstackFlavor, MockOpenstackConnector],
+        AsyncOpenstackFlavorManager[MockOpenstackConnector]):
+    """
+    Asynchronous mock image flavour manager.
+    """
+    _synchronous_manager_type = MockOpenstackFlavorManager
+
+
+class AsyncMockOpenstackNetworkManager(
+        DelegatingAsyncOpenstackItemManager[OpenstackNetwork, MockOpenstackConnector],
+        AsyncOpenstackNetworkManager[MockOpenstackConnector]):
+    """
+    Asynchronous mock network manager.
+    """
+    _synchronous_manager_type = MockOpenstackNetworkManager
@@ -0,0 +1,129 @@
+from datetime import datetime, timezone, timedelta
+from typing import Generic, Dict, List, Optional, Callable, Iterable
+
+from simpleopenstack.managers import OpenstackItemManager, Managed
+from simpleopenstack.models import Model, OpenstackIdentifier, OpenstackInstance
+
+ADDED = "added"
+UPDATED = "updated"
+DELETED = "deleted"
+
+DEFAULT_CLOCK_SKEW = 60.0
+DEFAULT_FULL_SYNC_INTERVAL = 10
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class ItemChange(Generic[Managed], Model):
+    """
+    Change to an OpenStack item, found when synchronising an inventory.
+    """
+    def __init__(self, change: str, item: Managed, previous: Optional[Managed]=None):
+        """
+        Constructor.
+        :param change: the type of change (`ADDED`, `UPDATED` or `DELETED`)
+        :param item: the item after the change (or, for deletions, as it last was)
+        :param previous: the item before the change (`None` if it was added)
+        """
+        self.change = change
+        self.item = item
+        self.previous = previous
+
+
+class InventorySync(Generic[Managed]):
+    """
+    Local snapshot of all the OpenStack items of a type, kept in sync incrementally.
+
+    After the first synchronisation, only the items that have changed since the previous synchronisation are fetched,
+    where the backend supports it (Nova `changes-since`, Glance `updated_at` and Neutron `changed_since` filters).
+    Changes are looked for from a little before the previous synchronisation started, to allow for the backend's clock
+    differing from ours; the items that are fetched again but have not changed do not give changes. Backends that do
+    not report deletions when listing changes are fully synchronised every `full_sync_interval` synchronisations, to
+    find the items that have been deleted.
+
+    Not thread-safe.
+    """
+    def __init__(self, manager: OpenstackItemManager,
+                 clock_skew: float=DEFAULT_CLOCK_SKEW, full_sync_interval: int=DEFAULT_FULL_SYNC_INTERVAL,
+                 clock: Callable[[], datetime]=_now):
+        """
+        Constructor.
+        :param manager: manager of the items to keep in sync
+        :param clock_skew: the maximum difference (in seconds) between our clock and the backend's
+        :param full_sync_interval: the number of synchronisations between full synchronisations, for backends that do
+        not report deletions when listing changes
+        :param clock: clock giving the current time (with a timezone)
+        """
+        self.manager = manager
+        self.clock_skew = clock_skew
+        self.full_sync_interval = full_sync_interval
+        self.snapshot: Dict[OpenstackIdentifier, Managed] = {}
+        self._clock = clock
+        self._last_synced_at: Optional[datetime] = None
+        self._syncs_since_full_sync = 0
+
+    def sync(self, full: bool=False) -> List[ItemChange[Managed]]:
+        """
+        Synchronises the snapshot with OpenStack.
+        :param full: whether to list all items, rather than only the items that have changed
+        :return: the changes since the previous synchronisation (all of the items are added on the first)
+        """
+        started_at = self._clock()
+        changed_items = None
+        if not full and self._last_synced_at is not None and (
+                self.manager.CHANGES_INCLUDE_DELETED or self._syncs_since_full_sync < self.full_sync_interval):
+            changed_items = self.manager.iter_changed_since(
+                self._last_synced_at - timedelta(seconds=self.clock_skew))
+
+        if changed_items is None:
+            changes = self._apply_all(self.manager.iter_all())
+            self._syncs_since_full_sync = 0
+        else:
+            changes = self._apply_changed(changed_items)
+            self._syncs_since_full_sync += 1
+        self._last_synced_at = started_at
+        return changes
+
+    def _apply_all(self, items: Iterable[Managed]) -> List[ItemChange[Managed]]:
+        """
+        Applies the listing of all items to the snapshot.
+        :param items: all of the items
+        :return: the changes to the snapshot
+        """
+        items = list(items)
+        changes = self._apply_changed(items)
+        listed = {item.identifier for item in items if not InventorySync._is_deleted(item)}
+        for identifier in [identifier for identifier in self.snapshot.keys() if identifier not in listed]:
+            changes.append(ItemChange(DELETED, self.snapshot.pop(identifier)))
+        return changes
+
+    def _apply_changed(self, items: Iterable[Managed]) -> List[ItemChange[Managed]]:
+        """
+        Applies the given (possibly) changed items to the snapshot.
+        :param items: the items that may have changed
+        :return: the changes to the snapshot
+        """
+        changes = []
+        for item in items:
+            previous = self.snapshot.get(item.identifier)
+            if InventorySync._is_deleted(item):
+                if previous is not None:
+                    changes.append(ItemChange(DELETED, self.snapshot.pop(item.identifier)))
+            elif previous is None:
+                self.snapshot[item.identifier] = item
+                changes.append(ItemChange(ADDED, item))
+            elif previous != item:
+                self.snapshot[item.identifier] = item
+                changes.append(ItemChange(UPDATED, item, previous))
+        return changes
+
+    @staticmethod
+    def _is_deleted(item: Managed) -> bool:
+        """
+        Gets whether the given item, as listed as a change, has been deleted.
+        :param item: the item
+        :return: whether the item has been deleted
+        """
+        return isinstance(item, OpenstackInstance) and item.status == OpenstackInstance.DELETED
@@ -3,14 +3,14 @@ from abc import ABCMeta, abstractmethod
 from copy import copy
 from threading import Lock
 from types import SimpleNamespace
-from typing import Generic, TypeVar
+from typing import Generic, TypeVar, Dict, Any
 
 from simpleopenstack.common import raise_if_absent, get_identifier
 from simpleopenstack.factories import OpenstackManagerFactory
 from simpleopenstack.managers import Managed, OpenstackItemManager, OpenstackKeypairManager, OpenstackInstanceManager, \
     OpenstackImageManager, OpenstackFlavorManager, OpenstackNetworkManager
 from simpleopenstack.models import OpenstackKeypair, OpenstackInstance, OpenstackImage, OpenstackFlavor, \
-    OpenstackNetwork
+    OpenstackNetwork, ItemNotFoundException, InstanceStateException
 
 Manager = TypeVar("Manager", bound=OpenstackItemManager)
 KeypairManager = TypeVar("KeypairManager", bound=OpenstackKeypairManager)
@@ -56,6 +56,29 @@ class OpenstackItemManagerTest(Generic[Manager, Managed], unittest.TestCase, met
         self.item = self._create_test_item()
         assert self.item.identifier is None
 
+    def _create(self, item: Managed) -> Managed:
+        """
+        Creates the given item using the manager under test, updating the item with the properties that OpenStack
+        assigned to the created item.
+        :param item: the item to create
+        :return: the created item
+        """
+        created = self.manager.create(item)
+        for name, value in self._get_server_assigned_properties(item, created).items():
+            setattr(item, name, value)
+        return created
+
+    def _get_server_assigned_properties(self, model: Managed, created: Managed) -> Dict[str, Any]:
+        """
+        Gets the properties that OpenStack assigned to an item when it was created, checking that they have the
+        expected values.
+        :param model: the model that the item was created from
+        :param created: the created item
+        :return: the assigned properties, indexed by name
+        """
+        self.assertIsNotNone(created.identifier)
+        return {"identifier": created.identifier}
+
     def test_item_type(self):
         self.assertEqual(type(self.item), self.manager.item_type)
 
@@ -65,7 +88,8 @@ class OpenstackItemManagerTest(Generic[Manager, Managed], unittest.TestCase, met
         all_items = self.manager.get_all()
         self.assertEqual(1, len(all_items))
         real_item = copy(list(all_items)[0])
-        real_item.identifier = None
+        for name in self._get_server_assigned_properties(self.item, real_item):
+            setattr(real_item, name, getattr(self.item, name))
         self.assertEqual(real_item, self.item)
 
     def test_get_by_id_when_not_exists(self):
@@ -73,14 +97,14 @@ class OpenstackItemManagerTest(Generic[Manager, Managed], unittest.TestCase, met
 
     def test_get_by_id_when_exists(self):
         self.manager.create(self._create_test_item())
-        self.item.identifier = self.manager.create(self.item).identifier
+        self._create(self.item)
         self.assertEqual(self.item, self.manager.get_by_id(self.item.identifier))
 
     def test_get_by_name_when_not_exists(self):
         self.assertEqual([], self.manager.get_by_name("other"))
 
     def test_get_by_name(self):
-        self.item.identifier = self.manager.create(self.item).identifier
+        self._create(self.item)
         self.assertEqual([self.item], self.manager.get_by_name(self.item.name))
 
     def test_get_by_name_when_multiple_with_same_name(self):
@@ -88,23 +112,38 @@ class OpenstackItemManagerTest(Generic[Manager, Managed], unittest.TestCase, met
         items = {self._create_test_item() for _ in range(3)}
         for item in items:
             item.name = common_name
-            item.identifier = self.manager.create(item).identifier
+            self._create(item)
         self.assertCountEqual(items, self.manager.get_by_name(common_name))
 
+    def test_iter_all(self):
+        items = [self.manager.create(self._create_test_item()) for _ in range(3)]
+        self.assertCountEqual(items, self.manager.iter_all(page_size=2))
+
+    def test_iter_all_with_filters(self):
+        items = [self.manager.create(self._create_test_item()) for _ in range(3)]
+        self.assertEqual([items[1]], list(self.manager.iter_all(filters={"name": items[1].name})))
+
     def test_delete_by_id(self):
         self.manager.create(self._create_test_item())
-        self.item.identifier = self.manager.create(self.item).identifier
+        self._create(self.item)
         assert self.item in self.manager.get_all()
         self.manager.delete(identifier=self.item.identifier)
         self.assertNotIn(self.item, self.manager.get_all())
 
     def test_delete_by_item(self):
         self.manager.create(self._create_test_item())
-        self.item.identifier = self.manager.create(self.item).identifier
+        self._create(self.item)
         assert self.item in self.manager.get_all()
         self.manager.delete(item=self.item)
         self.assertNotIn(self.item, self.manager.get_all())
 
+    def test_delete_many(self):
+        remaining = self.manager.create(self._create_test_item())
+        items = [self.manager.create(self._create_test_item()) for _ in range(3)]
+        outcomes = self.manager.delete_many([items[0], items[1].identifier, items[2]], max_concurrency=2)
+        self.assertEqual({item.identifier: None for item in items}, outcomes)
+        self.assertEqual({remaining}, self.manager.get_all())
+
 
 class OpenstackKeypairManagerTest(
         Generic[KeypairManager], OpenstackItemManagerTest[KeypairManager, OpenstackKeypair], metaclass=ABCMeta):
@@ -162,12 +201,45 @@ class OpenstackInstanceManagerTest(
                                  key_name=OpenstackInstanceManagerTest._EXAMPLE_KEY,
                                  networks=[OpenstackInstanceManagerTest._EXAMPLE_NETWORK])
 
+    def test_create_many(self):
+        models = [self._create_test_item() for _ in range(5)]
+        created = self.manager.create_many(models, max_concurrency=3)
+        self.assertEqual([model.name for model in models], [instance.name for instance in created])
+        self.assertCountEqual(created, self.manager.get_all())
+
+    def test_create_many_with_failures(self):
+        models = [self._create_test_item() for _ in range(3)]
+        models[1].image = "other"
+        created = self.manager.create_many(models)
+        self.assertIsInstance(created[1], ItemNotFoundException)
+        self.assertCountEqual([created[0], created[2]], self.manager.get_all())
+
+    def test_wait_for_active(self):
+        created = [self._create(self._create_test_item()) for _ in range(3)]
+        active = list(self.manager.wait_for(created, timeout=30, min_interval=0.01))
+        self.assertCountEqual([instance.identifier for instance in created],
+                              [instance.identifier for instance in active])
+        self.assertEqual({OpenstackInstance.ACTIVE}, {instance.status for instance in active})
+
+    def test_wait_for_deleted(self):
+        item = self._create(self.item)
+        self.manager.delete(item=item)
+        deleted = list(self.manager.wait_for([item.identifier], OpenstackInstance.DELETED, timeout=30,
+                                             min_interval=0.01))
+        self.assertEqual([item.identifier], [instance.identifier for instance in deleted])
+
+    def test_wait_for_deleted_when_waiting_for_active(self):
+        item = self._create(self.item)
+        self.manager.delete(item=item)
+        self.assertRaises(InstanceStateException, list, self.manager.wait_for([item], timeout=30, min_interval=0.01))
+
 
 class OpenstackImageManagerTest(
         Generic[ImageManager], OpenstackItemManagerTest[ImageManager, OpenstackImage], metaclass=ABCMeta):
     """
     Test for `OpenstackImageManager`.
     """
+
     def _create_test_item(self) -> OpenstackImage:
         return OpenstackImage(name=f"example-image-{self.item_count}")
 
@@ -0,0 +1,88 @@
+import asyncio
+import unittest
+
+from simpleopenstack.async_managers import AsyncOpenstackItemManager
+from simpleopenstack.factories import OpenstackManagerFactory, get_manager
+from simpleopenstack.models import OpenstackImage, OpenstackFlavor, OpenstackNetwork, OpenstackInstance, \
+    ItemNotFoundException, OpenstackKeypair
+from simpleopenstack.os_mock_managers import MockOpenstack, MockOpenstackConnector, AsyncMockOpenstackImageManager, \
+    MockOpenstackImageManager
+
+
+class TestAsyncMockOpenstackManagers(unittest.TestCase):
+    """
+    Tests for the asynchronous mock managers.
+    """
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.manager_factory = OpenstackManagerFactory(MockOpenstackConnector(MockOpenstack()))
+        self.image_manager = self.manager_factory.create_async_image_manager()
+
+    def tearDown(self):
+        self.loop.close()
+
+    def _run(self, coroutine):
+        return self.loop.run_until_complete(coroutine)
+
+    def test_delegates_to_shared_manager(self):
+        self.assertIs(self.manager_factory.create_image_manager(), self.image_manager.synchronous_manager)
+
+    def test_delegates_to_shared_manager_when_connector_not_registered(self):
+        class _OtherMockOpenstackConnector(MockOpenstackConnector):
+            pass
+
+        connector = _OtherMockOpenstackConnector(MockOpenstack())
+        manager = AsyncMockOpenstackImageManager(connector)
+        self.assertIsInstance(manager.synchronous_manager, MockOpenstackImageManager)
+        self.assertIs(manager.synchronous_manager, AsyncMockOpenstackImageManager(connector).synchronous_manager)
+        self.assertRaises(ValueError, get_manager, connector, OpenstackImage)
+
+    def test_create(self):
+        created = self._run(self.image_manager.create(OpenstackImage(name="image")))
+        self.assertIsNotNone(created.identifier)
+        self.assertEqual({created}, self._run(self.image_manager.get_all()))
+
+    def test_get_by_id(self):
+        created = self._run(self.image_manager.create(OpenstackImage(name="image")))
+        self.assertEqual(created, self._run(self.image_manager.get_by_id(created.identifier)))
+
+    def test_get_by_name(self):
+        created = self._run(self.image_manager.create(OpenstackImage(name="image")))
+        self.assertEqual([created], self._run(self.image_manager.get_by_name("image")))
+
+    def test_delete(self):
+        created = self._run(self.image_manager.create(OpenstackImage(name="image")))
+        self._run(self.image_manager.delete(item=created))
+        self.assertEqual(set(), self._run(self.image_manager.get_all()))
+
+    def test_delete_many(self):
+        created = [self._run(self.image_manager.create(OpenstackImage(name=f"image-{i}"))) for i in range(3)]
+        outcomes = self._run(self.image_manager.delete_many(created))
+        self.assertEqual({image.identifier: None for image in created}, outcomes)
+        self.assertEqual(set(), self._run(self.image_manager.get_all()))
+
+    def test_create_instances_concurrently(self):
+        for item_type in (OpenstackImage, OpenstackFlavor, OpenstackNetwork, OpenstackKeypair):
+            manager: AsyncOpenstackItemManager = self.manager_factory.create_async_for_managing(item_type)
+            self._run(manager.create(item_type(name=item_type.__name__)))
+        instance_manager = self.manager_factory.create_async_instance_manager()
+        models = [OpenstackInstance(name=f"instance-{i}", image="OpenstackImage", flavor="OpenstackFlavor",
+                                    key_name="OpenstackKeypair", networks=["OpenstackNetwork"]) for i in range(3)]
+
+        async def create_all():
+            return await asyncio.gather(*(instance_manager.create(model) for model in models),
+                                        return_exceptions=True)
+
+        created = self._run(create_all())
+        self.assertEqual([model.name for model in models], [instance.name for instance in created])
+        self.assertCountEqual(created, self._run(instance_manager.get_all()))
+
+    def test_create_many_instances_when_references_missing(self):
+        instance_manager = self.manager_factory.create_async_instance_manager()
+        created = self._run(instance_manager.create_many(
+            [OpenstackInstance(name="instance", image="image", flavor="flavor", key_name="key", networks=[])]))
+        self.assertIsInstance(created[0], ItemNotFoundException)
+
+
+if __name__ == "__main__":
+    unittest.main()
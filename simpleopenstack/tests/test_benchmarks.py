@@ -0,0 +1,97 @@
+import json
+import os
+import unittest
+from tempfile import TemporaryDirectory
+
+from simpleopenstack.benchmarks import run_benchmarks, compare_results, main, BenchmarkResult, MOCK_BACKEND, \
+    FAKE_SERVER_BACKEND, IN_PROCESS, run_micro_benchmarks
+from simpleopenstack.models import OpenstackNetwork, OpenstackFlavor
+
+
+class TestBenchmarkResult(unittest.TestCase):
+    """
+    Tests for `BenchmarkResult`.
+    """
+    def setUp(self):
+        self.result = BenchmarkResult("operation", MOCK_BACKEND, [float(i) for i in range(1, 101)], 200, 1024)
+
+    def test_get_percentile(self):
+        self.assertEqual(50.0, self.result.get_percentile(50))
+        self.assertEqual(99.0, self.result.get_percentile(99))
+        self.assertEqual(1.0, self.result.get_percentile(0))
+
+    def test_to_json(self):
+        result = self.result.to_json()
+        self.assertEqual(100, result["iterations"])
+        self.assertEqual(90.0, result["p90"])
+        self.assertEqual(2.0, result["api_calls_per_iteration"])
+        self.assertEqual(1024, result["peak_memory"])
+
+
+class TestRunBenchmarks(unittest.TestCase):
+    """
+    Tests for `run_benchmarks`.
+    """
+    def test_mock_backend(self):
+        results = run_benchmarks(MOCK_BACKEND, iterations=3, number_of_items=5)
+        names = {result.name for result in results}
+        for operation in ("get_by_id", "get_by_name", "get_all", "create", "delete"):
+            for item_type in ("OpenstackKeypair", "OpenstackInstance", "OpenstackImage", "OpenstackNetwork"):
+                self.assertIn(f"{item_type}.{operation}", names)
+        self.assertIn("get_identifier(OpenstackImage)", names)
+        for result in results:
+            self.assertEqual(3, result.iterations)
+            self.assertIsNone(result.api_calls)
+
+    def test_fake_server_backend(self):
+        results = run_benchmarks(FAKE_SERVER_BACKEND, iterations=2, number_of_items=3,
+                                 item_types=(OpenstackNetwork, OpenstackFlavor))
+        api_calls = {result.name: result.api_calls for result in results}
+        self.assertEqual(2, api_calls["OpenstackNetwork.get_by_id"])
+        self.assertEqual(2, api_calls["OpenstackNetwork.create"])
+        self.assertNotIn("OpenstackFlavor.create", api_calls)
+        # Each incremental synchronisation only lists the changed instances (the listing ending with an empty page)
+        self.assertEqual(4, api_calls["InventorySync(OpenstackInstance).sync"])
+        self.assertIn("OpenstackNetwork.get_by_name x10 concurrently", api_calls)
+
+    def test_micro_benchmarks(self):
+        results = run_micro_benchmarks(iterations=2, number_of_items=3)
+        names = {result.name for result in results}
+        self.assertIn("parse_timestamp", names)
+        self.assertIn("MockOpenstackImageManager.get_by_id (uninstrumented)", names)
+        self.assertEqual({IN_PROCESS}, {result.backend for result in results})
+        self.assertEqual({2}, {result.iterations for result in results})
+
+    def test_unknown_backend(self):
+        self.assertRaises(ValueError, run_benchmarks, "other")
+
+
+class TestCompareResults(unittest.TestCase):
+    """
+    Tests for `compare_results`.
+    """
+    def test_compare(self):
+        previous = [{"backend": MOCK_BACKEND, "name": "a", "p50": 2.0},
+                    {"backend": MOCK_BACKEND, "name": "b", "p50": 1.0}]
+        current = [{"backend": MOCK_BACKEND, "name": "a", "p50": 1.0},
+                   {"backend": MOCK_BACKEND, "name": "c", "p50": 1.0}]
+        self.assertEqual({f"{MOCK_BACKEND}:a": 0.5}, compare_results(previous, current))
+
+
+class TestMain(unittest.TestCase):
+    """
+    Tests for running the benchmarks from the command line.
+    """
+    def test_saves_json(self):
+        with TemporaryDirectory() as directory:
+            output = os.path.join(directory, "results.json")
+            main(["--backend", MOCK_BACKEND, "--iterations", "2", "--items", "2", "--output", output])
+            main(["--backend", MOCK_BACKEND, "--iterations", "2", "--items", "2", "--compare", output, "--micro"])
+            with open(output, "r") as file:
+                results = json.load(file)
+        self.assertIn("OpenstackInstance.create", {result["name"] for result in results})
+        self.assertIn("p99", results[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,185 @@
+import unittest
+from unittest.mock import MagicMock
+
+from simpleopenstack.caching import CachingOpenstackItemManager, caching_manager_type
+from simpleopenstack.common import raise_if_absent, resolve_identifiers
+from simpleopenstack.factories import manager_registry, OpenstackManagerFactory
+from simpleopenstack.models import OpenstackImage
+from simpleopenstack.os_mock_managers import MockOpenstack, MockOpenstackConnector, MockOpenstackImageManager, \
+    MockOpenstackKeypairManager, MockOpenstackInstanceManager, MockOpenstackFlavorManager, MockOpenstackNetworkManager
+from simpleopenstack.tests._test_managers import OpenstackImageManagerTest, OpenstackKeypairManagerTest, \
+    OpenstackFlavorManagerTest, OpenstackNetworkManagerTest, OpenstackItemManagerTest
+
+
+class _CachingMockOpenstackItemManagerTest(unittest.TestCase):
+    """
+    Tests for `CachingOpenstackItemManager`, in front of mock managers.
+    """
+    def setUp(self):
+        self.openstack_connector = MockOpenstackConnector(MockOpenstack())
+        super().setUp()
+
+
+class CachingMockOpenstackKeypairManagerTest(_CachingMockOpenstackItemManagerTest, OpenstackKeypairManagerTest):
+    """
+    Tests for `CachingOpenstackItemManager` in front of `MockOpenstackKeypairManager`.
+    """
+    def _create_manager(self) -> CachingOpenstackItemManager:
+        return CachingOpenstackItemManager(MockOpenstackKeypairManager(self.openstack_connector))
+
+
+class CachingMockOpenstackImageManagerTest(_CachingMockOpenstackItemManagerTest, OpenstackImageManagerTest):
+    """
+    Tests for `CachingOpenstackItemManager` in front of `MockOpenstackImageManager`.
+    """
+    def _create_manager(self) -> CachingOpenstackItemManager:
+        return CachingOpenstackItemManager(MockOpenstackImageManager(self.openstack_connector))
+
+
+class CachingMockOpenstackFlavorManagerTest(_CachingMockOpenstackItemManagerTest, OpenstackFlavorManagerTest):
+    """
+    Tests for `CachingOpenstackItemManager` in front of `MockOpenstackFlavorManager`.
+    """
+    def _create_manager(self) -> CachingOpenstackItemManager:
+        return CachingOpenstackItemManager(MockOpenstackFlavorManager(self.openstack_connector))
+
+
+class CachingMockOpenstackNetworkManagerTest(_CachingMockOpenstackItemManagerTest, OpenstackNetworkManagerTest):
+    """
+    Tests for `CachingOpenstackItemManager` in front of `MockOpenstackNetworkManager`.
+    """
+    def _create_manager(self) -> CachingOpenstackItemManager:
+        return CachingOpenstackItemManager(MockOpenstackNetworkManager(self.openstack_connector))
+
+
+class TestCachingOpenstackItemManager(unittest.TestCase):
+    """
+    Tests for the caching behaviour of `CachingOpenstackItemManager`.
+    """
+    def setUp(self):
+        self.time = 0.0
+        self.mock_openstack = MockOpenstack()
+        self.image = OpenstackImage(identifier="image-id", name="image")
+        self.mock_openstack.images.append(self.image)
+        self.manager = MagicMock(wraps=MockOpenstackImageManager(MockOpenstackConnector(self.mock_openstack)))
+        self.manager.item_type = OpenstackImage
+        self.cache = CachingOpenstackItemManager(
+            self.manager, time_to_live={OpenstackImage: 10.0}, max_size=2, clock=lambda: self.time)
+
+    def test_get_by_id_cached(self):
+        for _ in range(3):
+            self.assertEqual(self.image, self.cache.get_by_id("image-id"))
+        self.assertEqual(1, self.manager.get_by_id.call_count)
+        self.assertEqual(2, self.cache.statistics.hits)
+        self.assertEqual(1, self.cache.statistics.misses)
+
+    def test_get_by_id_miss_cached(self):
+        for _ in range(3):
+            self.assertIsNone(self.cache.get_by_id("other"))
+        self.assertEqual(1, self.manager.get_by_id.call_count)
+
+    def test_get_by_id_expires(self):
+        self.cache.get_by_id("image-id")
+        self.time = 11.0
+        self.cache.get_by_id("image-id")
+        self.assertEqual(2, self.manager.get_by_id.call_count)
+
+    def test_get_by_id_evicts_least_recently_used(self):
+        for identifier in ("image-id", "other-1", "other-2"):
+            self.cache.get_by_id(identifier)
+        self.cache.get_by_id("image-id")
+        self.assertEqual(4, self.manager.get_by_id.call_count)
+        self.assertEqual(2, self.cache.statistics.evictions)
+
+    def test_get_by_name_uses_index(self):
+        for _ in range(3):
+            self.assertEqual([self.image], self.cache.get_by_name("image"))
+            self.assertEqual([], self.cache.get_by_name("other"))
+        self.assertEqual(1, self.manager.get_all.call_count)
+        self.manager.get_by_name.assert_not_called()
+
+    def test_get_by_id_uses_index(self):
+        self.cache.get_all()
+        self.assertEqual(self.image, self.cache.get_by_id("image-id"))
+        self.assertIsNone(self.cache.get_by_id("other"))
+        self.manager.get_by_id.assert_not_called()
+
+    def test_create_invalidates(self):
+        self.cache.get_all()
+        created = self.cache.create(OpenstackImage(name="other"))
+        self.assertIn(created, self.cache.get_all())
+        self.assertEqual(2, self.manager.get_all.call_count)
+
+    def test_delete_invalidates(self):
+        self.cache.get_by_id("image-id")
+        self.cache.delete(identifier="image-id")
+        self.assertIsNone(self.cache.get_by_id("image-id"))
+
+    def test_get_by_id_invalidated_whilst_fetching(self):
+        def get_by_id(identifier):
+            item = self.mock_openstack.images.get(identifier)
+            self.cache.invalidate()
+            return item
+        self.manager.get_by_id.side_effect = get_by_id
+        self.cache.get_by_id("image-id")
+        self.manager.get_by_id.side_effect = None
+        self.cache.get_by_id("image-id")
+        self.assertEqual(2, self.manager.get_by_id.call_count)
+
+    def test_get_all_invalidated_whilst_fetching(self):
+        def get_all():
+            items = set(self.mock_openstack.images)
+            self.cache.invalidate()
+            return items
+        self.manager.get_all.side_effect = get_all
+        self.assertEqual([self.image], self.cache.get_by_name("image"))
+        self.manager.get_all.side_effect = None
+        self.cache.get_by_name("image")
+        self.assertEqual(2, self.manager.get_all.call_count)
+
+    def test_raise_if_absent_without_round_trips_when_warm(self):
+        raise_if_absent("image", self.cache)
+        calls = len(self.manager.method_calls)
+        for _ in range(10):
+            raise_if_absent("image", self.cache)
+            raise_if_absent("image-id", self.cache)
+        self.assertEqual(calls, len(self.manager.method_calls))
+
+
+
+class TestCachingManagerType(unittest.TestCase):
+    """
+    Tests for `caching_manager_type`.
+    """
+    def setUp(self):
+        self.mock_openstack = MockOpenstack()
+        self.mock_openstack.images.append(OpenstackImage(identifier="image-id", name="image"))
+        self.openstack_connector = MockOpenstackConnector(self.mock_openstack)
+        manager_registry.register(MockOpenstackConnector, OpenstackImage, caching_manager_type(
+            MockOpenstackImageManager, time_to_live={OpenstackImage: 60.0}))
+
+    def tearDown(self):
+        manager_registry.register(
+            MockOpenstackConnector, OpenstackImage, "simpleopenstack.os_mock_managers.MockOpenstackImageManager",
+            "simpleopenstack.os_mock_managers.AsyncMockOpenstackImageManager")
+
+    def test_created_by_factory(self):
+        manager = OpenstackManagerFactory(self.openstack_connector).create_image_manager()
+        self.assertIsInstance(manager, CachingOpenstackItemManager)
+        self.assertIsInstance(manager.manager, MockOpenstackImageManager)
+        self.assertEqual(OpenstackImage, manager.item_type)
+
+    def test_used_to_resolve_identifiers(self):
+        references = [(OpenstackImage, "image")]
+        for _ in range(3):
+            self.assertEqual({references[0]: "image-id"}, resolve_identifiers(references, self.openstack_connector))
+        statistics = OpenstackManagerFactory(self.openstack_connector).create_image_manager().statistics
+        # Both the lookup by identifier and by name are cached
+        self.assertEqual((4, 2), (statistics.hits, statistics.misses))
+
+
+del _CachingMockOpenstackItemManagerTest, OpenstackItemManagerTest, OpenstackKeypairManagerTest, \
+    OpenstackImageManagerTest, OpenstackFlavorManagerTest, OpenstackNetworkManagerTest
+
+if __name__ == "__main__":
+    unittest.main()
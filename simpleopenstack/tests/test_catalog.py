@@ -0,0 +1,153 @@
+import os
+import unittest
+from copy import copy
+from datetime import datetime, timezone, timedelta
+from tempfile import TemporaryDirectory
+from time import time
+from typing import List
+
+from simpleopenstack.catalog import PersistentCatalog, PersistentCachingOpenstackItemManager, DEFAULT_TIME_TO_LIVE
+from simpleopenstack.common import get_identifier
+from simpleopenstack.models import OpenstackImage, OpenstackFlavor, OpenstackNetwork
+from simpleopenstack.os_fake_server import FakeOpenstackServer
+from simpleopenstack.os_managers import GlanceOpenstackImageManager, NovaOpenstackFlavorManager, \
+    NeutronOpenstackNetworkManager, NovaOpenstackKeypairManager, RealOpenstackConnector, session_pool
+from simpleopenstack.os_mock_managers import MockOpenstackImageManager, MockOpenstackConnector, MockOpenstack
+
+
+class TestPersistentCachingOpenstackItemManager(unittest.TestCase):
+    """
+    Tests for `PersistentCachingOpenstackItemManager` (and `PersistentCatalog`), against a local fake OpenStack server.
+    """
+    def setUp(self):
+        self.server = FakeOpenstackServer().start()
+        self.created_at = datetime(2020, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+        self.server.mock_openstack.images.extend([OpenstackImage(
+            identifier=f"image-{i}", name=f"image-{i}", created_at=self.created_at, updated_at=self.created_at,
+            protected=i == 0) for i in range(3)])
+        self.server.mock_openstack.flavors.extend(
+            [OpenstackFlavor(identifier=f"flavor-{i}", name=f"flavor-{i}") for i in range(3)])
+        self.server.mock_openstack.networks.extend(
+            [OpenstackNetwork(identifier=f"network-{i}", name=f"network-{i}") for i in range(3)])
+        self.directory = TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "catalog", "catalog.sqlite3")
+        self.now = time()
+
+    def tearDown(self):
+        session_pool.clear()
+        self.server.stop()
+        self.directory.cleanup()
+
+    def _create_manager(self, manager_type: type, **kwargs) -> PersistentCachingOpenstackItemManager:
+        """
+        Creates a persistent caching manager, as a new process would (with a new catalog and no Keystone session).
+        :param manager_type: the type of the underlying manager
+        :param kwargs: other arguments to construct the persistent caching manager with
+        :return: the persistent caching manager
+        """
+        session_pool.clear()
+        connector = RealOpenstackConnector(auth_url=self.server.auth_url, tenant=self.server.tenant,
+                                           username=self.server.username, password=self.server.password)
+        return PersistentCachingOpenstackItemManager(manager_type(connector), PersistentCatalog(self.path),
+                                                     clock=lambda: self.now, **kwargs)
+
+    def _get_paths_requested(self) -> List[str]:
+        paths = [path for _, path in self.server.requests]
+        self.server.requests.clear()
+        return paths
+
+    def test_get_all(self):
+        for manager_type, items in ((GlanceOpenstackImageManager, self.server.mock_openstack.images),
+                                    (NovaOpenstackFlavorManager, self.server.mock_openstack.flavors),
+                                    (NeutronOpenstackNetworkManager, self.server.mock_openstack.networks)):
+            self.assertEqual(set(items), self._create_manager(manager_type).get_all())
+
+    def test_new_process_makes_no_requests(self):
+        manager = self._create_manager(GlanceOpenstackImageManager)
+        manager.get_all()
+        self.assertNotEqual([], self._get_paths_requested())
+
+        manager = self._create_manager(GlanceOpenstackImageManager, trust_absence=True)
+        self.assertEqual("image-1", get_identifier("image-1", manager))
+        self.assertEqual([OpenstackImage(identifier="image-0", name="image-0", created_at=self.created_at,
+                                         updated_at=self.created_at, protected=True)], manager.get_by_name("image-0"))
+        self.assertIsNone(manager.get_by_id("other"))
+        self.assertEqual([], self._get_paths_requested())
+
+    def test_items_created_elsewhere_found(self):
+        self._create_manager(GlanceOpenstackImageManager).get_all()
+        created = OpenstackImage(identifier="created", name="created", created_at=self.created_at,
+                                 updated_at=self.created_at, protected=False)
+        self.server.mock_openstack.images.append(created)
+        manager = self._create_manager(GlanceOpenstackImageManager)
+        self.assertEqual([created], manager.get_by_name("created"))
+        self.assertEqual(created, manager.get_by_id("created"))
+        self.assertIsNone(manager.get_by_id("other"))
+        self._get_paths_requested()
+
+        # Found items are added to the catalog
+        self.assertEqual(created, self._create_manager(GlanceOpenstackImageManager).get_by_id("created"))
+        self.assertEqual([], self._get_paths_requested())
+
+    def test_revalidate_with_changes_since(self):
+        self._create_manager(GlanceOpenstackImageManager).get_all()
+        self._get_paths_requested()
+        changed = copy(self.server.mock_openstack.images.remove_by_identifier("image-2"))
+        changed.name = "changed"
+        changed.updated_at = datetime.now(timezone.utc).replace(microsecond=0) + timedelta(hours=1)
+        self.server.mock_openstack.images.append(changed)
+        self.server.mock_openstack.images.remove_by_identifier("image-0")
+
+        self.now += DEFAULT_TIME_TO_LIVE[OpenstackImage] + 1
+        manager = self._create_manager(GlanceOpenstackImageManager)
+        self.assertEqual([changed], manager.get_by_name("changed"))
+        self.assertEqual([], manager.get_by_name("image-2"))
+        # Only changes are listed, so deletions are not seen until the next full refresh
+        self.assertIsNotNone(manager.get_by_id("image-0"))
+        self._get_paths_requested()
+
+        # Revalidated items are used by new processes until they expire again
+        self._create_manager(GlanceOpenstackImageManager).get_all()
+        self.assertEqual([], self._get_paths_requested())
+
+    def test_revalidate_when_unchanged(self):
+        manager = self._create_manager(NovaOpenstackFlavorManager)
+        manager.get_all()
+        etag = manager.catalog.load(manager.openstack_connector, OpenstackFlavor).etag
+        self.now += DEFAULT_TIME_TO_LIVE[OpenstackFlavor] + 1
+        self.assertEqual(set(self.server.mock_openstack.flavors),
+                         self._create_manager(NovaOpenstackFlavorManager).get_all())
+        entry = manager.catalog.load(manager.openstack_connector, OpenstackFlavor)
+        self.assertEqual((etag, self.now), (entry.etag, entry.validated_at))
+
+    def test_full_refresh_finds_deletions(self):
+        self._create_manager(GlanceOpenstackImageManager).get_all()
+        self.server.mock_openstack.images.remove_by_identifier("image-1")
+        self.now += DEFAULT_TIME_TO_LIVE[OpenstackImage] + 1
+        self.assertIsNotNone(self._create_manager(GlanceOpenstackImageManager).get_by_id("image-1"))
+
+        self.now += 86400
+        self.assertIsNone(self._create_manager(GlanceOpenstackImageManager).get_by_id("image-1"))
+
+    def test_create_invalidates(self):
+        manager = self._create_manager(NeutronOpenstackNetworkManager)
+        manager.get_all()
+        created = manager.create(OpenstackNetwork(name="created"))
+        self.assertEqual([created], self._create_manager(NeutronOpenstackNetworkManager).get_by_name("created"))
+
+    def test_catalogues_kept_apart_by_tenant(self):
+        self._create_manager(NeutronOpenstackNetworkManager).get_all()
+        other_connector = RealOpenstackConnector(auth_url=self.server.auth_url, tenant="other",
+                                                 username=self.server.username, password=self.server.password)
+        self.assertIsNone(PersistentCatalog(self.path).load(other_connector, OpenstackNetwork))
+
+    def test_with_unsupported_item_type(self):
+        self.assertRaises(ValueError, self._create_manager, NovaOpenstackKeypairManager)
+
+    def test_with_unsupported_connector(self):
+        mock_manager = MockOpenstackImageManager(MockOpenstackConnector(MockOpenstack()))
+        self.assertRaises(ValueError, PersistentCachingOpenstackItemManager, mock_manager, PersistentCatalog(self.path))
+
+
+if __name__ == "__main__":
+    unittest.main()
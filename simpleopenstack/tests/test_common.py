@@ -0,0 +1,239 @@
+import unittest
+from collections import Counter
+from unittest.mock import patch
+
+from simpleopenstack.common import resolve_identifiers, get_identifier, IdentifierResolver
+from simpleopenstack.models import OpenstackImage, OpenstackFlavor, OpenstackNetwork, OpenstackKeypair, \
+    OpenstackInstance, ItemNotFoundException
+from simpleopenstack.os_mock_managers import MockOpenstack, MockOpenstackConnector, MockOpenstackItemManager, \
+    MockOpenstackInstanceManager, MockOpenstackImageManager
+
+_EXAMPLE_PUBLIC_KEY = "ssh-rsa AAAAB3NzaC1yc2EAAAABIwAAAQEAqmEmDTNBC6O8HGCdu0MZ9zLCivDsYSttrrmlq87/YsEBpvwUTiF3UEQuF" \
+                      "Laq5Gm+dtgxJewg/UwsZrDFxzpQhCHB6VmqrbKN2hEIkk/HJvCnAmR1ehXv8n2BWw3Jlw7Z+VgWwXAH50f2HWYqTaE4qP4" \
+                      "Dxc4RlElxgNmlDPGXw/dYBvChYBG/RvIiTz1L+pYzPD4JR54IMmTOwjcGIJl7nk1VjKvl3D8Wgp6qejv4MfZ7Htdc99SUKc" \
+                      "KWAeHYsjPXosSk3GlwKiS/sZi51Yca394GE7T4hZu6HTaXeZoD8+IZ7AijYn89H7EPjuu0iCAa/cjVzBsFHGszQYG+U5KfI" \
+                      "w== user@host"
+
+
+class _CountingLookups:
+    """
+    Counts the lookups made by mock managers.
+    """
+    def __init__(self):
+        self.counts = Counter()
+        self._patchers = []
+
+    def __enter__(self):
+        for method_name in ("get_by_id", "get_by_name", "get_all"):
+            original = getattr(MockOpenstackItemManager, method_name)
+
+            def counted(manager, *args, _original=original, _method_name=method_name):
+                self.counts[(manager.item_type, _method_name)] += 1
+                return _original(manager, *args)
+
+            patcher = patch.object(MockOpenstackItemManager, method_name, counted)
+            patcher.start()
+            self._patchers.append(patcher)
+        return self
+
+    def __exit__(self, *args):
+        for patcher in self._patchers:
+            patcher.stop()
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+
+class TestResolveIdentifiers(unittest.TestCase):
+    """
+    Tests for `resolve_identifiers`.
+    """
+    def setUp(self):
+        self.mock_openstack = MockOpenstack()
+        self.connector = MockOpenstackConnector(self.mock_openstack)
+        self.image = OpenstackImage(identifier="image-id", name="image")
+        self.mock_openstack.images.append(self.image)
+
+    def test_resolve_by_name(self):
+        resolved = resolve_identifiers([(OpenstackImage, "image")], self.connector)
+        self.assertEqual({(OpenstackImage, "image"): "image-id"}, resolved)
+
+    def test_resolve_by_identifier(self):
+        resolved = resolve_identifiers([(OpenstackImage, "image-id")], self.connector)
+        self.assertEqual({(OpenstackImage, "image-id"): "image-id"}, resolved)
+
+    def test_resolve_when_not_exists(self):
+        resolved = resolve_identifiers([(OpenstackImage, "other")], self.connector)
+        self.assertIsInstance(resolved[(OpenstackImage, "other")], ItemNotFoundException)
+
+    def test_resolve_none(self):
+        resolved = resolve_identifiers([(OpenstackImage, None)], self.connector)
+        self.assertIsInstance(resolved[(OpenstackImage, None)], ValueError)
+
+    def test_resolve_looks_up_duplicates_once(self):
+        with _CountingLookups() as lookups:
+            resolve_identifiers([(OpenstackImage, "image")] * 10, self.connector)
+        self.assertEqual(1, lookups.counts[(OpenstackImage, "get_by_name")])
+
+
+class TestInstanceCreationLookups(unittest.TestCase):
+    """
+    Call-count benchmark of the lookups made when creating an instance.
+    """
+    _NETWORKS = [f"network-{i}" for i in range(3)]
+
+    def setUp(self):
+        mock_openstack = MockOpenstack()
+        mock_openstack.images.append(OpenstackImage(identifier="image-id", name="image"))
+        mock_openstack.flavors.append(OpenstackFlavor(identifier="flavor-id", name="flavor"))
+        mock_openstack.keypairs.append(
+            OpenstackKeypair(identifier="key-id", name="key", public_key=_EXAMPLE_PUBLIC_KEY))
+        for network in TestInstanceCreationLookups._NETWORKS:
+            mock_openstack.networks.append(OpenstackNetwork(identifier=f"{network}-id", name=network))
+        self.manager = MockOpenstackInstanceManager(MockOpenstackConnector(mock_openstack))
+
+    def test_each_reference_resolved_once(self):
+        networks = TestInstanceCreationLookups._NETWORKS * 2
+        model = OpenstackInstance(name="instance", image="image", flavor="flavor", key_name="key", networks=networks)
+        with _CountingLookups() as lookups:
+            self.manager.create(model)
+
+        # Before resolving once, each of the references was checked (ID lookup followed by name lookup) and then
+        # resolved again in the same way by the backend before the create call
+        previous_lookups = 2 * 2 * (3 + len(networks))
+        # At most one ID lookup of each distinct reference (references resolved once the index of their type has been
+        # built are not looked up), along with one listing per type of item referred to by name
+        self.assertLessEqual(lookups.total, 3 + len(TestInstanceCreationLookups._NETWORKS) + 4)
+        self.assertEqual(4, sum(count for (_, method_name), count in lookups.counts.items()
+                                if method_name == "get_all"))
+        self.assertLess(lookups.total, previous_lookups)
+
+    def test_references_resolved_without_listings_when_indexed(self):
+        model = OpenstackInstance(name="instance", image="image", flavor="flavor", key_name="key",
+                                  networks=TestInstanceCreationLookups._NETWORKS)
+        self.manager.create(model)
+        with _CountingLookups() as lookups:
+            self.manager.create(model)
+        self.assertEqual(0, lookups.total)
+
+    def test_create_with_image_deleted_after_indexed(self):
+        model = OpenstackInstance(name="instance", image="image", flavor="flavor", key_name="key",
+                                  networks=TestInstanceCreationLookups._NETWORKS)
+        self.manager.create(model)
+        image_manager = MockOpenstackImageManager(self.manager.openstack_connector)
+        image_manager.delete(identifier="image-id")
+        self.manager.identifier_resolver.invalidate(OpenstackImage)
+        self.assertRaises(ItemNotFoundException, self.manager.create, model)
+
+
+class TestGetIdentifier(unittest.TestCase):
+    """
+    Tests for `get_identifier`.
+    """
+    def setUp(self):
+        self.mock_openstack = MockOpenstack()
+        self.connector = MockOpenstackConnector(self.mock_openstack)
+        self.manager = MockOpenstackImageManager(self.connector)
+        self.image = self.manager.create(OpenstackImage(name="image"))
+        self.mock_openstack.images.append(OpenstackImage(identifier="1", name="numbered"))
+
+    def test_get_by_name(self):
+        with _CountingLookups() as lookups:
+            self.assertEqual(self.image.identifier, get_identifier("image", self.manager))
+        self.assertEqual({(OpenstackImage, "get_by_id"): 1, (OpenstackImage, "get_by_name"): 1}, lookups.counts)
+
+    def test_get_by_identifier_with_one_lookup(self):
+        with _CountingLookups() as lookups:
+            self.assertEqual(str(self.image.identifier), get_identifier(str(self.image.identifier), self.manager))
+        self.assertEqual(1, lookups.total)
+
+    def test_get_by_non_uuid_identifier(self):
+        self.assertEqual("1", get_identifier("1", self.manager))
+
+    def test_get_by_identifier_that_is_name_of_other_item(self):
+        self.mock_openstack.images.append(OpenstackImage(identifier="2", name="1"))
+        self.assertEqual("1", get_identifier("1", self.manager))
+
+    def test_get_when_not_exists(self):
+        self.assertRaises(ValueError, get_identifier, "other", self.manager)
+
+    def test_get_when_ambiguous(self):
+        self.manager.create(OpenstackImage(name="image"))
+        self.assertRaises(ValueError, get_identifier, "image", self.manager)
+
+
+class TestIdentifierResolver(unittest.TestCase):
+    """
+    Tests for `IdentifierResolver`.
+    """
+    def setUp(self):
+        self.time = 0.0
+        self.manager = MockOpenstackImageManager(MockOpenstackConnector(MockOpenstack()))
+        self.image = self.manager.create(OpenstackImage(name="image"))
+        self.resolver = IdentifierResolver(time_to_live=10.0, clock=lambda: self.time)
+
+    def test_resolve_by_name(self):
+        self.assertEqual(self.image.identifier, self.resolver.resolve("image", self.manager))
+
+    def test_resolve_by_identifier(self):
+        with _CountingLookups() as lookups:
+            self.assertEqual(self.image.identifier, self.resolver.resolve(str(self.image.identifier), self.manager))
+        self.assertEqual({(OpenstackImage, "get_by_id"): 1}, lookups.counts)
+
+    def test_resolve_uses_index(self):
+        self.resolver.resolve("image", self.manager)
+        with _CountingLookups() as lookups:
+            for _ in range(5):
+                self.resolver.resolve("image", self.manager)
+                self.resolver.resolve(self.image.identifier, self.manager)
+        self.assertEqual(0, lookups.total)
+
+    def test_resolve_rebuilds_index_when_expired(self):
+        self.resolver.resolve("image", self.manager)
+        self.time = 11.0
+        with _CountingLookups() as lookups:
+            self.resolver.resolve("image", self.manager)
+        self.assertEqual(1, lookups.counts[(OpenstackImage, "get_all")])
+
+    def test_resolve_item_created_after_indexed(self):
+        self.resolver.resolve("image", self.manager)
+        other = self.manager.create(OpenstackImage(name="other"))
+        self.assertEqual(other.identifier, self.resolver.resolve("other", self.manager))
+
+    def test_resolve_item_deleted_after_indexed(self):
+        self.resolver.resolve("image", self.manager)
+        self.manager.delete(item=self.image)
+        self.assertEqual(self.image.identifier, self.resolver.resolve("image", self.manager))
+        self.time = 11.0
+        self.assertRaises(ValueError, self.resolver.resolve, "image", self.manager)
+        self.assertRaises(ValueError, self.resolver.resolve, self.image.identifier, self.manager)
+
+    def test_resolve_name_reused_after_indexed(self):
+        self.resolver.resolve("image", self.manager)
+        self.manager.delete(item=self.image)
+        other = self.manager.create(OpenstackImage(name="image"))
+        self.resolver.invalidate(OpenstackImage)
+        self.assertEqual(other.identifier, self.resolver.resolve("image", self.manager))
+
+    def test_resolve_when_not_exists(self):
+        self.resolver.resolve("image", self.manager)
+        with _CountingLookups() as lookups:
+            for _ in range(5):
+                self.assertRaises(ValueError, self.resolver.resolve, "other", self.manager)
+        self.assertEqual(0, lookups.counts[(OpenstackImage, "get_all")])
+
+    def test_resolve_when_ambiguous(self):
+        self.manager.create(OpenstackImage(name="image"))
+        self.assertRaises(ValueError, self.resolver.resolve, "image", self.manager)
+
+    def test_invalidate(self):
+        self.resolver.resolve("image", self.manager)
+        self.resolver.invalidate(OpenstackImage)
+        with _CountingLookups() as lookups:
+            self.resolver.resolve("image", self.manager)
+        self.assertEqual(1, lookups.counts[(OpenstackImage, "get_all")])
+
+
+if __name__ == "__main__":
+    unittest.main()
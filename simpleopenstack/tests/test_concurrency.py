@@ -0,0 +1,106 @@
+import unittest
+from threading import Barrier, Event
+from time import monotonic, sleep
+from typing import List
+
+from simpleopenstack.concurrency import SingleFlight, run_concurrently
+
+
+class TestSingleFlight(unittest.TestCase):
+    """
+    Tests for `SingleFlight`.
+    """
+    def setUp(self):
+        self.single_flight = SingleFlight()
+        self.release = Event()
+        self.calls: List[str] = []
+
+    def tearDown(self):
+        self.release.set()
+
+    def _call(self, key: str) -> str:
+        self.calls.append(key)
+        self.release.wait(10)
+        return f"result-{key}"
+
+    def _do_concurrently(self, keys: List[str]) -> List[str]:
+        """
+        Makes calls with the given keys at the same time, releasing them once they are all in flight.
+        :param keys: the key of each call
+        :return: the outcome of each call
+        """
+        barrier = Barrier(len(keys) + 1)
+
+        def do(key: str) -> str:
+            barrier.wait()
+            return self.single_flight.do(key, lambda: self._call(key))
+
+        def release(_):
+            barrier.wait()
+            while self.single_flight.calls + self.single_flight.coalesced < len(keys):
+                sleep(0.001)
+            self.release.set()
+
+        return run_concurrently(lambda key: do(key) if key is not None else release(key), keys + [None],
+                                len(keys) + 1)[:-1]
+
+    def test_do(self):
+        self.release.set()
+        self.assertEqual("result-a", self.single_flight.do("a", lambda: self._call("a")))
+        self.assertEqual("result-a", self.single_flight.do("a", lambda: self._call("a")))
+        self.assertEqual(["a", "a"], self.calls)
+
+    def test_do_concurrently_with_same_key(self):
+        self.assertEqual(["result-a"] * 5, self._do_concurrently(["a"] * 5))
+        self.assertEqual(["a"], self.calls)
+        self.assertEqual((1, 4), (self.single_flight.calls, self.single_flight.coalesced))
+
+    def test_do_concurrently_with_different_keys(self):
+        self.assertEqual(["result-a", "result-b", "result-a"], self._do_concurrently(["a", "b", "a"]))
+        self.assertCountEqual(["a", "b"], self.calls)
+
+    def test_do_when_call_fails(self):
+        error = IOError()
+
+        def fail():
+            self.release.wait(10)
+            raise error
+
+        barrier = Barrier(3)
+
+        def do(_):
+            barrier.wait()
+            return self.single_flight.do("a", fail)
+
+        def release(_):
+            barrier.wait()
+            while self.single_flight.calls + self.single_flight.coalesced < 2:
+                sleep(0.001)
+            self.release.set()
+
+        outcomes = run_concurrently(lambda i: do(i) if i < 2 else release(i), range(3), 3)
+        self.assertEqual([error, error], outcomes[:2])
+        self.assertEqual(1, self.single_flight.calls)
+
+    def test_forget(self):
+        def wait_for_calls(number: int):
+            deadline = monotonic() + 10
+            while len(self.calls) < number and monotonic() < deadline:
+                sleep(0.001)
+
+        def do(i: int) -> str:
+            if i == 1:
+                wait_for_calls(1)
+                self.single_flight.forget()
+            return self.single_flight.do("a", lambda: self._call("a"))
+
+        def release(_):
+            wait_for_calls(2)
+            self.release.set()
+
+        outcomes = run_concurrently(lambda i: do(i) if i < 2 else release(i), range(3), 3)
+        self.assertEqual(["result-a", "result-a"], outcomes[:2])
+        self.assertEqual(["a", "a"], self.calls)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,15 +1,24 @@
+import gc
+import pickle
+import subprocess
+import sys
 import unittest
+import weakref
 from abc import ABCMeta, abstractmethod
+from copy import copy, deepcopy
 from typing import Type, Generic, TypeVar
 
+from simpleopenstack.async_managers import AsyncOpenstackItemManager, AsyncOpenstackKeypairManager, \
+    AsyncOpenstackInstanceManager, AsyncOpenstackImageManager, AsyncOpenstackFlavorManager, AsyncOpenstackNetworkManager
 from simpleopenstack.factories import OpenstackKeypairManagerFactory, OpenstackItemManagerFactory, \
     OpenstackInstanceManagerFactory, OpenstackImageManagerFactory, OpenstackManagerFactory, \
-    OpenstackFlavorManagerFactory, OpenstackNetworkManagerFactory
+    OpenstackFlavorManagerFactory, OpenstackNetworkManagerFactory, ManagerRegistry, get_manager
 from simpleopenstack.managers import OpenstackItemManager, OpenstackKeypairManager, OpenstackInstanceManager, \
     OpenstackImageManager, OpenstackFlavorManager, OpenstackNetworkManager
-from simpleopenstack.models import OpenstackConnector
+from simpleopenstack.models import OpenstackConnector, OpenstackKeypair, OpenstackImage
 from simpleopenstack.os_managers import RealOpenstackConnector
-from simpleopenstack.os_mock_managers import MockOpenstackConnector, MockOpenstack
+from simpleopenstack.os_mock_managers import MockOpenstackConnector, MockOpenstack, MockOpenstackKeypairManager, \
+    AsyncMockOpenstackKeypairManager
 from simpleopenstack.tests._test_managers import Manager
 
 ItemManagerFactory = TypeVar("ItemManagerFactory", bound=OpenstackItemManagerFactory)
@@ -41,6 +50,14 @@ class _TestOpenstackItemManagerFactory(Generic[ItemManagerFactory, Manager], uni
         :return: the manager type
         """
 
+    @property
+    @abstractmethod
+    def async_manager_type(self) -> Type[AsyncOpenstackItemManager]:
+        """
+        The asynchronous manager type that should be produced by the factory that is being tested.
+        :return: the asynchronous manager type
+        """
+
     def setUp(self):
         self.mock_connector = MockOpenstackConnector(MockOpenstack())
         self.real_connector = RealOpenstackConnector(auth_url="", tenant="", username="", password="")
@@ -61,6 +78,33 @@ class _TestOpenstackItemManagerFactory(Generic[ItemManagerFactory, Manager], uni
         factory = self.factory_type(_BlankOpenstackConnector())
         self.assertRaises(ValueError, factory.create)
 
+    def test_create_async_mock_manager(self):
+        factory = self.factory_type(self.mock_connector)
+        manager = factory.create_async()
+        self.assertIsInstance(manager, self.async_manager_type)
+        self.assertEqual(self.mock_connector, manager.openstack_connector)
+
+    def test_create_async_real_manager(self):
+        factory = self.factory_type(self.real_connector)
+        manager = factory.create_async()
+        self.assertIsInstance(manager, self.async_manager_type)
+        self.assertEqual(self.real_connector, manager.openstack_connector)
+
+    def test_create_async_with_unknown_connector(self):
+        factory = self.factory_type(_BlankOpenstackConnector())
+        self.assertRaises(ValueError, factory.create_async)
+
+    def test_create_gives_same_manager_for_connector(self):
+        manager = self.factory_type(self.real_connector).create()
+        self.assertIs(manager, self.factory_type(self.real_connector).create())
+        self.assertIsNot(manager, self.factory_type(self.real_connector).create_async())
+
+    def test_create_gives_different_managers_for_equal_connectors(self):
+        other_real_connector = RealOpenstackConnector(auth_url="", tenant="", username="", password="")
+        self.assertEqual(self.real_connector, other_real_connector)
+        self.assertIsNot(self.factory_type(self.real_connector).create(),
+                         self.factory_type(other_real_connector).create())
+
 
 class TestOpenstackKeypairManagerFactory(
         _TestOpenstackItemManagerFactory[OpenstackKeypairManagerFactory, OpenstackKeypairManager]):
@@ -75,6 +119,10 @@ class TestOpenstackKeypairManagerFactory(
     def manager_type(self) -> Type[OpenstackItemManager]:
         return OpenstackKeypairManager
 
+    @property
+    def async_manager_type(self) -> Type[AsyncOpenstackKeypairManager]:
+        return AsyncOpenstackKeypairManager
+
 
 class TestOpenstackInstanceManagerFactory(
         _TestOpenstackItemManagerFactory[OpenstackInstanceManagerFactory, OpenstackInstanceManager]):
@@ -89,6 +137,10 @@ class TestOpenstackInstanceManagerFactory(
     def manager_type(self) -> Type[OpenstackInstanceManager]:
         return OpenstackInstanceManager
 
+    @property
+    def async_manager_type(self) -> Type[AsyncOpenstackInstanceManager]:
+        return AsyncOpenstackInstanceManager
+
 
 class TestOpenstackImageManagerFactory(
         _TestOpenstackItemManagerFactory[OpenstackImageManagerFactory, OpenstackImageManager]):
@@ -103,6 +155,10 @@ class TestOpenstackImageManagerFactory(
     def manager_type(self) -> Type[OpenstackImageManager]:
         return OpenstackImageManager
 
+    @property
+    def async_manager_type(self) -> Type[AsyncOpenstackImageManager]:
+        return AsyncOpenstackImageManager
+
 
 class TestOpenstackFlavorManagerFactory(
         _TestOpenstackItemManagerFactory[OpenstackFlavorManagerFactory, OpenstackFlavorManager]):
@@ -117,6 +173,10 @@ class TestOpenstackFlavorManagerFactory(
     def manager_type(self) -> Type[OpenstackFlavorManager]:
         return OpenstackFlavorManager
 
+    @property
+    def async_manager_type(self) -> Type[AsyncOpenstackFlavorManager]:
+        return AsyncOpenstackFlavorManager
+
 
 class TestOpenstackNetworkManagerFactory(
         _TestOpenstackItemManagerFactory[OpenstackNetworkManagerFactory, OpenstackNetworkManager]):
@@ -131,6 +191,10 @@ class TestOpenstackNetworkManagerFactory(
     def manager_type(self) -> Type[OpenstackNetworkManager]:
         return OpenstackNetworkManager
 
+    @property
+    def async_manager_type(self) -> Type[AsyncOpenstackNetworkManager]:
+        return AsyncOpenstackNetworkManager
+
 
 class TestOpenstackManagerFactory(unittest.TestCase):
     """
@@ -163,5 +227,114 @@ class TestOpenstackManagerFactory(unittest.TestCase):
 
 del _TestOpenstackItemManagerFactory
 
+
+class TestGetManager(unittest.TestCase):
+    """
+    Tests for `get_manager` and `ManagerRegistry`.
+    """
+    def setUp(self):
+        self.connector = _BlankOpenstackConnector()
+        self.registry = ManagerRegistry()
+
+    def test_get_manager_with_registered_types(self):
+        self.registry.register(_BlankOpenstackConnector, OpenstackKeypair, MockOpenstackKeypairManager,
+                               AsyncMockOpenstackKeypairManager)
+        manager = get_manager(self.connector, OpenstackKeypair, registry=self.registry)
+        self.assertIsInstance(manager, MockOpenstackKeypairManager)
+        self.assertIs(self.connector, manager.openstack_connector)
+        self.assertIsInstance(get_manager(self.connector, OpenstackKeypair, asynchronous=True, registry=self.registry),
+                              AsyncMockOpenstackKeypairManager)
+
+    def test_get_manager_with_registered_paths(self):
+        self.registry.register(f"{__name__}._BlankOpenstackConnector", OpenstackKeypair,
+                               "simpleopenstack.os_mock_managers.MockOpenstackKeypairManager")
+        self.assertIsInstance(get_manager(self.connector, OpenstackKeypair, registry=self.registry),
+                              MockOpenstackKeypairManager)
+
+    def test_get_manager_for_unregistered_item_type(self):
+        self.registry.register(_BlankOpenstackConnector, OpenstackKeypair, MockOpenstackKeypairManager)
+        self.assertRaises(ValueError, get_manager, self.connector, OpenstackImage, registry=self.registry)
+
+    def test_get_manager_for_unregistered_async_manager(self):
+        self.registry.register(_BlankOpenstackConnector, OpenstackKeypair, MockOpenstackKeypairManager)
+        self.assertRaises(ValueError, get_manager, self.connector, OpenstackKeypair, asynchronous=True,
+                          registry=self.registry)
+
+    def test_get_manager_after_registration_replaced(self):
+        self.registry.register(_BlankOpenstackConnector, OpenstackKeypair, MockOpenstackKeypairManager)
+        manager = get_manager(self.connector, OpenstackKeypair, registry=self.registry)
+        self.registry.register(_BlankOpenstackConnector, OpenstackKeypair, AsyncMockOpenstackKeypairManager)
+        replacement_manager = get_manager(self.connector, OpenstackKeypair, registry=self.registry)
+        self.assertIsInstance(replacement_manager, AsyncMockOpenstackKeypairManager)
+        self.assertIsNot(manager, replacement_manager)
+
+    def test_get_manager_for_copied_connector(self):
+        connector = MockOpenstackConnector(MockOpenstack())
+        manager = get_manager(connector, OpenstackKeypair)
+        copied_connector = copy(connector)
+        copied_manager = get_manager(copied_connector, OpenstackKeypair)
+        self.assertIsNot(manager, copied_manager)
+        self.assertIs(copied_connector, copied_manager.openstack_connector)
+        self.assertIs(manager, get_manager(connector, OpenstackKeypair))
+
+    def test_copy_connector_after_getting_manager(self):
+        connector = RealOpenstackConnector(
+            auth_url="http://localhost:5000/v2.0", tenant="tenant", username="user", password="password")
+        manager = get_manager(connector, OpenstackKeypair)
+        for copied_connector in (deepcopy(connector), pickle.loads(pickle.dumps(connector))):
+            self.assertEqual(connector, copied_connector)
+            copied_manager = get_manager(copied_connector, OpenstackKeypair)
+            self.assertIsNot(manager, copied_manager)
+            self.assertIs(copied_connector, copied_manager.openstack_connector)
+
+    def test_managers_released_with_connector(self):
+        connector = MockOpenstackConnector(MockOpenstack())
+        manager_reference = weakref.ref(get_manager(connector, OpenstackKeypair))
+        connector_reference = weakref.ref(connector)
+        del connector
+        gc.collect()
+        self.assertIsNone(connector_reference())
+        self.assertIsNone(manager_reference())
+
+    def test_connector_equality_unaffected_by_cached_managers(self):
+        connector = MockOpenstackConnector(MockOpenstack())
+        other_connector = MockOpenstackConnector(connector.mock_openstack)
+        get_manager(connector, OpenstackKeypair)
+        self.assertEqual(connector, other_connector)
+        self.assertEqual(str(connector), str(other_connector))
+
+
+class TestFactoryImports(unittest.TestCase):
+    """
+    Tests that the factories only import the backends that are used.
+    """
+    _BACKEND_MODULES = ("novaclient", "glanceclient", "keystoneauth1", "neutronclient", "simpleopenstack.os_managers")
+
+    def _get_imported_backend_modules(self, code: str) -> str:
+        """
+        Gets the backend modules that are imported after running the given code in a new interpreter.
+        :param code: the code to run
+        :return: the names of the imported backend modules, separated by spaces
+        """
+        check = f"import sys; print(' '.join(m for m in {self._BACKEND_MODULES!r} if m in sys.modules))"
+        return subprocess.check_output([sys.executable, "-c", f"{code}\n{check}"]).decode().strip()
+
+    def test_import_does_not_import_backends(self):
+        self.assertEqual("", self._get_imported_backend_modules("import simpleopenstack.factories"))
+
+    def test_create_mock_manager_does_not_import_real_backend(self):
+        self.assertEqual("", self._get_imported_backend_modules(
+            "from simpleopenstack.factories import OpenstackManagerFactory\n"
+            "from simpleopenstack.os_mock_managers import MockOpenstackConnector, MockOpenstack\n"
+            "OpenstackManagerFactory(MockOpenstackConnector(MockOpenstack())).create_instance_manager()"))
+
+    def test_create_real_manager_imports_real_backend(self):
+        self.assertIn("simpleopenstack.os_managers", self._get_imported_backend_modules(
+            "from simpleopenstack.factories import OpenstackManagerFactory\n"
+            "from simpleopenstack.os_managers import RealOpenstackConnector\n"
+            "OpenstackManagerFactory(RealOpenstackConnector('http://localhost', 't', 'u', 'p'))"
+            ".create_instance_manager()"))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,304 @@
+import unittest
+from abc import ABCMeta
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event, Timer
+from typing import Dict, Any
+from unittest.mock import patch
+
+from simpleopenstack.factories import get_manager
+from simpleopenstack.fanout import FanOutOpenstackConnector, FanOutOpenstackKeypairManager, \
+    FanOutOpenstackInstanceManager, FanOutOpenstackImageManager, FanOutOpenstackFlavorManager, \
+    FanOutOpenstackNetworkManager, FanOutException, OriginatedItem
+from simpleopenstack.models import OpenstackImage, OpenstackInstance, OpenstackKeypair, OpenstackFlavor, \
+    OpenstackNetwork, ItemNotFoundException
+from simpleopenstack.os_mock_managers import MockOpenstack, MockOpenstackConnector
+from simpleopenstack.tests._test_managers import OpenstackKeypairManagerTest, OpenstackInstanceManagerTest, \
+    OpenstackImageManagerTest, OpenstackFlavorManagerTest, OpenstackNetworkManagerTest
+
+_TIMEOUT = 0.2
+
+
+class _FanOutOpenstackItemManagerTest(unittest.TestCase, metaclass=ABCMeta):
+    """
+    Tests for the fan-out managers, across two mock environments (creating items in the second).
+    """
+    def setUp(self):
+        self.openstack_connector = FanOutOpenstackConnector(
+            {"region-1": MockOpenstackConnector(MockOpenstack()), "region-2": MockOpenstackConnector(MockOpenstack())},
+            default_origin="region-2")
+        super().setUp()
+
+
+class FanOutOpenstackKeypairManagerTest(
+        _FanOutOpenstackItemManagerTest, OpenstackKeypairManagerTest[FanOutOpenstackKeypairManager]):
+    """
+    Tests for `FanOutOpenstackKeypairManager`.
+    """
+    def _create_manager(self) -> FanOutOpenstackKeypairManager:
+        return FanOutOpenstackKeypairManager(self.openstack_connector)
+
+
+class FanOutOpenstackInstanceManagerTest(
+        _FanOutOpenstackItemManagerTest, OpenstackInstanceManagerTest[FanOutOpenstackInstanceManager]):
+    """
+    Tests for `FanOutOpenstackInstanceManager`.
+    """
+    def _create_manager(self) -> FanOutOpenstackInstanceManager:
+        return FanOutOpenstackInstanceManager(self.openstack_connector)
+
+    def _get_server_assigned_properties(self, model: OpenstackInstance, created: OpenstackInstance) -> Dict[str, Any]:
+        properties = super()._get_server_assigned_properties(model, created)
+        # Instances are created in the mock environments
+        self.assertEqual(OpenstackInstance.ACTIVE, created.status)
+        properties["status"] = created.status
+        return properties
+
+
+class FanOutOpenstackImageManagerTest(
+        _FanOutOpenstackItemManagerTest, OpenstackImageManagerTest[FanOutOpenstackImageManager]):
+    """
+    Tests for `FanOutOpenstackImageManager`.
+    """
+    def _create_manager(self) -> FanOutOpenstackImageManager:
+        return FanOutOpenstackImageManager(self.openstack_connector)
+
+
+class FanOutOpenstackFlavorManagerTest(
+        _FanOutOpenstackItemManagerTest, OpenstackFlavorManagerTest[FanOutOpenstackFlavorManager]):
+    """
+    Tests for `FanOutOpenstackFlavorManager`.
+    """
+    def _create_manager(self) -> FanOutOpenstackFlavorManager:
+        return FanOutOpenstackFlavorManager(self.openstack_connector)
+
+
+class FanOutOpenstackNetworkManagerTest(
+        _FanOutOpenstackItemManagerTest, OpenstackNetworkManagerTest[FanOutOpenstackNetworkManager]):
+    """
+    Tests for `FanOutOpenstackNetworkManager`.
+    """
+    def _create_manager(self) -> FanOutOpenstackNetworkManager:
+        return FanOutOpenstackNetworkManager(self.openstack_connector)
+
+
+del OpenstackKeypairManagerTest, OpenstackInstanceManagerTest, OpenstackImageManagerTest, OpenstackFlavorManagerTest, \
+    OpenstackNetworkManagerTest, _FanOutOpenstackItemManagerTest
+
+
+class TestFanOutOpenstackItemManager(unittest.TestCase):
+    """
+    Tests for fanning operations out to many environments with `FanOutOpenstackItemManager`.
+    """
+    def setUp(self):
+        self.connectors = {origin: MockOpenstackConnector(MockOpenstack()) for origin in ("fast", "slow", "other")}
+        self.connector = FanOutOpenstackConnector(self.connectors, timeout=_TIMEOUT)
+        self.manager = FanOutOpenstackImageManager(self.connector)
+        self.images = {origin: [self.manager.create_in(origin, OpenstackImage(name=f"{origin}-{i}")) for i in range(3)]
+                       for origin in self.connectors.keys()}
+        self.release = Event()
+        self.finished = set()
+
+    def tearDown(self):
+        self.release.set()
+
+    def _make_slow(self, origin: str, method_name: str, fail: bool=False):
+        """
+        Makes the given method of the manager in the environment with the given origin block until the test releases
+        it (or finishes).
+        :param origin: the origin of the environment
+        :param method_name: the name of the method
+        :param fail: whether the method should raise an exception once released, rather than carry on
+        """
+        manager = get_manager(self.connectors[origin], OpenstackImage)
+        method = getattr(manager, method_name)
+
+        def slow_method(*args, **kwargs):
+            self.release.wait(10)
+            self.finished.add(origin)
+            if fail:
+                raise IOError(f"{origin} failed")
+            return method(*args, **kwargs)
+
+        setattr(manager, method_name, slow_method)
+
+    def test_iter_all_with_origins(self):
+        originated = list(self.manager.iter_all_with_origins())
+        self.assertCountEqual([OriginatedItem(origin, image) for origin, images in self.images.items()
+                               for image in images], originated)
+
+    def test_get_by_name_across_environments(self):
+        same_name = [self.manager.create_in(origin, OpenstackImage(name="same")) for origin in ("fast", "other")]
+        self.assertCountEqual(same_name, self.manager.get_by_name("same"))
+        self.assertCountEqual([OriginatedItem("fast", same_name[0]), OriginatedItem("other", same_name[1])],
+                              self.manager.iter_by_name_with_origins("same"))
+
+    def test_get_origin(self):
+        manager = FanOutOpenstackImageManager(self.connector)
+        image = self.images["other"][1]
+        self.assertIsNone(manager.get_origin(image))
+        self.assertEqual(image, manager.get_by_id(image.identifier))
+        self.assertEqual("other", manager.get_origin(image))
+        self.assertEqual("other", manager.get_origin(image.identifier))
+
+    def test_delete_when_origin_unknown(self):
+        manager = FanOutOpenstackImageManager(self.connector)
+        image = self.images["slow"][0]
+        manager.delete(item=image)
+        self.assertIsNone(get_manager(self.connectors["slow"], OpenstackImage).get_by_id(image.identifier))
+        self.assertEqual(8, len(manager.get_all()))
+
+    def test_delete_when_not_exists(self):
+        self.assertRaises(ItemNotFoundException, self.manager.delete, identifier="other")
+
+    def test_iter_all_streams_before_slow_environment_responds(self):
+        self._make_slow("slow", "iter_all")
+        iterator = self.manager.iter_all_with_origins()
+        first = next(iterator)
+        self.assertNotEqual("slow", first.origin)
+        iterator.close()
+
+    def test_iter_all_when_environment_times_out(self):
+        self._make_slow("slow", "iter_all")
+        originated = []
+        with self.assertRaises(FanOutException) as context:
+            for item in self.manager.iter_all_with_origins():
+                originated.append(item)
+        self.assertEqual({"slow"}, set(context.exception.errors.keys()))
+        self.assertIsInstance(context.exception.errors["slow"], TimeoutError)
+        self.assertCountEqual(self.images["fast"] + self.images["other"], [item.item for item in originated])
+
+    def test_iter_all_when_environment_fails(self):
+        self._make_slow("slow", "iter_all", fail=True)
+        self.release.set()
+        with self.assertRaises(FanOutException) as context:
+            list(self.manager.iter_all())
+        self.assertIsInstance(context.exception.errors["slow"], IOError)
+
+    def test_get_all_when_environment_times_out_and_not_raising(self):
+        self._make_slow("slow", "iter_all")
+        manager = FanOutOpenstackImageManager(FanOutOpenstackConnector(
+            self.connectors, timeout=_TIMEOUT, raise_on_failure=False))
+        with self.assertLogs("simpleopenstack", "WARNING"):
+            all_images = manager.get_all()
+        self.assertEqual(set(self.images["fast"] + self.images["other"]), all_images)
+
+    def test_get_all_with_longer_timeout_for_environment(self):
+        self._make_slow("slow", "iter_all")
+        manager = FanOutOpenstackImageManager(FanOutOpenstackConnector(
+            self.connectors, timeout=_TIMEOUT, timeouts={"slow": 10.0}))
+        release_timer = Timer(_TIMEOUT * 2, self.release.set)
+        release_timer.start()
+        try:
+            all_images = manager.get_all()
+        finally:
+            release_timer.cancel()
+        self.assertEqual({image for images in self.images.values() for image in images}, all_images)
+
+    def test_get_by_id_does_not_wait_for_slow_environment(self):
+        self._make_slow("slow", "get_by_id")
+        image = self.images["fast"][2]
+        manager = FanOutOpenstackImageManager(FanOutOpenstackConnector(self.connectors, timeout=10.0))
+        self.assertEqual(image, manager.get_by_id(image.identifier))
+        self.assertNotIn("slow", self.finished)
+
+    def test_origins_bounded(self):
+        manager = FanOutOpenstackImageManager(FanOutOpenstackConnector(self.connectors, max_origins=2))
+        images = [image for images in self.images.values() for image in images]
+        for image in images:
+            manager.get_by_id(image.identifier)
+        self.assertEqual([None] * (len(images) - 2) + ["other", "other"],
+                         [manager.get_origin(image) for image in images])
+
+    def test_origin_forgotten_when_deleted(self):
+        image = self.images["other"][0]
+        self.manager.delete(item=image)
+        self.assertIsNone(self.manager.get_origin(image))
+
+    def test_origin_forgotten_when_not_found(self):
+        image = self.images["other"][0]
+        get_manager(self.connectors["other"], OpenstackImage).delete(item=image)
+        self.assertIsNone(self.manager.get_by_id(image.identifier))
+        self.assertIsNone(self.manager.get_origin(image))
+
+    def test_executor_reused(self):
+        with patch("simpleopenstack.fanout.ThreadPoolExecutor", wraps=ThreadPoolExecutor) as executor_type:
+            manager = FanOutOpenstackImageManager(self.connector)
+            for _ in range(3):
+                manager.get_all()
+                manager.get_by_name("other-0")
+        self.assertEqual(len(self.connectors), executor_type.call_count)
+
+    def test_environment_not_responding_does_not_hold_up_others(self):
+        self._make_slow("slow", "get_by_name")
+        manager = FanOutOpenstackImageManager(FanOutOpenstackConnector(
+            self.connectors, timeout=_TIMEOUT, raise_on_failure=False, max_workers=2))
+        image = self.images["fast"][0]
+        for _ in range(4):
+            with self.assertLogs("simpleopenstack", "WARNING"):
+                self.assertEqual([image], manager.get_by_name(image.name))
+
+    def test_operation_not_started_when_environment_busy(self):
+        self._make_slow("slow", "get_by_name")
+        manager = FanOutOpenstackImageManager(FanOutOpenstackConnector(
+            self.connectors, timeout=_TIMEOUT, max_workers=1))
+        self.assertRaises(FanOutException, manager.get_by_name, "fast-0")
+        with self.assertRaises(FanOutException) as context:
+            manager.get_by_name("fast-0")
+        self.assertIn("did not start", str(context.exception.errors["slow"]))
+
+    def test_identifier_in_many_environments(self):
+        same = {origin: OpenstackImage(identifier="1", name=f"{origin}-same") for origin in ("fast", "other")}
+        for origin, image in same.items():
+            self.connectors[origin].mock_openstack.images.append(image)
+        self.manager.get_all()
+        self.assertIsNone(self.manager.get_origin("1"))
+        self.assertRaises(ValueError, self.manager.delete, identifier="1")
+        self.manager.delete_in("other", "1")
+        self.assertIsNone(get_manager(self.connectors["other"], OpenstackImage).get_by_id("1"))
+        self.assertEqual(same["fast"], get_manager(self.connectors["fast"], OpenstackImage).get_by_id("1"))
+        self.assertEqual("fast", self.manager.get_origin("1"))
+        self.manager.delete(identifier="1")
+        self.assertIsNone(get_manager(self.connectors["fast"], OpenstackImage).get_by_id("1"))
+
+    def test_delete_identifier_in_many_environments_when_origins_unknown(self):
+        for origin in ("fast", "other"):
+            self.connectors[origin].mock_openstack.images.append(OpenstackImage(identifier="1", name="same"))
+        manager = FanOutOpenstackImageManager(self.connector)
+        self.assertRaises(ValueError, manager.delete, identifier="1")
+
+    def test_iter_changed_since_when_not_supported(self):
+        self.assertIsNone(self.manager.iter_changed_since(datetime.now(timezone.utc)))
+
+
+class TestFanOutOpenstackInstanceManager(unittest.TestCase):
+    """
+    Tests for `FanOutOpenstackInstanceManager` specifically.
+    """
+    def setUp(self):
+        self.connectors = {origin: MockOpenstackConnector(MockOpenstack()) for origin in ("region-1", "region-2")}
+        self.connector = FanOutOpenstackConnector(self.connectors, default_origin="region-2")
+        self.manager = FanOutOpenstackInstanceManager(self.connector)
+        for origin, connector in self.connectors.items():
+            get_manager(connector, OpenstackImage).create(OpenstackImage(name="image"))
+            get_manager(connector, OpenstackFlavor).create(OpenstackFlavor(name="flavor"))
+            get_manager(connector, OpenstackKeypair).create(OpenstackKeypair(name="key", public_key=None))
+            get_manager(connector, OpenstackNetwork).create(OpenstackNetwork(name="network"))
+
+    def _create_model(self, name: str) -> OpenstackInstance:
+        return OpenstackInstance(name=name, image="image", flavor="flavor", key_name="key", networks=["network"])
+
+    def test_create_in_default_origin(self):
+        instance = self.manager.create(self._create_model("instance"))
+        self.assertEqual("region-2", self.manager.get_origin(instance))
+        self.assertEqual(instance, get_manager(self.connectors["region-2"], OpenstackInstance).get_by_id(
+            instance.identifier))
+
+    def test_create_many_in_default_origin(self):
+        instances = self.manager.create_many([self._create_model(f"instance-{i}") for i in range(3)])
+        self.assertEqual({"region-2"}, {self.manager.get_origin(instance) for instance in instances})
+
+    def test_wait_for_across_environments(self):
+        instances = [self.manager.create_in(origin, self._create_model(origin)) for origin in self.connectors.keys()]
+        active = list(FanOutOpenstackInstanceManager(self.connector).wait_for(instances, timeout=5, min_interval=0.01))
+        self.assertCountEqual(instances, active)
@@ -0,0 +1,195 @@
+import logging
+import unittest
+from typing import List
+from unittest.mock import patch
+
+from simpleopenstack import instrumentation
+from simpleopenstack.caching import CachingOpenstackItemManager
+from simpleopenstack.instrumentation import Instrumentation, InstrumentationEvent, RecordingInstrument, \
+    LoggingInstrument, CounterRegistry, TracingInstrument
+from simpleopenstack.models import OpenstackImage
+from simpleopenstack.os_mock_managers import MockOpenstack, MockOpenstackConnector, MockOpenstackImageManager
+
+
+class _StubSpan:
+    def __init__(self, name: str, start_time: int, attributes: dict):
+        self.name = name
+        self.start_time = start_time
+        self.attributes = attributes
+        self.end_time = None
+        self.exceptions = []
+
+    def record_exception(self, exception: Exception):
+        self.exceptions.append(exception)
+
+    def end(self, end_time: int=None):
+        self.end_time = end_time
+
+
+class _StubTracer:
+    def __init__(self):
+        self.spans: List[_StubSpan] = []
+
+    def start_span(self, name: str, start_time: int=None, attributes: dict=None) -> _StubSpan:
+        span = _StubSpan(name, start_time, attributes)
+        self.spans.append(span)
+        return span
+
+
+def _create_event(operation: str="get_by_id", **kwargs) -> InstrumentationEvent:
+    return InstrumentationEvent(operation, OpenstackImage, "glance", 1500000000.0, 0.25, **kwargs)
+
+
+class TestInstrumentation(unittest.TestCase):
+    """
+    Tests for `Instrumentation`.
+    """
+    def setUp(self):
+        self.instrument = RecordingInstrument()
+        self.instrumentation = Instrumentation([self.instrument])
+
+    def test_call(self):
+        result = self.instrumentation.call("get_by_name", OpenstackImage, "glance", lambda: [1, 2], len)
+        self.assertEqual([1, 2], result)
+        event = self.instrument.events[0]
+        self.assertEqual(("get_by_name", OpenstackImage, "glance", 2),
+                         (event.operation, event.item_type, event.backend, event.items))
+        self.assertGreaterEqual(event.duration, 0.0)
+        self.assertIsNone(event.error)
+
+    def test_call_with_error(self):
+        def fail():
+            raise KeyError()
+
+        self.assertRaises(KeyError, self.instrumentation.call, "delete", OpenstackImage, "glance", fail)
+        self.assertIsInstance(self.instrument.events[0].error, KeyError)
+        self.assertIsNone(self.instrument.events[0].items)
+
+    def test_call_when_disabled(self):
+        self.instrumentation.remove(self.instrument)
+        self.assertFalse(self.instrumentation.enabled)
+        self.assertEqual(1, self.instrumentation.call("create", OpenstackImage, "glance", lambda: 1))
+        self.assertEqual([], self.instrument.events)
+
+    def test_remove_when_not_added(self):
+        self.assertRaises(ValueError, self.instrumentation.remove, RecordingInstrument())
+
+
+class TestLoggingInstrument(unittest.TestCase):
+    """
+    Tests for `LoggingInstrument`.
+    """
+    def setUp(self):
+        self.instrument = LoggingInstrument(logging.getLogger(__name__))
+
+    def test_log(self):
+        with self.assertLogs(__name__, logging.DEBUG) as logs:
+            self.instrument.on_event(_create_event(items=2, cache_hit=False))
+        self.assertEqual(
+            [f"DEBUG:{__name__}:glance get_by_id OpenstackImage took 250.000ms (2 items, cache miss)"], logs.output)
+
+    def test_log_error(self):
+        with self.assertLogs(__name__, logging.WARNING) as logs:
+            self.instrument.on_event(_create_event(error=KeyError("image")))
+        self.assertIn("failed: KeyError('image')", logs.output[0])
+
+
+class TestCounterRegistry(unittest.TestCase):
+    """
+    Tests for `CounterRegistry`.
+    """
+    def setUp(self):
+        self.registry = CounterRegistry()
+        self.registry.on_event(_create_event(items=1, cache_hit=True))
+        self.registry.on_event(_create_event(items=0))
+        self.registry.on_event(_create_event("create", error=ValueError()))
+
+    def test_get(self):
+        self.assertEqual(3, self.registry.get(CounterRegistry.CALLS))
+        self.assertEqual(2, self.registry.get(CounterRegistry.CALLS, operation="get_by_id"))
+        self.assertEqual(1, self.registry.get(CounterRegistry.CALLS, operation="get_by_id", cache="hit"))
+        self.assertEqual(1, self.registry.get(CounterRegistry.ERRORS, backend="glance"))
+        self.assertEqual(1, self.registry.get(CounterRegistry.ITEMS))
+        self.assertEqual(0.75, self.registry.get(CounterRegistry.DURATION))
+        self.assertEqual(0, self.registry.get(CounterRegistry.CALLS, backend="nova"))
+
+    def test_to_prometheus_text(self):
+        text = self.registry.to_prometheus_text()
+        self.assertIn("# TYPE simpleopenstack_calls_total counter\n", text)
+        self.assertIn("simpleopenstack_calls_total{operation=\"get_by_id\",item_type=\"OpenstackImage\","
+                      "backend=\"glance\",cache=\"hit\"} 1.0\n", text)
+
+    def test_clear(self):
+        self.registry.clear()
+        self.assertEqual("", self.registry.to_prometheus_text())
+
+
+class TestTracingInstrument(unittest.TestCase):
+    """
+    Tests for `TracingInstrument`.
+    """
+    def setUp(self):
+        self.tracer = _StubTracer()
+        self.instrument = TracingInstrument(self.tracer)
+
+    def test_span(self):
+        self.instrument.on_event(_create_event(items=3))
+        span = self.tracer.spans[0]
+        self.assertEqual("openstack.glance.get_by_id", span.name)
+        self.assertEqual(1500000000 * 10 ** 9, span.start_time)
+        self.assertEqual(span.start_time + 250000000, span.end_time)
+        self.assertEqual({"openstack.operation": "get_by_id", "openstack.backend": "glance",
+                          "openstack.item_type": "OpenstackImage", "openstack.items": 3}, span.attributes)
+
+    def test_span_with_error(self):
+        error = ValueError()
+        self.instrument.on_event(_create_event(error=error))
+        self.assertEqual([error], self.tracer.spans[0].exceptions)
+
+
+class TestManagerInstrumentation(unittest.TestCase):
+    """
+    Tests for the instrumentation events emitted by managers.
+    """
+    def setUp(self):
+        self.manager = MockOpenstackImageManager(MockOpenstackConnector(MockOpenstack()))
+        self.instrument = RecordingInstrument()
+        self.manager.instrumentation = Instrumentation([self.instrument])
+
+    def test_mock_manager(self):
+        image = self.manager.create(OpenstackImage(name="image"))
+        self.manager.get_by_id(image.identifier)
+        self.manager.get_by_name("other")
+        self.manager.delete_many([image.identifier, "other"])
+        self.assertEqual([("create", 1), ("get_by_id", 1), ("get_by_name", 0), ("delete_many", 1)],
+                         [(event.operation, event.items) for event in self.instrument.events])
+        self.assertEqual({"mock"}, {event.backend for event in self.instrument.events})
+
+    def test_caching_manager(self):
+        image = self.manager.create(OpenstackImage(name="image"))
+        caching_manager = CachingOpenstackItemManager(self.manager)
+        caching_manager.instrumentation = self.manager.instrumentation
+        self.instrument.events.clear()
+        caching_manager.get_by_id(image.identifier)
+        caching_manager.get_by_id(image.identifier)
+        self.assertEqual([("mock", "get_by_id", None), ("cache", "get_by_id", False), ("cache", "get_by_id", True)],
+                         [(event.backend, event.operation, event.cache_hit) for event in self.instrument.events])
+
+
+class TestDisabledInstrumentation(unittest.TestCase):
+    """
+    Tests that the instrumentation hooks do no work when there are no instruments (their overhead is timed by the
+    "MockOpenstackImageManager.get_by_id (uninstrumented)" micro-benchmark in `simpleopenstack.benchmarks`).
+    """
+    def test_not_timed(self):
+        manager = MockOpenstackImageManager(MockOpenstackConnector(MockOpenstack()))
+        manager.instrumentation = Instrumentation()
+        with patch.object(instrumentation, "perf_counter") as perf_counter, patch.object(instrumentation, "time") \
+                as time, patch.object(Instrumentation, "emit") as emit:
+            for _ in range(10):
+                manager.get_by_id("image")
+        self.assertEqual((0, 0, 0), (perf_counter.call_count, time.call_count, emit.call_count))
+
+
+if __name__ == "__main__":
+    unittest.main()
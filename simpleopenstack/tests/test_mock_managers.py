@@ -1,9 +1,16 @@
+import pickle
 import unittest
 from abc import ABCMeta
+from concurrent.futures import ThreadPoolExecutor
+from copy import deepcopy
+from threading import Barrier
+from typing import Dict, Any
+from unittest.mock import patch
 
+from simpleopenstack.models import OpenstackImage, OpenstackKeypair, OpenstackInstance, InstanceStateException
 from simpleopenstack.os_mock_managers import MockOpenstackKeypairManager, MockOpenstackInstanceManager, \
     MockOpenstackImageManager, MockOpenstack, MockOpenstackConnector, MockOpenstackFlavorManager, \
-    MockOpenstackNetworkManager
+    MockOpenstackNetworkManager, MockOpenstackItemCollection
 from simpleopenstack.tests._test_managers import OpenstackKeypairManagerTest, OpenstackInstanceManagerTest, \
     OpenstackImageManagerTest, OpenstackFlavorManagerTest, OpenstackNetworkManagerTest
 
@@ -35,6 +42,12 @@ class MockOpenstackInstanceManagerTest(
     def _create_manager(self) -> MockOpenstackInstanceManager:
         return MockOpenstackInstanceManager(self.openstack_connector)
 
+    def _get_server_assigned_properties(self, model: OpenstackInstance, created: OpenstackInstance) -> Dict[str, Any]:
+        properties = super()._get_server_assigned_properties(model, created)
+        self.assertEqual(OpenstackInstance.ACTIVE, created.status)
+        properties["status"] = created.status
+        return properties
+
 
 class MockOpenstackImageManagerTest(
         _MockOpenstackItemManagerTest, OpenstackImageManagerTest[MockOpenstackImageManager]):
@@ -64,6 +77,228 @@ class MockOpenstackNetworkManagerTest(
         return MockOpenstackNetworkManager(self.openstack_connector)
 
 
+class TestMockOpenstackInstanceManagerWaitFor(unittest.TestCase):
+    """
+    Tests for waiting for instances with `MockOpenstackInstanceManager`.
+    """
+    def setUp(self):
+        self.mock_openstack = MockOpenstack()
+        self.manager = MockOpenstackInstanceManager(MockOpenstackConnector(self.mock_openstack))
+        self.instance = OpenstackInstance(identifier="instance", name="instance", status=OpenstackInstance.BUILD)
+        self.mock_openstack.instances.append(self.instance)
+
+    def test_backs_off_whilst_unchanged(self):
+        intervals = []
+
+        def sleep(interval: float):
+            intervals.append(interval)
+            if len(intervals) == 6:
+                self.instance.status = OpenstackInstance.ACTIVE
+
+        with patch("simpleopenstack.managers.sleep", sleep):
+            active = list(self.manager.wait_for(["instance"], min_interval=1.0, max_interval=3.0))
+        self.assertEqual([self.instance], active)
+        self.assertEqual([1.0, 1.5, 2.25, 3.0, 3.0, 3.0], intervals)
+
+    def test_resets_interval_on_change(self):
+        intervals = []
+        statuses = iter(["SPAWNING", "SPAWNING", OpenstackInstance.ACTIVE])
+
+        def sleep(interval: float):
+            intervals.append(interval)
+            self.instance.status = next(statuses)
+
+        with patch("simpleopenstack.managers.sleep", sleep):
+            list(self.manager.wait_for(["instance"], min_interval=1.0, max_interval=3.0))
+        self.assertEqual([1.0, 1.0, 1.5], intervals)
+
+    def test_error(self):
+        self.instance.status = OpenstackInstance.ERROR
+        with self.assertRaises(InstanceStateException) as context:
+            list(self.manager.wait_for(["instance"]))
+        self.assertEqual(OpenstackInstance.ACTIVE, context.exception.expected_status)
+
+
+class TestMockOpenstackItemCollection(unittest.TestCase):
+    """
+    Tests for `MockOpenstackItemCollection`.
+    """
+    def setUp(self):
+        self.images = [OpenstackImage(identifier=f"image-{i}", name=f"image-{i % 2}") for i in range(4)]
+        self.collection = MockOpenstackItemCollection(self.images)
+
+    def test_list_view(self):
+        self.assertEqual(self.images, list(self.collection))
+        self.assertEqual(self.images, self.collection)
+        self.assertEqual(len(self.images), len(self.collection))
+        self.assertEqual(self.images[1], self.collection[1])
+        self.assertIn(self.images[2], self.collection)
+
+    def test_get(self):
+        self.assertEqual(self.images[1], self.collection.get("image-1"))
+        self.assertIsNone(self.collection.get("other"))
+
+    def test_get_by_name(self):
+        self.assertEqual([self.images[1], self.images[3]], self.collection.get_by_name("image-1"))
+        self.assertEqual([], self.collection.get_by_name("other"))
+
+    def test_append_without_identifier(self):
+        self.assertRaises(ValueError, self.collection.append, OpenstackImage(name="image"))
+
+    def test_append_with_duplicate_identifier(self):
+        self.assertRaises(ValueError, self.collection.append, OpenstackImage(identifier="image-1", name="other"))
+
+    def test_remove(self):
+        self.collection.remove(self.images[1])
+        self.assertEqual([self.images[0], self.images[2], self.images[3]], self.collection)
+        self.assertIsNone(self.collection.get("image-1"))
+        self.assertEqual([self.images[3]], self.collection.get_by_name("image-1"))
+
+    def test_remove_when_not_in_collection(self):
+        self.assertRaises(ValueError, self.collection.remove, OpenstackImage(identifier="other", name="other"))
+
+    def test_remove_by_identifier(self):
+        self.assertEqual(self.images[0], self.collection.remove_by_identifier("image-0"))
+        self.assertRaises(ValueError, self.collection.remove_by_identifier, "image-0")
+
+    def test_rename(self):
+        self.images[1].name = "renamed"
+        self.assertEqual([self.images[1]], self.collection.get_by_name("renamed"))
+        self.assertEqual([self.images[3]], self.collection.get_by_name("image-1"))
+        self.assertEqual(self.images[1], self.collection.remove_by_identifier("image-1"))
+        self.assertEqual([], self.collection.get_by_name("renamed"))
+
+    def test_remove_after_rename(self):
+        self.images[1].name = "renamed"
+        self.collection.remove(self.images[1])
+        self.assertEqual([self.images[3]], self.collection.get_by_name("image-1"))
+
+    def test_rename_to_name_in_use(self):
+        self.images[0].name = "image-1"
+        self.assertEqual([self.images[0], self.images[1], self.images[3]], self.collection.get_by_name("image-1"))
+        self.assertEqual([self.images[2]], self.collection.get_by_name("image-0"))
+
+    def test_rename_seen_when_iterated(self):
+        self.images[0].name = "renamed"
+        list(self.collection)
+        self.assertEqual([self.images[0]], self.collection.get_by_name("renamed"))
+
+    def test_copy(self):
+        for copied in (deepcopy(self.collection), pickle.loads(pickle.dumps(self.collection))):
+            self.assertEqual(self.images, copied)
+            copied[1].name = "renamed"
+            self.assertEqual([copied[1]], copied.get_by_name("renamed"))
+            self.assertEqual([], self.collection.get_by_name("renamed"))
+            copied.remove_by_identifier("image-0")
+            self.assertEqual(self.images[0], self.collection.get("image-0"))
+
+    def test_modify_during_iteration(self):
+        for image in self.collection:
+            self.collection.remove(image)
+        self.assertEqual(0, len(self.collection))
+        self.assertEqual([], self.collection.get_by_name("image-0"))
+
+
+class TestMockOpenstack(unittest.TestCase):
+    """
+    Tests for `MockOpenstack`.
+    """
+    def setUp(self):
+        self.mock_openstack = MockOpenstack()
+        self.mock_openstack.images.append(OpenstackImage(identifier="image", name="image"))
+        self.mock_openstack.instances.append(OpenstackInstance(identifier="instance", name="instance", image="image"))
+
+    def test_copy(self):
+        for copied in (deepcopy(self.mock_openstack), pickle.loads(pickle.dumps(self.mock_openstack))):
+            self.assertEqual(self.mock_openstack, copied)
+            manager = MockOpenstackInstanceManager(MockOpenstackConnector(copied))
+            manager.delete(identifier="instance")
+            self.assertEqual(set(), manager.get_all())
+            self.assertEqual(1, len(self.mock_openstack.instances))
+
+    def test_copy_connector(self):
+        connector = MockOpenstackConnector(self.mock_openstack)
+        manager = MockOpenstackImageManager(connector)
+        copied = deepcopy(connector)
+        self.assertEqual(connector, copied)
+        self.assertIsNot(self.mock_openstack, copied.mock_openstack)
+        self.assertEqual(manager.get_all(), MockOpenstackImageManager(copied).get_all())
+
+
+class TestMockOpenstackConcurrency(unittest.TestCase):
+    """
+    Tests for using the mock OpenStack environment from many threads at the same time.
+    """
+    _NUMBER_OF_THREADS = 16
+    _OPERATIONS_PER_THREAD = 500
+
+    def setUp(self):
+        self.mock_openstack = MockOpenstack()
+        self.connector = MockOpenstackConnector(self.mock_openstack)
+        self.barrier = Barrier(TestMockOpenstackConcurrency._NUMBER_OF_THREADS)
+
+    def _run_in_threads(self, function) -> list:
+        def run(thread: int):
+            self.barrier.wait()
+            return function(thread)
+
+        with ThreadPoolExecutor(max_workers=TestMockOpenstackConcurrency._NUMBER_OF_THREADS) as executor:
+            return list(executor.map(run, range(TestMockOpenstackConcurrency._NUMBER_OF_THREADS)))
+
+    def test_create_keypairs_with_same_name(self):
+        manager = MockOpenstackKeypairManager(self.connector)
+
+        def create(thread: int) -> bool:
+            created = 0
+            for _ in range(TestMockOpenstackConcurrency._OPERATIONS_PER_THREAD):
+                try:
+                    manager.create(OpenstackKeypair(name="key"))
+                    created += 1
+                except ValueError:
+                    pass
+            return created
+
+        self.assertEqual(1, sum(self._run_in_threads(create)))
+        self.assertEqual(1, len(self.mock_openstack.keypairs))
+
+    def test_create_and_delete(self):
+        manager = MockOpenstackImageManager(self.connector)
+
+        def create_and_delete(thread: int) -> int:
+            images = [manager.create(OpenstackImage(name=f"image-{thread}"))
+                      for _ in range(TestMockOpenstackConcurrency._OPERATIONS_PER_THREAD)]
+            for image in images[::2]:
+                manager.delete(item=image)
+            return len(manager.get_by_name(f"image-{thread}"))
+
+        remaining = self._run_in_threads(create_and_delete)
+        self.assertEqual([TestMockOpenstackConcurrency._OPERATIONS_PER_THREAD // 2] * len(remaining), remaining)
+        self.assertEqual(sum(remaining), len(self.mock_openstack.images))
+        self.assertEqual(sum(remaining), len(manager.get_all()))
+
+
+class TestMockOpenstackItemCollectionLookups(unittest.TestCase):
+    """
+    Tests that creating, looking up and deleting mock items does not scan the items (which is timed by the
+    "MockOpenstackItemCollection" micro-benchmarks in `simpleopenstack.benchmarks`).
+    """
+    _NUMBER_OF_ITEMS = 100
+
+    def test_create_lookup_delete(self):
+        manager = MockOpenstackImageManager(MockOpenstackConnector(MockOpenstack()))
+        with patch.object(MockOpenstackItemCollection, "__iter__") as iterate, \
+                patch.object(MockOpenstackItemCollection, "__getitem__") as get_item:
+            images = [manager.create(OpenstackImage(name=f"image-{i}"))
+                      for i in range(TestMockOpenstackItemCollectionLookups._NUMBER_OF_ITEMS)]
+            for image in images:
+                self.assertIs(image, manager.get_by_id(image.identifier))
+                self.assertEqual([image], manager.get_by_name(image.name))
+            for image in images:
+                manager.delete(item=image)
+        self.assertEqual((0, 0), (iterate.call_count, get_item.call_count))
+        self.assertEqual(0, len(manager._get_item_collection()))
+
+
 # TODO: unittest is really stupid and will try to run the below as a test... Probably can add some ignore rules
 del OpenstackKeypairManagerTest, OpenstackInstanceManagerTest, OpenstackImageManagerTest, OpenstackFlavorManagerTest, \
     OpenstackNetworkManagerTest, _MockOpenstackItemManagerTest
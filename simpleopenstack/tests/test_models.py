@@ -0,0 +1,204 @@
+import unittest
+from copy import copy
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from simpleopenstack import models
+from simpleopenstack.models import Model, OpenstackImage, OpenstackInstance, OpenstackKeypair
+from simpleopenstack.os_managers import NovaOpenstackKeypairManager, RealOpenstackConnector
+from simpleopenstack.os_mock_managers import MockOpenstack, MockOpenstackConnector, MockOpenstackImageManager
+
+_EXAMPLE_PUBLIC_KEY = "ssh-rsa AAAAB3NzaC1yc2EAAAABIwAAAQEAqmEmDTNBC6O8HGCdu0MZ9zLCivDsYSttrrmlq87/YsEBpvwUTiF3UEQuF" \
+                      "Laq5Gm+dtgxJewg/UwsZrDFxzpQhCHB6VmqrbKN2hEIkk/HJvCnAmR1ehXv8n2BWw3Jlw7Z+VgWwXAH50f2HWYqTaE4qP4" \
+                      "Dxc4RlElxgNmlDPGXw/dYBvChYBG/RvIiTz1L+pYzPD4JR54IMmTOwjcGIJl7nk1VjKvl3D8Wgp6qejv4MfZ7Htdc99SUKc" \
+                      "KWAeHYsjPXosSk3GlwKiS/sZi51Yca394GE7T4hZu6HTaXeZoD8+IZ7AijYn89H7EPjuu0iCAa/cjVzBsFHGszQYG+U5KfI" \
+                      "w== user@host"
+_EXAMPLE_FINGERPRINT = "49:d3:cb:f6:00:d2:93:43:a6:27:07:ca:12:fd:5d:98"
+
+
+def _legacy_hash(model: Model) -> int:
+    """
+    Hash as implemented before hashing and equality were optimised.
+    """
+    return hash(str(model))
+
+
+class TestModel(unittest.TestCase):
+    """
+    Tests for `Model`.
+    """
+    def setUp(self):
+        self.instance = OpenstackInstance(name="instance", image="image", networks=["network"])
+
+    def test_equal_when_same_properties(self):
+        self.assertEqual(self.instance, copy(self.instance))
+
+    def test_not_equal_when_different_properties(self):
+        other = copy(self.instance)
+        other.image = "other"
+        self.assertNotEqual(self.instance, other)
+
+    def test_not_equal_when_different_identifiers(self):
+        other = copy(self.instance)
+        other.identifier = "other"
+        self.assertNotEqual(self.instance, other)
+
+    def test_not_equal_to_other_type(self):
+        self.assertNotEqual(OpenstackImage(name="instance"), self.instance)
+
+    def test_hash_when_equal_without_identifier(self):
+        self.assertEqual(hash(self.instance), hash(copy(self.instance)))
+
+    def test_hash_when_equal_with_identifier(self):
+        self.instance.identifier = "identifier"
+        self.assertEqual(hash(self.instance), hash(copy(self.instance)))
+
+    def test_hash_changes_when_property_set(self):
+        before = hash(self.instance)
+        self.instance.name = "other"
+        self.assertEqual(_legacy_hash(self.instance), hash(self.instance))
+        self.assertNotEqual(before, hash(self.instance))
+
+    def test_cached_hash_not_a_property(self):
+        hash(self.instance)
+        self.assertNotIn("_structural_hash", self.instance._get_properties())
+        self.assertNotIn("_structural_hash", str(self.instance))
+
+    def test_from_properties(self):
+        created = OpenstackInstance._from_properties(name="instance", image="image", networks=["network"])
+        self.assertEqual(self.instance, created)
+        self.assertEqual(str(self.instance), str(created))
+
+    def test_from_properties_with_unknown_property(self):
+        self.assertRaises(TypeError, OpenstackInstance._from_properties, other="value")
+
+    def test_set_undeclared_attribute(self):
+        other = copy(self.instance)
+        self.instance.other = "value"
+        self.assertEqual("value", self.instance._get_properties()["other"])
+        self.assertNotEqual(hash(other), hash(self.instance))
+        other.other = "value"
+        self.assertEqual(other, self.instance)
+
+    def test_hash_changes_when_property_changed_in_place(self):
+        before = hash(self.instance)
+        self.instance.networks.append("other")
+        self.assertEqual(_legacy_hash(self.instance), hash(self.instance))
+        self.assertNotEqual(before, hash(self.instance))
+
+    def test_hash_cached_when_properties_immutable(self):
+        image = OpenstackImage(name="image", protected=False)
+        hash(image)
+        with patch.object(Model, "_to_string") as to_string:
+            hash(image)
+        to_string.assert_not_called()
+
+    def test_set_membership_after_modification(self):
+        items = {self.instance}
+        self.instance.identifier = "identifier"
+        self.assertIn(copy(self.instance), set(list(items)))
+
+
+class TestOpenstackKeypair(unittest.TestCase):
+    """
+    Tests for `OpenstackKeypair`.
+    """
+    def setUp(self):
+        OpenstackKeypair._generate_fingerprint.cache_clear()
+
+    def test_fingerprint_generated_from_public_key(self):
+        keypair = OpenstackKeypair(name="key", public_key=_EXAMPLE_PUBLIC_KEY)
+        self.assertEqual(_EXAMPLE_FINGERPRINT, keypair.fingerprint)
+
+    def test_fingerprint_generated_when_read(self):
+        with patch.object(models, "SSHKey", wraps=models.SSHKey) as ssh_key:
+            keypair = OpenstackKeypair(name="key", public_key=_EXAMPLE_PUBLIC_KEY)
+            self.assertEqual(0, ssh_key.call_count)
+            self.assertEqual(_EXAMPLE_FINGERPRINT, keypair.fingerprint)
+            self.assertEqual(_EXAMPLE_FINGERPRINT, keypair.fingerprint)
+            self.assertEqual(1, ssh_key.call_count)
+
+    def test_fingerprint_generation_memoised(self):
+        with patch.object(models, "SSHKey", wraps=models.SSHKey) as ssh_key:
+            for _ in range(10):
+                self.assertEqual(_EXAMPLE_FINGERPRINT, OpenstackKeypair(public_key=_EXAMPLE_PUBLIC_KEY).fingerprint)
+            self.assertEqual(1, ssh_key.call_count)
+
+    def test_fingerprint_ending_with_prefix_character(self):
+        with patch.object(models, "SSHKey") as ssh_key:
+            ssh_key.return_value.hash_md5.return_value = "MD5:d5:4d:00:00:00:00:00:00:00:00:00:00:00:00:00:55"
+            self.assertEqual("d5:4d:00:00:00:00:00:00:00:00:00:00:00:00:00:55",
+                             OpenstackKeypair(public_key="ssh-rsa other").fingerprint)
+
+    def test_no_fingerprint_without_public_key(self):
+        keypair = OpenstackKeypair(public_key=_EXAMPLE_PUBLIC_KEY)
+        keypair.public_key = None
+        self.assertIsNone(keypair.fingerprint)
+
+    def test_set_matching_fingerprint(self):
+        keypair = OpenstackKeypair(fingerprint=_EXAMPLE_FINGERPRINT, public_key=_EXAMPLE_PUBLIC_KEY)
+        self.assertEqual(_EXAMPLE_FINGERPRINT, keypair.fingerprint)
+
+    def test_set_mismatching_fingerprint(self):
+        keypair = OpenstackKeypair(public_key=_EXAMPLE_PUBLIC_KEY)
+        self.assertRaises(ValueError, setattr, keypair, "fingerprint", "00:00")
+
+    def test_equal_when_fingerprint_not_yet_generated(self):
+        keypair = OpenstackKeypair(name="key", public_key=_EXAMPLE_PUBLIC_KEY)
+        other = OpenstackKeypair(name="key", public_key=_EXAMPLE_PUBLIC_KEY)
+        other.fingerprint = _EXAMPLE_FINGERPRINT
+        self.assertEqual(keypair, other)
+        self.assertEqual(hash(keypair), hash(other))
+
+    def test_from_properties_trusts_fingerprint(self):
+        with patch.object(models, "SSHKey") as ssh_key:
+            keypair = OpenstackKeypair._from_properties(
+                name="key", public_key=_EXAMPLE_PUBLIC_KEY, fingerprint=_EXAMPLE_FINGERPRINT)
+            self.assertEqual(_EXAMPLE_FINGERPRINT, keypair.fingerprint)
+            ssh_key.assert_not_called()
+
+
+class TestModelEfficiency(unittest.TestCase):
+    """
+    Tests that models avoid the work that made handling large numbers of them slow (which is timed by the
+    micro-benchmarks in `simpleopenstack.benchmarks`).
+    """
+    _NUMBER_OF_ITEMS = 100
+
+    def test_get_all_hashes_by_identity(self):
+        mock_openstack = MockOpenstack()
+        for i in range(TestModelEfficiency._NUMBER_OF_ITEMS):
+            mock_openstack.images.append(OpenstackImage(identifier=f"image-{i}", name=f"image-{i}", protected=False))
+        manager = MockOpenstackImageManager(MockOpenstackConnector(mock_openstack))
+        with patch.object(Model, "__str__", autospec=True, side_effect=Model.__str__) as to_string:
+            items = manager.get_all()
+        self.assertEqual(TestModelEfficiency._NUMBER_OF_ITEMS, len(items))
+        self.assertEqual(0, to_string.call_count)
+
+    def test_slotted(self):
+        instance = OpenstackInstance._from_properties(identifier="instance", name="instance")
+        self.assertEqual({}, vars(instance))
+
+    def test_from_properties_skips_constructor(self):
+        properties = dict(name="instance", image="image", flavor="flavor", key_name="key", networks=["network"])
+        with patch.object(OpenstackInstance, "__init__", autospec=True, return_value=None) as constructor:
+            instances = [OpenstackInstance._from_properties(identifier=i, **properties)
+                         for i in range(TestModelEfficiency._NUMBER_OF_ITEMS)]
+        self.assertEqual(0, constructor.call_count)
+        self.assertEqual(OpenstackInstance(identifier=1, **properties), instances[1])
+
+    def test_keypair_conversion(self):
+        manager = NovaOpenstackKeypairManager(RealOpenstackConnector(
+            auth_url="http://localhost:5000/v2.0", tenant="tenant", username="user", password="password"))
+        raw_keypairs = [SimpleNamespace(id=f"key-{i}", name=f"key-{i}", public_key=_EXAMPLE_PUBLIC_KEY,
+                                        fingerprint=_EXAMPLE_FINGERPRINT)
+                        for i in range(TestModelEfficiency._NUMBER_OF_ITEMS)]
+        with patch.object(models, "SSHKey", wraps=models.SSHKey) as ssh_key:
+            converted = [manager._convert_raw(raw) for raw in raw_keypairs]
+        self.assertEqual([OpenstackKeypair(identifier=raw.id, name=raw.name, public_key=raw.public_key)
+                          for raw in raw_keypairs], converted)
+        self.assertEqual(0, ssh_key.call_count)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,585 @@
+import unittest
+from abc import ABCMeta
+from datetime import datetime, timezone
+from itertools import count
+from threading import Barrier
+from types import SimpleNamespace
+from typing import List, Tuple, Callable, Any, Dict
+from unittest.mock import MagicMock, patch
+
+from keystoneauth1.exceptions import Unauthorized
+from neutronclient.common.exceptions import InternalServerError
+from novaclient.exceptions import ClientException
+
+from simpleopenstack.concurrency import run_concurrently
+from simpleopenstack.instrumentation import RecordingInstrument, default_instrumentation, Instrumentation
+from simpleopenstack.managers import ResolvedInstanceReferences
+from simpleopenstack.models import OpenstackInstance, OpenstackImage, OpenstackFlavor, OpenstackNetwork, \
+    OpenstackKeypair, InstanceStateException
+from simpleopenstack.os_fake_server import FakeOpenstackServer
+from simpleopenstack.os_managers import RealOpenstackConnector, NovaOpenstackInstanceManager, \
+    GlanceOpenstackImageManager, NeutronOpenstackNetworkManager, NovaOpenstackKeypairManager, session_pool, \
+    NovaOpenstackFlavorManager, _OpenstackSessionPool
+from simpleopenstack.tests._test_managers import OpenstackKeypairManagerTest, OpenstackInstanceManagerTest, \
+    OpenstackImageManagerTest, OpenstackNetworkManagerTest
+
+
+class TestOpenstackSessionPool(unittest.TestCase):
+    """
+    Tests for the pool of authenticated sessions used by the real managers.
+    """
+    def setUp(self):
+        self.connector = RealOpenstackConnector(
+            auth_url="http://localhost:5000/v2.0", tenant="tenant", username="user", password="password")
+
+    def tearDown(self):
+        session_pool.clear()
+
+    def test_managers_share_session(self):
+        managers = [manager_type(self.connector) for manager_type in (
+            NovaOpenstackInstanceManager, NovaOpenstackKeypairManager, GlanceOpenstackImageManager,
+            NeutronOpenstackNetworkManager)]
+        sessions = {id(manager._session) for manager in managers}
+        self.assertEqual(1, len(sessions))
+
+    def test_equivalent_connectors_share_session(self):
+        other_connector = RealOpenstackConnector(
+            auth_url=self.connector.auth_url, tenant=self.connector.tenant, username=self.connector.username,
+            password=self.connector.password)
+        self.assertIs(session_pool.get(self.connector), session_pool.get(other_connector))
+
+    def test_different_connectors_do_not_share_session(self):
+        other_connector = RealOpenstackConnector(
+            auth_url=self.connector.auth_url, tenant="other", username=self.connector.username,
+            password=self.connector.password)
+        self.assertIsNot(session_pool.get(self.connector), session_pool.get(other_connector))
+
+    def test_sessions_time_out(self):
+        self.assertEqual(_OpenstackSessionPool.REQUEST_TIMEOUT, session_pool.get(self.connector).timeout)
+
+    def test_passwords_not_in_keys(self):
+        session_pool.get(self.connector)
+        self.assertNotIn(self.connector.password, "".join(session_pool._sessions.keys()))
+
+    def test_least_recently_used_sessions_dropped(self):
+        pool = _OpenstackSessionPool(max_size=2)
+        connectors = [RealOpenstackConnector(
+            auth_url=self.connector.auth_url, tenant=f"tenant-{i}", username=self.connector.username,
+            password=self.connector.password) for i in range(3)]
+        sessions = [pool.get(connector) for connector in connectors[:2]]
+        pool.get(connectors[0])
+        pool.get(connectors[2])
+        self.assertIs(sessions[0], pool.get(connectors[0]))
+        self.assertIsNot(sessions[1], pool.get(connectors[1]))
+        self.assertEqual(2, len(pool._sessions))
+
+    def test_clients_use_shared_session(self):
+        nova_manager = NovaOpenstackInstanceManager(self.connector)
+        glance_manager = GlanceOpenstackImageManager(self.connector)
+        self.assertIs(nova_manager._client.client.session, glance_manager._client.http_client.session)
+
+
+class TestNovaOpenstackInstanceManager(unittest.TestCase):
+    """
+    Tests for `NovaOpenstackInstanceManager`.
+    """
+    def setUp(self):
+        self.manager = NovaOpenstackInstanceManager(RealOpenstackConnector(
+            auth_url="http://localhost:5000/v2.0", tenant="tenant", username="user", password="password"))
+        self.manager._cached_client = MagicMock()
+
+    def test_create_uses_resolved_references(self):
+        model = OpenstackInstance(name="instance", image="image", flavor="flavor", key_name="key",
+                                  networks=["network-1", "network-2"])
+        references = ResolvedInstanceReferences(
+            image="image-id", flavor="flavor-id", key_name="key", networks=["network-1-id", "network-2-id"])
+        self.manager._convert_raw = lambda raw: raw
+        self.manager._create(model, references)
+        self.manager._cached_client.servers.create.assert_called_once_with(
+            name="instance", image="image-id", flavor="flavor-id", key_name="key",
+            nics=[{"net-id": "network-1-id"}, {"net-id": "network-2-id"}])
+        self.manager._cached_client.servers.get.assert_not_called()
+        self.manager._cached_client.servers.findall.assert_not_called()
+
+    def test_iter_all_pages(self):
+        servers = [SimpleNamespace(id=f"server-{i}") for i in range(5)]
+
+        def list_servers(search_opts, marker, limit):
+            start = 0 if marker is None else int(marker.split("-")[1]) + 1
+            return servers[start:start + limit]
+
+        self.manager._cached_client.servers.list.side_effect = list_servers
+        self.manager._convert_raw = lambda raw: raw
+        self.assertEqual(servers, list(self.manager.iter_all(page_size=2, filters={"status": "ACTIVE"})))
+        self.assertEqual([None, "server-1", "server-3", "server-4"], [
+            call[1]["marker"] for call in self.manager._cached_client.servers.list.call_args_list])
+
+    def test_delete_many_force_deletes_stuck_servers(self):
+        stuck = {"server-2", "server-4"}
+        failed = ClientException(500, "Unexpected error")
+
+        def delete(identifier):
+            if identifier in stuck:
+                raise ClientException(409, "nova.exception.InstanceInvalidState")
+            if identifier == "server-3":
+                raise failed
+
+        self.manager._cached_client.servers.delete.side_effect = delete
+        outcomes = self.manager.delete_many([f"server-{i}" for i in range(5)])
+
+        self.assertEqual({"server-0": None, "server-1": None, "server-2": None, "server-3": failed, "server-4": None},
+                         outcomes)
+        force_deleted = {call[0][0] for call in self.manager._cached_client.servers.force_delete.call_args_list}
+        self.assertEqual(stuck, force_deleted)
+        self.assertEqual(len(stuck), self.manager._cached_client.servers.reset_state.call_count)
+
+
+class TestGlanceOpenstackImageManager(unittest.TestCase):
+    """
+    Tests (and benchmark) for `GlanceOpenstackImageManager` against a local fake OpenStack server.
+    """
+    _NUMBER_OF_IMAGES = 2000
+
+    def setUp(self):
+        self.server = FakeOpenstackServer().start()
+        created_at = datetime(2017, 5, 1, 10, tzinfo=timezone.utc)
+        for i in range(TestGlanceOpenstackImageManager._NUMBER_OF_IMAGES):
+            self.server.mock_openstack.images.append(OpenstackImage._from_properties(
+                identifier=f"image-{i}", name=f"image-{i % 1000}", created_at=created_at, updated_at=created_at,
+                protected=False))
+            if i >= 1000:
+                self.server.extra_properties[f"image-{i}"] = {"visibility": "public"}
+        self.manager = GlanceOpenstackImageManager(self.server.connector)
+
+    def tearDown(self):
+        session_pool.clear()
+        self.server.stop()
+
+    def _get_image_list_requests(self) -> List[Tuple[str, str]]:
+        return [request for request in self.server.requests if request == ("GET", "/image/v2/images")]
+
+    def test_get_by_name(self):
+        images = self.manager.get_by_name("image-5")
+        self.assertCountEqual(["image-5", "image-1005"], [image.identifier for image in images])
+
+    def test_get_all_with_filters(self):
+        images = self.manager.iter_all(filters={"name": "image-5", "visibility": "public"})
+        self.assertEqual(["image-1005"], [image.identifier for image in images])
+
+    def test_get_all_with_unsupported_filter(self):
+        self.assertRaises(ValueError, list, self.manager.iter_all(filters={"other": "value"}))
+
+    def test_iter_all_pages(self):
+        self.manager.get_by_id("image-0")
+        self.server.requests.clear()
+        iterator = self.manager.iter_all(page_size=50)
+        next(iterator)
+        first_page_requests = len(self.server.requests)
+        self.assertEqual(TestGlanceOpenstackImageManager._NUMBER_OF_IMAGES, 1 + len(list(iterator)))
+        self.assertLess(first_page_requests, 3)
+        self.assertEqual(TestGlanceOpenstackImageManager._NUMBER_OF_IMAGES / 50,
+                         len(self._get_image_list_requests()))
+
+    def test_get_by_name_requests(self):
+        self.manager.get_all()
+        self.server.requests.clear()
+        listed = [image for image in self.manager._client.images.list() if image.name == "image-5"]
+        listing_requests = len(self._get_image_list_requests())
+
+        self.server.requests.clear()
+        filtered = list(self.manager._get_by_name_raw("image-5"))
+        filtering_requests = len(self._get_image_list_requests())
+
+        self.assertEqual(len(listed), len(filtered))
+        self.assertEqual(1, filtering_requests)
+        self.assertLess(filtering_requests, listing_requests)
+
+
+class TestNovaOpenstackFlavorManager(unittest.TestCase):
+    """
+    Tests for `NovaOpenstackFlavorManager` against a local fake OpenStack server (flavours cannot be created through
+    the manager so the shared manager tests do not apply).
+    """
+    def setUp(self):
+        self.server = FakeOpenstackServer().start()
+        self.flavors = [OpenstackFlavor(identifier=f"flavor-{i}", name=f"flavor-{i % 2}") for i in range(5)]
+        self.server.mock_openstack.flavors.extend(self.flavors)
+        self.manager = NovaOpenstackFlavorManager(self.server.connector)
+
+    def tearDown(self):
+        session_pool.clear()
+        self.server.stop()
+
+    def test_get_by_id(self):
+        self.assertEqual(self.flavors[1], self.manager.get_by_id("flavor-1"))
+        self.assertIsNone(self.manager.get_by_id("other"))
+
+    def test_get_by_name(self):
+        self.assertCountEqual([self.flavors[1], self.flavors[3]], self.manager.get_by_name("flavor-1"))
+
+    def test_iter_all(self):
+        self.assertEqual(self.flavors, list(self.manager.iter_all(page_size=2)))
+
+    def test_iter_all_when_pages_limited_by_server(self):
+        self.server.max_limit = 2
+        self.assertEqual(self.flavors, list(self.manager.iter_all(page_size=3)))
+        self.assertEqual(set(self.flavors), self.manager.get_all())
+
+    def test_create(self):
+        self.assertRaises(NotImplementedError, self.manager.create, OpenstackFlavor(name="flavor"))
+
+
+class TestNovaOpenstackInstanceManagerWaitFor(unittest.TestCase):
+    """
+    Tests for waiting for instances with `NovaOpenstackInstanceManager`, against a local fake OpenStack server with
+    servers that take time to build.
+    """
+    def setUp(self):
+        self.server = FakeOpenstackServer(build_duration=0.3).start()
+        self.server.mock_openstack.flavors.append(OpenstackFlavor(identifier="flavor-id", name="flavor"))
+        self.server.mock_openstack.images.append(OpenstackImage(identifier="image-id", name="image"))
+        self.server.mock_openstack.networks.append(OpenstackNetwork(identifier="network-id", name="network"))
+        self.server.mock_openstack.keypairs.append(OpenstackKeypair._from_properties(
+            identifier="key", name="key", public_key="ssh-rsa key", fingerprint="00:00"))
+        self.manager = NovaOpenstackInstanceManager(self.server.connector)
+        self.instances = self.manager.create_many([OpenstackInstance(
+            name=f"instance-{i}", image="image", flavor="flavor", key_name="key", networks=["network"])
+            for i in range(5)])
+        self.server.requests.clear()
+
+    def tearDown(self):
+        session_pool.clear()
+        self.server.stop()
+
+    def test_wait_for_active(self):
+        self.assertEqual({OpenstackInstance.BUILD}, {instance.status for instance in self.instances})
+        active = list(self.manager.wait_for(self.instances, timeout=10, min_interval=0.02, max_interval=0.1))
+        polls = len(self.server.requests)
+        self.assertCountEqual([instance.identifier for instance in self.instances],
+                              [instance.identifier for instance in active])
+        self.assertEqual({OpenstackInstance.ACTIVE}, {instance.status for instance in active})
+        self.assertEqual({("GET", "/compute/v2.1/servers/detail")}, set(self.server.requests))
+        self.assertLess(polls, 20)
+
+    def test_wait_for_when_error(self):
+        instance = self.server.mock_openstack.instances.get(self.instances[0].identifier)
+        instance.status = OpenstackInstance.ERROR
+        self.assertRaises(InstanceStateException, list, self.manager.wait_for(self.instances, timeout=10))
+
+    def test_wait_for_deleted(self):
+        self.manager.delete_many(self.instances)
+        deleted = list(self.manager.wait_for(self.instances, OpenstackInstance.DELETED, timeout=10))
+        self.assertEqual({OpenstackInstance.DELETED}, {instance.status for instance in deleted})
+        self.assertEqual(len(self.instances), len(deleted))
+
+    def test_wait_for_timeout(self):
+        self.server.build_duration = 10
+        instance = self.manager.create(
+            OpenstackInstance(name="slow", image="image", flavor="flavor", key_name="key", networks=[]))
+        self.assertRaises(TimeoutError, list, self.manager.wait_for([instance], timeout=0.1, min_interval=0.02))
+
+
+class TestFakeOpenstackServer(unittest.TestCase):
+    """
+    Tests for the fault injection of `FakeOpenstackServer` (and benchmark of the real managers against it).
+    """
+    def setUp(self):
+        self.server = FakeOpenstackServer()
+        self.server.start()
+        self.server.mock_openstack.networks.append(OpenstackNetwork(identifier="network-id", name="network"))
+        self.manager = NeutronOpenstackNetworkManager(self.server.connector)
+
+    def tearDown(self):
+        session_pool.clear()
+        self.server.stop()
+
+    def test_authentication_failure(self):
+        connector = RealOpenstackConnector(
+            auth_url=self.server.auth_url, tenant=self.server.tenant, username=self.server.username, password="other")
+        self.assertRaises(Unauthorized, NeutronOpenstackNetworkManager(connector).get_all)
+
+    def test_latency(self):
+        self.manager.get_all()
+        self.server.latency = 0.05
+        with patch("simpleopenstack.os_fake_server.sleep") as sleep:
+            self.manager.get_by_id("network-id")
+        sleep.assert_called_once_with(0.05)
+
+    def test_error_injection(self):
+        self.manager.get_all()
+        self.server.error_rate = 1.0
+        self.assertRaises(InternalServerError, self.manager.get_by_id, "network-id")
+
+    def test_error_injection_rate(self):
+        self.server.error_rate = 0.5
+        failures = 0
+        # Made one at a time, as concurrent lookups are coalesced and so share their outcomes
+        for _ in range(100):
+            try:
+                self.manager.get_by_id("network-id")
+            except InternalServerError:
+                failures += 1
+        self.assertTrue(20 < failures < 80)
+
+    def test_instance_creation_round_trips(self):
+        self.server.mock_openstack.flavors.append(OpenstackFlavor(identifier="flavor-id", name="flavor"))
+        self.server.mock_openstack.images.append(OpenstackImage(identifier="image-id", name="image"))
+        self.server.mock_openstack.keypairs.append(OpenstackKeypair._from_properties(
+            identifier="key", name="key", public_key="ssh-rsa key", fingerprint="00:00"))
+        manager = NovaOpenstackInstanceManager(self.server.connector)
+        manager.get_all()
+        self.server.requests.clear()
+        instance = manager.create(OpenstackInstance(name="instance", image="image", flavor="flavor", key_name="key",
+                                                    networks=["network"]))
+        self.assertEqual("image-id", instance.image)
+        self.assertEqual(["network"], instance.networks)
+        self.assertEqual(1, self.server.requests.count(("POST", "/compute/v2.1/servers")))
+
+    def test_concurrent_requests_share_session(self):
+        self.manager.get_all()
+        self.server.requests.clear()
+        number_of_requests = 64
+        outcomes = run_concurrently(
+            lambda _: NeutronOpenstackNetworkManager(self.server.connector).get_by_id("network-id"),
+            range(number_of_requests))
+        self.assertNotIn(True, [isinstance(outcome, Exception) for outcome in outcomes])
+        self.assertEqual(0, self.server.requests.count(("POST", "/identity/v2.0/tokens")))
+        self.assertEqual(number_of_requests, len(self.server.requests))
+
+
+class TestRealManagerInstrumentation(unittest.TestCase):
+    """
+    Tests for the instrumentation events emitted by the real managers, against a local fake OpenStack server.
+    """
+    def setUp(self):
+        self.server = FakeOpenstackServer().start()
+        self.server.mock_openstack.networks.extend(
+            [OpenstackNetwork(identifier=f"network-{i}", name=f"network-{i}") for i in range(5)])
+        self.manager = NeutronOpenstackNetworkManager(self.server.connector)
+        self.instrument = RecordingInstrument()
+        default_instrumentation.add(self.instrument)
+
+    def tearDown(self):
+        default_instrumentation.remove(self.instrument)
+        session_pool.clear()
+        self.server.stop()
+
+    def _get_events(self) -> List[Tuple[str, str, int]]:
+        return [(event.backend, event.operation, event.items) for event in self.instrument.events]
+
+    def test_get_by_id(self):
+        self.manager.get_by_id("network-1")
+        self.assertEqual([("keystone", "authenticate", 1), ("neutron", "get_by_id", 1), ("neutron", "convert", 1)],
+                         self._get_events())
+        self.assertIsNone(self.instrument.events[0].item_type)
+        self.assertEqual(OpenstackNetwork, self.instrument.events[1].item_type)
+
+    def test_authentication_reported_to_manager_instrumentation(self):
+        for use in (lambda manager: manager.get_by_id("network-1"), lambda manager: list(manager.iter_all())):
+            session_pool.clear()
+            manager = NeutronOpenstackNetworkManager(self.server.connector)
+            manager.instrumentation = Instrumentation()
+            instrument = RecordingInstrument()
+            manager.instrumentation.add(instrument)
+            use(manager)
+            event = instrument.events[0]
+            self.assertEqual(("keystone", "authenticate"), (event.backend, event.operation))
+            self.assertEqual([], self.instrument.events)
+
+    def test_get_by_name(self):
+        self.manager.get_by_name("other")
+        self.assertEqual([("neutron", "get_by_name", 0), ("neutron", "convert", 0)], self._get_events()[1:])
+
+    def test_iter_all(self):
+        networks = self.manager.iter_all(page_size=2)
+        next(networks)
+        self.assertEqual(1, len(self.instrument.events))
+        self.assertEqual(4, len(list(networks)))
+        self.assertEqual([("neutron", "list", 5), ("neutron", "convert", 5)], self._get_events()[1:])
+
+    def test_create_and_delete(self):
+        network = self.manager.create(OpenstackNetwork(name="network"))
+        self.manager.delete(item=network)
+        self.assertEqual([("neutron", "create", 1), ("neutron", "convert", 1), ("neutron", "delete", 1)],
+                         self._get_events()[1:])
+
+    def test_error(self):
+        self.manager.get_all()
+        self.server.error_rate = 1.0
+        self.assertRaises(InternalServerError, self.manager.get_by_id, "network-1")
+        self.assertIsInstance(self.instrument.events[-1].error, InternalServerError)
+        self.assertEqual("get_by_id", self.instrument.events[-1].operation)
+
+
+class TestRealManagerClient(unittest.TestCase):
+    """
+    Tests for the clients used by the real managers.
+    """
+    def tearDown(self):
+        session_pool.clear()
+
+    def test_created_once_when_shared(self):
+        manager = NeutronOpenstackNetworkManager(RealOpenstackConnector(
+            auth_url="http://localhost:1/v2.0", tenant="tenant", username="username", password="password"))
+        barrier = Barrier(16)
+
+        def get_client(_) -> Any:
+            barrier.wait()
+            return manager._client
+
+        with patch("simpleopenstack.os_managers.NeutronClient") as client_type:
+            clients = run_concurrently(get_client, range(16), 16)
+        self.assertEqual(1, client_type.call_count)
+        self.assertEqual({id(client_type.return_value)}, {id(client) for client in clients})
+
+
+class TestRealManagerSingleFlight(unittest.TestCase):
+    """
+    Tests for the coalescing of concurrent identical lookups by the real managers, against a local fake OpenStack
+    server that adds latency to each request.
+    """
+    _LATENCY = 0.1
+    _CONCURRENCY = 10
+
+    def setUp(self):
+        self.server = FakeOpenstackServer().start()
+        self.server.mock_openstack.networks.extend(
+            [OpenstackNetwork(identifier=f"network-{i}", name=f"network-{i}") for i in range(5)])
+        self.manager = NeutronOpenstackNetworkManager(self.server.connector)
+        self.manager.get_all()
+        self.server.latency = TestRealManagerSingleFlight._LATENCY
+        self.server.requests.clear()
+
+    def tearDown(self):
+        session_pool.clear()
+        self.server.stop()
+
+    def _lookup_concurrently(self, lookup: Callable[[], Any]) -> List[Any]:
+        """
+        Carries out the given lookup in many threads at once.
+        :param lookup: the lookup
+        :return: the result of each lookup
+        """
+        barrier = Barrier(TestRealManagerSingleFlight._CONCURRENCY)
+
+        def synchronised_lookup(_) -> Any:
+            barrier.wait()
+            return lookup()
+
+        return run_concurrently(synchronised_lookup, range(TestRealManagerSingleFlight._CONCURRENCY),
+                                TestRealManagerSingleFlight._CONCURRENCY)
+
+    def test_get_by_id(self):
+        results = self._lookup_concurrently(lambda: self.manager.get_by_id("network-1"))
+        self.assertEqual([OpenstackNetwork(identifier="network-1", name="network-1")] * len(results), results)
+        self.assertEqual(1, len(self.server.requests))
+        # Each caller is given its own model
+        self.assertEqual(len(results), len({id(result) for result in results}))
+
+    def test_get_by_name(self):
+        results = self._lookup_concurrently(lambda: self.manager.get_by_name("network-2"))
+        self.assertEqual([[OpenstackNetwork(identifier="network-2", name="network-2")]] * len(results), results)
+        self.assertEqual(1, len(self.server.requests))
+
+    def test_get_all(self):
+        results = self._lookup_concurrently(self.manager.get_all)
+        self.assertEqual(5, len(results[0]))
+        self.assertEqual([results[0]] * len(results), results)
+        self.assertEqual(1, len(self.server.requests))
+
+    def test_different_lookups_not_coalesced(self):
+        counter = count()
+        run_concurrently(lambda _: self.manager.get_by_id(f"network-{next(counter)}"), range(5), 5)
+        self.assertEqual(5, len(self.server.requests))
+
+    def test_separate_managers_not_coalesced(self):
+        self._lookup_concurrently(
+            lambda: NeutronOpenstackNetworkManager(self.server.connector).get_by_name("network-3"))
+        self.assertEqual(TestRealManagerSingleFlight._CONCURRENCY, len(self.server.requests))
+
+
+class _FakeOpenstackItemManagerTest(unittest.TestCase, metaclass=ABCMeta):
+    """
+    Tests for the real managers against a local fake OpenStack server.
+    """
+    _EXAMPLE_FLAVOR = OpenstackInstanceManagerTest._EXAMPLE_FLAVOR
+
+    def setUp(self):
+        self.server = FakeOpenstackServer().start()
+        # Flavours cannot be created through Nova
+        self.server.mock_openstack.flavors.append(OpenstackFlavor(
+            identifier="example-flavor", name=self._EXAMPLE_FLAVOR))
+        self.openstack_connector = self.server.connector
+        super().setUp()
+
+    def tearDown(self):
+        super().tearDown()
+        session_pool.clear()
+        self.server.stop()
+
+
+class NovaOpenstackKeypairManagerTest(
+        _FakeOpenstackItemManagerTest, OpenstackKeypairManagerTest[NovaOpenstackKeypairManager]):
+    """
+    Tests for `NovaOpenstackKeypairManager`.
+    """
+    def _create_manager(self) -> NovaOpenstackKeypairManager:
+        return NovaOpenstackKeypairManager(self.openstack_connector)
+
+
+class NovaOpenstackInstanceManagerTest(
+        _FakeOpenstackItemManagerTest, OpenstackInstanceManagerTest[NovaOpenstackInstanceManager]):
+    """
+    Tests for `NovaOpenstackInstanceManager`.
+    """
+    def _create_manager(self) -> NovaOpenstackInstanceManager:
+        return NovaOpenstackInstanceManager(self.openstack_connector)
+
+    def _get_server_assigned_properties(self, model: OpenstackInstance, created: OpenstackInstance) -> Dict[str, Any]:
+        properties = super()._get_server_assigned_properties(model, created)
+        # Nova gives the identifiers of the image and flavour that it resolved the instance's references to
+        mock_openstack = self.server.mock_openstack
+        self.assertEqual([image.identifier for image in mock_openstack.images.get_by_name(model.image)],
+                         [created.image])
+        self.assertEqual([flavor.identifier for flavor in mock_openstack.flavors.get_by_name(model.flavor)],
+                         [created.flavor])
+        self.assertEqual(OpenstackInstance.ACTIVE, created.status)
+        self.assertIsInstance(created.created_at, datetime)
+        self.assertIsInstance(created.updated_at, datetime)
+        properties.update(image=created.image, flavor=created.flavor, status=created.status,
+                          created_at=created.created_at, updated_at=created.updated_at)
+        return properties
+
+
+class GlanceOpenstackImageManagerTest(
+        _FakeOpenstackItemManagerTest, OpenstackImageManagerTest[GlanceOpenstackImageManager]):
+    """
+    Tests for `GlanceOpenstackImageManager`.
+    """
+    def _create_manager(self) -> GlanceOpenstackImageManager:
+        return GlanceOpenstackImageManager(self.openstack_connector)
+
+    def _get_server_assigned_properties(self, model: OpenstackImage, created: OpenstackImage) -> Dict[str, Any]:
+        properties = super()._get_server_assigned_properties(model, created)
+        self.assertFalse(created.protected)
+        self.assertIsInstance(created.created_at, datetime)
+        self.assertIsInstance(created.updated_at, datetime)
+        properties.update(protected=created.protected, created_at=created.created_at, updated_at=created.updated_at)
+        return properties
+
+
+class NeutronOpenstackNetworkManagerTest(
+        _FakeOpenstackItemManagerTest, OpenstackNetworkManagerTest[NeutronOpenstackNetworkManager]):
+    """
+    Tests for `NeutronOpenstackNetworkManager`.
+    """
+    def _create_manager(self) -> NeutronOpenstackNetworkManager:
+        return NeutronOpenstackNetworkManager(self.openstack_connector)
+
+
+del OpenstackKeypairManagerTest, OpenstackInstanceManagerTest, OpenstackImageManagerTest, \
+    OpenstackNetworkManagerTest, _FakeOpenstackItemManagerTest
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,170 @@
+import unittest
+from datetime import datetime, timezone, timedelta
+from typing import List, Tuple
+
+from simpleopenstack.instrumentation import Instrumentation, RecordingInstrument
+from simpleopenstack.models import OpenstackImage, OpenstackInstance, OpenstackNetwork
+from simpleopenstack.os_fake_server import FakeOpenstackServer
+from simpleopenstack.os_managers import NovaOpenstackInstanceManager, GlanceOpenstackImageManager, \
+    NeutronOpenstackNetworkManager, session_pool
+from simpleopenstack.os_mock_managers import MockOpenstack, MockOpenstackConnector, MockOpenstackImageManager
+from simpleopenstack.sync import InventorySync, ItemChange, ADDED, UPDATED, DELETED
+
+_AN_HOUR_AGO = datetime.now(timezone.utc).replace(microsecond=0) - timedelta(hours=1)
+
+
+def _summarise(changes: List[ItemChange]) -> List[Tuple[str, str]]:
+    return sorted((change.change, change.item.identifier) for change in changes)
+
+
+class TestInventorySync(unittest.TestCase):
+    """
+    Tests for `InventorySync` with a manager that cannot list only the items that have changed.
+    """
+    def setUp(self):
+        self.mock_openstack = MockOpenstack()
+        self.mock_openstack.images.extend(
+            [OpenstackImage(identifier=f"image-{i}", name=f"image-{i}") for i in range(3)])
+        self.sync = InventorySync(MockOpenstackImageManager(MockOpenstackConnector(self.mock_openstack)))
+
+    def test_first_sync(self):
+        changes = self.sync.sync()
+        self.assertEqual([(ADDED, "image-0"), (ADDED, "image-1"), (ADDED, "image-2")], _summarise(changes))
+        self.assertEqual(set(self.mock_openstack.images), set(self.sync.snapshot.values()))
+
+    def test_sync_without_changes(self):
+        self.sync.sync()
+        self.assertEqual([], self.sync.sync())
+
+    def test_sync_with_changes(self):
+        self.sync.sync()
+        previous = self.mock_openstack.images.remove_by_identifier("image-1")
+        self.mock_openstack.images.append(OpenstackImage(identifier="image-1", name="renamed"))
+        self.mock_openstack.images.remove_by_identifier("image-2")
+        self.mock_openstack.images.append(OpenstackImage(identifier="image-3", name="image-3"))
+        changes = self.sync.sync()
+        self.assertEqual([(ADDED, "image-3"), (DELETED, "image-2"), (UPDATED, "image-1")], _summarise(changes))
+        updated = [change for change in changes if change.change == UPDATED][0]
+        self.assertEqual((previous, "renamed"), (updated.previous, updated.item.name))
+        self.assertEqual({"image-0", "image-1", "image-3"}, set(self.sync.snapshot.keys()))
+
+
+class _FakeOpenstackSyncTest(unittest.TestCase):
+    """
+    Base class for tests of `InventorySync` against a local fake OpenStack server.
+    """
+    def setUp(self):
+        self.server = FakeOpenstackServer().start()
+        self.instrument = RecordingInstrument()
+
+    def tearDown(self):
+        session_pool.clear()
+        self.server.stop()
+
+    def _get_items_listed(self) -> List[int]:
+        return [event.items for event in self.instrument.events if event.operation == "list"]
+
+
+class TestNovaInventorySync(_FakeOpenstackSyncTest):
+    """
+    Tests for `InventorySync` of Nova instances, which reports deleted servers as changes.
+    """
+    def setUp(self):
+        super().setUp()
+        self.server.mock_openstack.instances.extend([OpenstackInstance._from_properties(
+            identifier=f"instance-{i}", name=f"instance-{i}", created_at=_AN_HOUR_AGO, updated_at=_AN_HOUR_AGO,
+            image="image", flavor="flavor", networks=[], status=OpenstackInstance.ACTIVE) for i in range(50)])
+        self.manager = NovaOpenstackInstanceManager(self.server.connector)
+        self.manager.instrumentation = Instrumentation([self.instrument])
+        self.sync = InventorySync(self.manager)
+
+    def test_incremental_sync(self):
+        self.assertEqual(50, len(self.sync.sync()))
+        instance = self.server.mock_openstack.instances.get("instance-1")
+        instance.status = OpenstackInstance.ERROR
+        instance.updated_at = datetime.now(timezone.utc)
+        self.manager.delete(identifier="instance-2")
+        changes = self.sync.sync()
+        self.assertEqual([(DELETED, "instance-2"), (UPDATED, "instance-1")], _summarise(changes))
+        self.assertEqual(OpenstackInstance.ERROR, self.sync.snapshot["instance-1"].status)
+        self.assertEqual(49, len(self.sync.snapshot))
+        self.assertEqual([50, 2], self._get_items_listed())
+
+    def test_full_sync(self):
+        self.sync.sync()
+        self.manager.delete(identifier="instance-2")
+        self.assertEqual([(DELETED, "instance-2")], _summarise(self.sync.sync(full=True)))
+        self.assertEqual([50, 49], self._get_items_listed())
+
+
+class TestNovaInventorySyncItemsListed(_FakeOpenstackSyncTest):
+    """
+    Tests that incrementally synchronising many Nova instances only lists the changed ones (the synchronisations are
+    timed by the "InventorySync" benchmarks in `simpleopenstack.benchmarks`).
+    """
+    _NUMBER_OF_INSTANCES = 500
+
+    def test_sync(self):
+        self.server.mock_openstack.instances.extend([OpenstackInstance._from_properties(
+            identifier=f"instance-{i}", name=f"instance-{i}", created_at=_AN_HOUR_AGO, updated_at=_AN_HOUR_AGO,
+            image="image", flavor="flavor", networks=[], status=OpenstackInstance.ACTIVE)
+            for i in range(TestNovaInventorySyncItemsListed._NUMBER_OF_INSTANCES)])
+        manager = NovaOpenstackInstanceManager(self.server.connector)
+        manager.instrumentation = Instrumentation([self.instrument])
+        sync = InventorySync(manager)
+        sync.sync()
+        sync.sync(full=True)
+        self.server.mock_openstack.instances.get("instance-1").updated_at = datetime.now(timezone.utc)
+        changes = sync.sync()
+        self.assertEqual(1, len(changes))
+        self.assertEqual([TestNovaInventorySyncItemsListed._NUMBER_OF_INSTANCES] * 2 + [1], self._get_items_listed())
+
+
+class TestGlanceInventorySync(_FakeOpenstackSyncTest):
+    """
+    Tests for `InventorySync` of Glance images, which does not report deleted images as changes.
+    """
+    def setUp(self):
+        super().setUp()
+        self.server.mock_openstack.images.extend([OpenstackImage._from_properties(
+            identifier=f"image-{i}", name=f"image-{i}", created_at=_AN_HOUR_AGO, updated_at=_AN_HOUR_AGO,
+            protected=False) for i in range(50)])
+        self.manager = GlanceOpenstackImageManager(self.server.connector)
+        self.manager.instrumentation = Instrumentation([self.instrument])
+        self.sync = InventorySync(self.manager, full_sync_interval=1)
+
+    def test_incremental_sync(self):
+        self.sync.sync()
+        image = self.server.mock_openstack.images.get("image-1")
+        image.protected = True
+        image.updated_at = datetime.now(timezone.utc)
+        created = self.manager.create(OpenstackImage(name="new"))
+        self.assertEqual([(ADDED, created.identifier), (UPDATED, "image-1")], _summarise(self.sync.sync()))
+        self.assertEqual([50, 2], self._get_items_listed())
+
+    def test_deletions_found_by_full_sync(self):
+        self.sync.sync()
+        self.manager.delete(identifier="image-1")
+        self.assertEqual([], self.sync.sync())
+        self.assertEqual([(DELETED, "image-1")], _summarise(self.sync.sync()))
+        self.assertEqual([50, 0, 49], self._get_items_listed())
+
+
+class TestNeutronInventorySync(_FakeOpenstackSyncTest):
+    """
+    Tests for `InventorySync` of Neutron networks.
+    """
+    def setUp(self):
+        super().setUp()
+        self.manager = NeutronOpenstackNetworkManager(self.server.connector)
+        self.sync = InventorySync(self.manager, clock_skew=0.0)
+
+    def test_incremental_sync(self):
+        self.server.mock_openstack.networks.append(OpenstackNetwork(identifier="network", name="network"))
+        self.sync.sync()
+        created = self.manager.create(OpenstackNetwork(name="new"))
+        self.assertEqual([(ADDED, created.identifier)], _summarise(self.sync.sync()))
+
+
+if __name__ == "__main__":
+    unittest.main()
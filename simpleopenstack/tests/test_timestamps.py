@@ -0,0 +1,71 @@
+import unittest
+from datetime import datetime, timezone, timedelta
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from dateutil.parser import parse as parse_datetime
+
+from simpleopenstack import os_managers, timestamps
+from simpleopenstack.os_managers import NovaOpenstackInstanceManager, RealOpenstackConnector
+from simpleopenstack.timestamps import parse_timestamp
+
+
+class TestParseTimestamp(unittest.TestCase):
+    """
+    Tests for `parse_timestamp`.
+    """
+    def test_none(self):
+        self.assertIsNone(parse_timestamp(None))
+
+    def test_utc(self):
+        self.assertEqual(datetime(2017, 5, 1, 10, 20, 30, tzinfo=timezone.utc), parse_timestamp("2017-05-01T10:20:30Z"))
+
+    def test_without_timezone(self):
+        self.assertEqual(datetime(2017, 5, 1, 10, 20, 30), parse_timestamp("2017-05-01T10:20:30"))
+
+    def test_with_offset(self):
+        self.assertEqual(datetime(2017, 5, 1, 10, 20, 30, tzinfo=timezone(timedelta(hours=-5, minutes=-30))),
+                         parse_timestamp("2017-05-01T10:20:30-05:30"))
+
+    def test_with_fraction(self):
+        self.assertEqual(datetime(2017, 5, 1, 10, 20, 30, 120000), parse_timestamp("2017-05-01T10:20:30.12"))
+
+    def test_same_as_dateutil(self):
+        for timestamp in ("2017-05-01T10:20:30Z", "2017-05-01T10:20:30.000000", "2017-05-01 10:20:30+00:00",
+                          "2017-05-01T10:20:30.123456+01:00", "2017-05-01T10:20:30+0130"):
+            self.assertEqual(parse_datetime(timestamp), parse_timestamp(timestamp), timestamp)
+
+    def test_falls_back_to_dateutil(self):
+        self.assertEqual(datetime(2017, 5, 1, 10, 20, 30), parse_timestamp("1 May 2017 10:20:30"))
+
+    def test_invalid(self):
+        self.assertRaises(ValueError, parse_timestamp, "not a timestamp")
+
+
+class TestServerTimestampConversion(unittest.TestCase):
+    """
+    Tests that converting Nova servers parses their timestamps without `dateutil` (which is compared by the
+    "parse_timestamp" and "dateutil.parser.parse" micro-benchmarks in `simpleopenstack.benchmarks`).
+    """
+    _NUMBER_OF_SERVERS = 100
+
+    def setUp(self):
+        self.manager = NovaOpenstackInstanceManager(RealOpenstackConnector(
+            auth_url="http://localhost:5000/v2.0", tenant="tenant", username="user", password="password"))
+        self.servers = [
+            SimpleNamespace(id=f"server-{i}", name=f"server-{i}", created=f"2017-05-01T10:{i % 60:02}:00Z",
+                            updated=f"2017-05-02T10:{i % 60:02}:00Z", image={"id": "image"}, key_name="key",
+                            flavor={"id": "flavor"}, networks={"network": ["10.0.0.1"]}, status="ACTIVE")
+            for i in range(TestServerTimestampConversion._NUMBER_OF_SERVERS)]
+
+    def test_convert_servers(self):
+        with patch.object(os_managers, "parse_timestamp", parse_datetime):
+            dateutil_converted = [self.manager._convert_raw(server) for server in self.servers]
+        with patch.object(timestamps, "parse_datetime", wraps=parse_datetime) as dateutil_parse:
+            converted = [self.manager._convert_raw(server) for server in self.servers]
+        self.assertEqual(dateutil_converted, converted)
+        self.assertEqual(0, dateutil_parse.call_count)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import re
+from datetime import datetime, timezone, timedelta
+from typing import Optional, Dict
+
+from dateutil.parser import parse as parse_datetime
+
+_ISO_8601_PATTERN = re.compile(
+    r"(\d{4})-(\d{2})-(\d{2})[T ](\d{2}):(\d{2}):(\d{2})(?:\.(\d{1,6}))?(Z|[+-]\d{2}:?\d{2})?")
+_TIMEZONES: Dict[str, timezone] = {"Z": timezone.utc}
+_TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+
+def _get_timezone(designator: str) -> timezone:
+    """
+    Gets the timezone for the given ISO 8601 designator (e.g. "Z" or "+01:00").
+    :param designator: the timezone designator
+    :return: the timezone
+    """
+    if designator not in _TIMEZONES:
+        offset = timedelta(hours=int(designator[1:3]), minutes=int(designator[-2:]))
+        _TIMEZONES[designator] = timezone(-offset if designator[0] == "-" else offset)
+    return _TIMEZONES[designator]
+
+
+def parse_timestamp(timestamp: Optional[str]) -> Optional[datetime]:
+    """
+    Parses a timestamp given by OpenStack.
+
+    Timestamps in the ISO 8601 format used by OpenStack are parsed directly; anything else is parsed by `dateutil`.
+    :param timestamp: the timestamp to parse
+    :return: the parsed timestamp or `None` if no timestamp was given
+    """
+    if timestamp is None:
+        return None
+    match = _ISO_8601_PATTERN.fullmatch(timestamp)
+    if match is None:
+        return parse_datetime(timestamp)
+    year, month, day, hour, minute, second, fraction, designator = match.groups()
+    return datetime(int(year), int(month), int(day), int(hour), int(minute), int(second),
+                    int(fraction.ljust(6, "0")) if fraction is not None else 0,
+                    _get_timezone(designator) if designator is not None else None)
+
+
+def format_timestamp(timestamp: datetime) -> str:
+    """
+    Formats the given timestamp as OpenStack does (in UTC, to the second).
+    :param timestamp: the timestamp to format (assumed to be in UTC if it does not have a timezone)
+    :return: the formatted timestamp
+    """
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(timezone.utc)
+    return timestamp.strftime(_TIMESTAMP_FORMAT)